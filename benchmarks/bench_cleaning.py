@@ -0,0 +1,94 @@
+"""Throughput of ``clean_subtitle`` on large auto-caption files.
+
+Compares the current cleaner with the original six-regexes-per-line
+implementation and reports MB/s and transcript size (characters sent to
+the model).
+
+    python benchmarks/bench_cleaning.py [--hours 1 3 10] [--repeat 5]
+"""
+
+import argparse
+import re
+import time
+
+from synthetic import auto_caption_vtt, manual_srt, rollup_caption_vtt
+
+from yt_subs.cleaning import clean_subtitle
+from yt_subs.types import CleanedTranscript, SubtitleContent, SubtitleLanguage, SubtitleSource
+
+_LANGUAGE = SubtitleLanguage(code="en", name="en", source=SubtitleSource.AUTO, formats=())
+
+_METADATA_RE = re.compile(r"^(WEBVTT|Kind:|Language:|NOTE)")
+_TIMESTAMP_RE = re.compile(r".*-->.*")
+_SEQ_NUMBER_RE = re.compile(r"^\d+$")
+_HTML_TAG_RE = re.compile(r"<[^>]*>")
+_POSITIONING_RE = re.compile(r"align:start position:\d+%?")
+_INLINE_TIMESTAMP_RE = re.compile(r"\b\d{2}:\d{2}:\d{2}\.\d+\b")
+
+
+def legacy_clean_subtitle(content: SubtitleContent) -> CleanedTranscript:
+    """The original per-line multi-regex cleaner, kept as a reference."""
+    seen: set[str] = set()
+    lines: list[str] = []
+    for raw_line in content.raw_text.splitlines():
+        if _METADATA_RE.match(raw_line):
+            continue
+        if _TIMESTAMP_RE.match(raw_line):
+            continue
+        if _SEQ_NUMBER_RE.match(raw_line.strip()):
+            continue
+        line = _HTML_TAG_RE.sub("", raw_line)
+        line = _POSITIONING_RE.sub("", line)
+        line = _INLINE_TIMESTAMP_RE.sub("", line)
+        line = line.strip()
+        if not line or line in seen:
+            continue
+        seen.add(line)
+        lines.append(line)
+    return CleanedTranscript(language_code=content.language.code, text="\n".join(lines))
+
+
+def _best_of(func, content: SubtitleContent, repeat: int) -> tuple[float, CleanedTranscript]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(content)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 3, 10])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'input':<18}{'size MB':>9}{'legacy MB/s':>13}{'current MB/s':>14}"
+        f"{'speedup':>9}{'legacy chars':>14}{'current chars':>15}"
+    )
+    generators = (
+        ("auto-vtt", auto_caption_vtt),
+        ("rollup-vtt", rollup_caption_vtt),
+        ("manual-srt", manual_srt),
+    )
+    for hours in args.hours:
+        for kind, generate in generators:
+            raw = generate(hours * 3600)
+            content = SubtitleContent(language=_LANGUAGE, raw_text=raw)
+            size_mb = len(raw.encode("utf-8")) / 1e6
+
+            legacy_time, legacy = _best_of(legacy_clean_subtitle, content, args.repeat)
+            current_time, current = _best_of(clean_subtitle, content, args.repeat)
+
+            print(
+                f"{f'{kind} {hours:g}h':<18}{size_mb:>9.1f}"
+                f"{size_mb / legacy_time:>13.1f}{size_mb / current_time:>14.1f}"
+                f"{legacy_time / current_time:>8.2f}x"
+                f"{len(legacy.text):>14}{len(current.text):>15}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Import-time cost of the package entry points, measured with ``-X importtime``.
+
+Each target is imported in a fresh interpreter; the best of ``--repeat``
+runs is reported along with the slowest imports it pulled in and whether
+yt-dlp was loaded.
+
+    python benchmarks/bench_startup.py [--repeat 5] [--top 8]
+"""
+
+import argparse
+import subprocess
+import sys
+
+TARGETS = ("yt_subs", "yt_subs.cleaning", "yt_subs.cli", "yt_subs.subtitles")
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """Return ``{module: (self_us, cumulative_us)}`` for one fresh import."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    for target in TARGETS:
+        runs = [import_times(target) for _ in range(args.repeat)]
+        best = min(runs, key=lambda times: times[target][1])
+        total_ms = best[target][1] / 1000
+        heavy = sorted(best.items(), key=lambda item: item[1][0], reverse=True)
+        print(f"{target:<20}{total_ms:>8.1f} ms   yt_dlp loaded: {'yt_dlp' in best}")
+        for name, (self_us, _) in heavy[: args.top]:
+            print(f"    {self_us / 1000:>7.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
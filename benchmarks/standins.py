@@ -0,0 +1,80 @@
+"""Local stand-ins for the subtitle host and Ollama used by end-to-end benchmarks."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SUMMARY = (
+    "The speaker explains how Nix builds packages reproducibly and why that "
+    "matters for teams deploying software every day."
+)
+
+
+class StandInServer:
+    """Serves ``/subs/<name>`` from memory and a streaming ``/api/generate``.
+
+    Generation returns ``SUMMARY`` word by word as NDJSON (or as one object
+    for ``"stream": false``) with Ollama-style statistics in the last line.
+    """
+
+    def __init__(self, subtitles: dict[str, bytes]):
+        self.subtitles = subtitles
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, content_type: str, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                name = self.path.split("?")[0].removeprefix("/subs/")
+                body = owner.subtitles.get(name)
+                if body is None:
+                    self._reply(404, "text/plain", b"not found")
+                else:
+                    self._reply(200, "text/vtt", body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length))
+                self._reply(200, "application/x-ndjson", generate_body(request["stream"]))
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def generate_body(stream: bool) -> bytes:
+    stats = {"eval_count": len(SUMMARY.split()), "eval_duration": 1_000_000}
+    if not stream:
+        return json.dumps({"response": SUMMARY, "done": True, **stats}).encode("utf-8")
+    words = SUMMARY.split(" ")
+    lines = [
+        json.dumps({"response": word if i == 0 else f" {word}", "done": False})
+        for i, word in enumerate(words)
+    ]
+    lines.append(json.dumps({"response": "", "done": True, **stats}))
+    return "\n".join(lines).encode("utf-8")
@@ -0,0 +1,352 @@
+"""Benchmark suite: cleaning (alone and bulk), formats, cues, compression, search, the CLI.
+
+Each case runs ``--repeat`` times after a warm-up; the report gives latency
+percentiles, throughput at the median and peak traced memory (from one
+extra run under ``tracemalloc``). End-to-end cases run ``cli.main`` against
+local stand-ins for the subtitle host and Ollama, with yt-dlp extraction
+replaced by a synthetic info dict.
+
+    python benchmarks/suite.py [--quick] [--filter clean] [--repeat 7]
+    python benchmarks/suite.py --save benchmarks/baseline.json
+    python benchmarks/suite.py --compare benchmarks/baseline.json --max-regression 0.25
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from unittest.mock import patch
+
+from standins import StandInServer
+from synthetic import (
+    AUTO_CAPTION_FORMATS,
+    auto_caption_vtt,
+    manual_srt,
+    rollup_caption_vtt,
+    youtube_info,
+)
+
+from yt_subs.bulk import clean_many
+from yt_subs.cleaning import clean_subtitle
+from yt_subs.compress import compress_transcript
+from yt_subs.cues import parse_cues
+from yt_subs.formats import transcript_lines
+from yt_subs.store import TranscriptStore
+from yt_subs.cli import main as cli_main
+from yt_subs.subtitles import _parse_subtitle_entries
+from yt_subs.types import (
+    CleanedTranscript,
+    SubtitleContent,
+    SubtitleLanguage,
+    SubtitleSource,
+)
+
+_LANGUAGE = SubtitleLanguage(code="en", name="en", source=SubtitleSource.AUTO, formats=())
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[], object]
+    size: float
+    unit: str
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(case: Case, repeat: int) -> dict:
+    case.run()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.run()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    tracemalloc.start()
+    try:
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    p50 = _percentile(latencies, 0.50)
+    return {
+        "p50_ms": round(p50 * 1000, 3),
+        "p90_ms": round(_percentile(latencies, 0.90) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "throughput": round(case.size / p50, 3),
+        "unit": f"{case.unit}/s",
+        "peak_mb": round(peak / 1e6, 3),
+    }
+
+
+def cleaning_cases(quick: bool) -> Iterator[Case]:
+    inputs = [
+        ("auto-vtt-5min", auto_caption_vtt, 300),
+        ("auto-vtt-1h", auto_caption_vtt, 3600),
+        ("rollup-vtt-1h", rollup_caption_vtt, 3600),
+        ("manual-srt-1h", manual_srt, 3600),
+    ]
+    if not quick:
+        inputs.append(("auto-vtt-10h", auto_caption_vtt, 36000))
+    for label, generate, seconds in inputs:
+        raw = generate(seconds)
+        content = SubtitleContent(language=_LANGUAGE, raw_text=raw)
+        size_mb = len(raw.encode("utf-8")) / 1e6
+        yield Case(f"clean/{label}", lambda c=content: clean_subtitle(c), size_mb, "MB")
+
+
+def bulk_cases(stack: contextlib.ExitStack, quick: bool) -> Iterator[Case]:
+    """Clean an archive of 20-minute VTT files on 1, 2, 4, ... processes.
+
+    Each run includes starting the pool. Scaling is near-linear when the
+    files/s roughly doubles from one case to the next.
+    """
+    count = 16 if quick else 64
+    directory = stack.enter_context(tempfile.TemporaryDirectory())
+    paths = []
+    for i in range(count):
+        path = f"{directory}/video{i:03d}.en.vtt"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(auto_caption_vtt(1200, seed=i))
+        paths.append(path)
+    cpus = os.cpu_count() or 1
+    workers = 1
+    while workers <= cpus:
+        yield Case(
+            f"bulk/clean-{count}x20min-{workers}proc",
+            lambda w=workers: list(clean_many(paths, workers=w)),
+            count,
+            "files",
+        )
+        workers *= 2
+
+
+def format_cases(quick: bool) -> Iterator[Case]:
+    """The same hour of auto-captions in every format: download size and parse time.
+
+    Throughput is per MB of that format, so compare latencies for parse cost
+    and the ``KB`` in the case name for bytes fetched.
+    """
+    for ext, generate in AUTO_CAPTION_FORMATS.items():
+        raw = generate(3600)
+        lines = raw.splitlines()
+        size = len(raw.encode("utf-8"))
+        yield Case(
+            f"format/{ext}-1h-{size // 1000}KB",
+            lambda l=lines, e=ext: list(transcript_lines(l, e)),
+            size / 1e6,
+            "MB",
+        )
+
+
+def cue_cases(quick: bool) -> Iterator[Case]:
+    """Parse timestamped cues, then slice and segment the track."""
+    for hours in (1,) if quick else (1, 10):
+        raw = auto_caption_vtt(hours * 3600)
+        lines = raw.splitlines()
+        size_mb = len(raw.encode("utf-8")) / 1e6
+        yield Case(f"cues/parse-auto-{hours}h", lambda l=lines: parse_cues(l), size_mb, "MB")
+        track = parse_cues(lines)
+        yield Case(
+            f"cues/slice-segment-{hours}h",
+            lambda t=track: (t.between(600, 1200), t.segments(2.0)),
+            len(track),
+            "cues",
+        )
+
+
+def compression_cases(quick: bool) -> Iterator[Case]:
+    """Compress cleaned transcripts to a 3000-token budget."""
+    for hours in (1,) if quick else (1, 10):
+        raw = auto_caption_vtt(hours * 3600)
+        text = clean_subtitle(SubtitleContent(language=_LANGUAGE, raw_text=raw)).text
+        size_mb = len(text.encode("utf-8")) / 1e6
+        yield Case(
+            f"compress/auto-{hours}h-to-3k",
+            lambda t=text: compress_transcript(t, 3000),
+            size_mb,
+            "MB",
+        )
+
+
+def store_cases(stack: contextlib.ExitStack, quick: bool) -> Iterator[Case]:
+    """Full-text search over a store of 5-minute transcripts."""
+    count = 1000 if quick else 10000
+    directory = stack.enter_context(tempfile.TemporaryDirectory())
+    store = TranscriptStore(f"{directory}/transcripts.sqlite3")
+    stack.callback(store.close)
+    texts = [
+        clean_subtitle(SubtitleContent(_LANGUAGE, auto_caption_vtt(300, seed))).text
+        for seed in range(20)
+    ]
+    for i in range(count):
+        text = f"{texts[i % len(texts)]}\ntopic{i}"
+        store.put(f"video{i:06d}", _LANGUAGE, CleanedTranscript("en", text))
+    label = f"{count // 1000}k"
+    yield Case(f"store/search-rare-{label}", lambda: store.search("topic42"), 1, "queries")
+    yield Case(
+        f"store/search-phrase-{label}",
+        lambda: store.search('"reproducible way"'),
+        1,
+        "queries",
+    )
+
+
+def parsing_cases(quick: bool) -> Iterator[Case]:
+    for translations in (50, 200) if quick else (50, 200, 600):
+        entries = youtube_info(translations)["automatic_captions"]
+        yield Case(
+            f"parse/auto-captions-{translations}",
+            lambda e=entries: _parse_subtitle_entries(e, SubtitleSource.AUTO),
+            translations,
+            "langs",
+        )
+
+
+class _FakeYoutubeDL:
+    """Replaces yt_dlp.YoutubeDL: every video points at the stand-in host."""
+
+    base_url = ""
+
+    def __init__(self, opts):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def extract_info(self, url, download=True):
+        info = youtube_info(50, video_id=url.rsplit("=", 1)[-1])
+        info["subtitles"]["en"] = [{"ext": "vtt", "url": f"{self.base_url}/subs/en.vtt"}]
+        return info
+
+    def close(self):
+        pass
+
+
+def _run_cli(argv: list[str]) -> None:
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        status = cli_main(argv)
+    if status != 0:
+        raise RuntimeError(f"yt-subs {' '.join(argv)} exited with {status}")
+
+
+def end_to_end_cases(stack: contextlib.ExitStack, quick: bool) -> Iterator[Case]:
+    server = stack.enter_context(StandInServer({"en.vtt": auto_caption_vtt(3600).encode()}))
+    _FakeYoutubeDL.base_url = server.url
+    stack.enter_context(patch("yt_dlp.YoutubeDL", _FakeYoutubeDL))
+    common = ["-l", "en", "--no-cache", "--ollama-url", server.url]
+
+    single = common + ["https://youtube.com/watch?v=dQw4w9WgXcQ"]
+    yield Case("e2e/cli-single-1h", lambda: _run_cli(single), 1, "videos")
+
+    videos = 5 if quick else 20
+    batch = common + [f"https://youtube.com/watch?v=video{i:06d}" for i in range(videos)]
+    yield Case(f"e2e/cli-batch-{videos}x1h", lambda: _run_cli(batch), videos, "videos")
+
+
+def _format_row(name: str, result: dict, baseline: dict | None) -> str:
+    row = (
+        f"{name:<30}{result['p50_ms']:>10.2f}{result['p90_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+        f"{result['throughput']:>12.1f} {result['unit']:<9}{result['peak_mb']:>9.1f}"
+    )
+    if baseline is not None:
+        row += f"{result['p50_ms'] / baseline['p50_ms']:>9.2f}x"
+    return row
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--quick", action="store_true", help="Smaller inputs, 3 repeats")
+    parser.add_argument("--filter", default="", help="Only run cases containing this text")
+    parser.add_argument("--save", metavar="FILE", help="Write results as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Compare with a saved baseline")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=None,
+        metavar="FRACTION",
+        help="With --compare, exit 1 if any median is this much slower (e.g. 0.25)",
+    )
+    args = parser.parse_args()
+    repeat = 3 if args.quick else args.repeat
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    header = f"{'case':<30}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}"
+    header += f"{'throughput':>22}{'peak MB':>9}"
+    print(header + ("  vs base" if baseline else ""))
+
+    results = {}
+    regressions = []
+    with contextlib.ExitStack() as stack:
+        groups = (
+            cleaning_cases(args.quick),
+            bulk_cases(stack, args.quick),
+            format_cases(args.quick),
+            cue_cases(args.quick),
+            compression_cases(args.quick),
+            store_cases(stack, args.quick),
+            parsing_cases(args.quick),
+            end_to_end_cases(stack, args.quick),
+        )
+        for group in groups:
+            for case in group:
+                if args.filter not in case.name:
+                    continue
+                result = measure(case, repeat)
+                results[case.name] = result
+                base = baseline.get(case.name)
+                print(_format_row(case.name, result, base), flush=True)
+                if (
+                    base is not None
+                    and args.max_regression is not None
+                    and result["p50_ms"] > base["p50_ms"] * (1 + args.max_regression)
+                ):
+                    regressions.append(case.name)
+
+    if args.save:
+        record = {
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+            "repeat": repeat,
+            "results": results,
+        }
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    missing = [name for name in results if baseline and name not in baseline]
+    if missing:
+        # New cases belong in the baseline, or their regressions go unnoticed.
+        print(f"not in the baseline: {', '.join(missing)}", file=sys.stderr)
+
+    if regressions:
+        names = ", ".join(regressions)
+        print(f"regressed beyond {args.max_regression:.0%}: {names}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
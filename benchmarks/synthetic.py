@@ -0,0 +1,220 @@
+"""Synthetic subtitle generators for benchmarks."""
+
+import json
+import random
+from collections.abc import Iterator
+
+_WORDS = (
+    "so today we are going to talk about how nix builds packages in a "
+    "reproducible way and why that matters for your team when you deploy "
+    "software to production servers every single day"
+).split()
+
+
+def _timestamp(seconds: float, sep: str = ".") -> str:
+    hours, rem = divmod(seconds, 3600)
+    minutes, secs = divmod(rem, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}".replace(".", sep)
+
+
+def _phrase(rng: random.Random, length: int) -> list[str]:
+    return [rng.choice(_WORDS) for _ in range(length)]
+
+
+def _auto_phrases(duration: float, seed: int) -> Iterator[tuple[float, list[str]]]:
+    """Start time and words of each 2.5 s auto-caption line."""
+    rng = random.Random(seed)
+    t = 0.0
+    while t < duration:
+        yield t, _phrase(rng, rng.randint(5, 9))
+        t += 2.5
+
+
+def auto_caption_vtt(duration: float, seed: int = 0) -> str:
+    """YouTube-style auto-caption VTT with karaoke word timing.
+
+    Each cue shows the previous line again followed by a new line with
+    inline ``<00:00:01.234><c> word</c>`` timing, and is followed by a short
+    "settle" cue repeating the new line as plain text.
+    """
+    out = ["WEBVTT", "Kind: captions", "Language: en", ""]
+    previous = ""
+    step = 2.5
+    for t, words in _auto_phrases(duration, seed):
+        timed = words[0] + "".join(
+            f"<{_timestamp(t + (i + 1) * step / len(words))}><c> {w}</c>"
+            for i, w in enumerate(words[1:])
+        )
+        out.append(f"{_timestamp(t)} --> {_timestamp(t + step)} align:start position:0%")
+        out.append(previous or " ")
+        out.append(timed)
+        out.append("")
+        plain = " ".join(words)
+        out.append(
+            f"{_timestamp(t + step)} --> {_timestamp(t + step + 0.01)} align:start position:0%"
+        )
+        out.append(plain)
+        out.append(" ")
+        out.append("")
+        previous = plain
+    return "\n".join(out)
+
+
+def _word_offsets(words: list[str]) -> Iterator[tuple[int, str]]:
+    for i, word in enumerate(words):
+        yield i * 2500 // len(words), word if i == 0 else f" {word}"
+
+
+def auto_caption_json3(duration: float, seed: int = 0) -> str:
+    """The same captions as ``auto_caption_vtt`` in YouTube's json3 layout:
+    one event per line with per-word segments, plus line-break events."""
+    events = [{"tStartMs": 0, "dDurationMs": int(duration * 1000), "id": 1, "wpWinPosId": 1}]
+    for t, words in _auto_phrases(duration, seed):
+        start = int(t * 1000)
+        segs = [
+            {"utf8": word, "acAsrConf": 0} | ({"tOffsetMs": offset} if offset else {})
+            for offset, word in _word_offsets(words)
+        ]
+        events.append({"tStartMs": start, "dDurationMs": 5000, "wWinId": 1, "segs": segs})
+        events.append(
+            {"tStartMs": start + 2500, "dDurationMs": 2500, "wWinId": 1, "aAppend": 1,
+             "segs": [{"utf8": "\n"}]}
+        )
+    body = ",\n".join(json.dumps(event, separators=(",", ":")) for event in events)
+    return '{"wireMagic":"pb3","pens":[{}],"events":[\n' + body + "\n]}\n"
+
+
+def auto_caption_srv1(duration: float, seed: int = 0) -> str:
+    """The same captions as ``auto_caption_vtt`` as srv1 XML (one element per line)."""
+    texts = "".join(
+        f'<text start="{t:.2f}" dur="2.5">{" ".join(words)}</text>'
+        for t, words in _auto_phrases(duration, seed)
+    )
+    return f'<?xml version="1.0" encoding="utf-8" ?><transcript>{texts}</transcript>\n'
+
+
+def auto_caption_srv2(duration: float, seed: int = 0) -> str:
+    """srv2 XML: like srv1 with times in milliseconds."""
+    texts = "\n".join(
+        f'<text t="{int(t * 1000)}" d="2500">{" ".join(words)}</text>'
+        for t, words in _auto_phrases(duration, seed)
+    )
+    return f'<?xml version="1.0" encoding="utf-8" ?><timedtext>\n{texts}\n</timedtext>\n'
+
+
+def auto_caption_srv3(duration: float, seed: int = 0) -> str:
+    """srv3 XML with per-word ``<s>`` spans and line-break paragraphs."""
+    out = ['<?xml version="1.0" encoding="utf-8" ?><timedtext format="3">', "<body>"]
+    for t, words in _auto_phrases(duration, seed):
+        start = int(t * 1000)
+        spans = "".join(
+            f'<s t="{offset}" ac="0">{word}</s>' if offset else f'<s ac="0">{word}</s>'
+            for offset, word in _word_offsets(words)
+        )
+        out.append(f'<p t="{start}" d="5000" w="1">{spans}</p>')
+        out.append(f'<p t="{start + 2500}" d="2500" w="1" a="1">\n</p>')
+    out.append("</body>")
+    out.append("</timedtext>")
+    return "\n".join(out) + "\n"
+
+
+def auto_caption_ttml(duration: float, seed: int = 0) -> str:
+    """TTML with one paragraph per caption line."""
+    out = [
+        '<?xml version="1.0" encoding="utf-8" ?>',
+        '<tt xml:lang="en" xmlns="http://www.w3.org/ns/ttml"><body><div>',
+    ]
+    for t, words in _auto_phrases(duration, seed):
+        out.append(
+            f'<p begin="{_timestamp(t)}" end="{_timestamp(t + 2.5)}">{" ".join(words)}</p>'
+        )
+    out.append("</div></body></tt>")
+    return "\n".join(out) + "\n"
+
+
+AUTO_CAPTION_FORMATS = {
+    "json3": auto_caption_json3,
+    "srv1": auto_caption_srv1,
+    "srv2": auto_caption_srv2,
+    "srv3": auto_caption_srv3,
+    "ttml": auto_caption_ttml,
+    "vtt": auto_caption_vtt,
+}
+
+
+def rollup_caption_vtt(duration: float, seed: int = 0) -> str:
+    """Roll-up style VTT where each cue grows word by word ("karaoke")
+    and every new line repeats the tail of the previous one."""
+    rng = random.Random(seed)
+    out = ["WEBVTT", ""]
+    tail: list[str] = []
+    t = 0.0
+    while t < duration:
+        words = tail + _phrase(rng, rng.randint(5, 9))
+        for end in range(len(tail) + 1, len(words) + 1):
+            out.append(f"{_timestamp(t)} --> {_timestamp(t + 0.4)}")
+            out.append(" ".join(words[:end]))
+            out.append("")
+            t += 0.4
+        tail = words[-3:]
+    return "\n".join(out)
+
+
+def manual_srt(duration: float, seed: int = 0) -> str:
+    """Plain SRT with one sentence per cue."""
+    rng = random.Random(seed)
+    out = []
+    t = 0.0
+    index = 1
+    while t < duration:
+        out.append(str(index))
+        out.append(f"{_timestamp(t, ',')} --> {_timestamp(t + 3, ',')}")
+        out.append(" ".join(_phrase(rng, rng.randint(6, 12))).capitalize() + ".")
+        out.append("")
+        index += 1
+        t += 3
+    return "\n".join(out)
+
+
+_LANGUAGE_CODES = [
+    f"{a}{b}" for a in "abcdefghijklmnopqrstuvwxyz" for b in "abcdefghijklmnopqrstuvwxyz"
+]
+_CAPTION_FORMATS = ("json3", "srv1", "srv2", "srv3", "ttml", "vtt")
+
+
+def _caption_url(base_url: str, code: str, ext: str, video_id: str) -> str:
+    # Real caption URLs carry ~500 characters of signed query parameters.
+    signature = "".join(f"{ord(c):02x}" for c in (code + ext + video_id) * 8)
+    return (
+        f"{base_url}/api/timedtext?v={video_id}&ei=abcdEFGHijkl&caps=asr&opi=112496729"
+        f"&xoaf=5&hl=en&ip=0.0.0.0&ipbits=0&expire=4102444800&sparams=ip,ipbits,expire,"
+        f"v,ei,caps,opi,xoaf&signature={signature}&key=yt8&kind=asr&lang=en"
+        f"&tlang={code}&fmt={ext}"
+    )
+
+
+def youtube_info(
+    translations: int,
+    base_url: str = "https://www.youtube.com",
+    video_id: str = "dQw4w9WgXcQ",
+) -> dict:
+    """yt-dlp info dict with manual English subtitles and ``translations``
+    auto-translated caption languages in every YouTube caption format."""
+    codes = _LANGUAGE_CODES[:translations]
+    return {
+        "id": video_id,
+        "title": "Synthetic video",
+        "subtitles": {
+            "en": [
+                {"ext": ext, "url": _caption_url(base_url, "en", ext, video_id)}
+                for ext in _CAPTION_FORMATS
+            ]
+        },
+        "automatic_captions": {
+            code: [
+                {"ext": ext, "url": _caption_url(base_url, code, ext, video_id), "name": code}
+                for ext in _CAPTION_FORMATS
+            ]
+            for code in codes
+        },
+    }
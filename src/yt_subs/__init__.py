@@ -1,34 +1,153 @@
 """yt-subs: Download YouTube subtitles and summarize with Ollama."""
 
-from .cleaning import clean_subtitle
-from .subtitles import fetch_subtitle_content, filter_preferred, list_languages
-from .summarizer import OllamaSummarizer, Summarizer
-from .types import (
-    CleanedTranscript,
-    NoSubtitlesAvailableError,
-    SubtitleContent,
-    SubtitleDownloadError,
-    SubtitleFormat,
-    SubtitleLanguage,
-    SubtitleSource,
-    SummarizationError,
-    YtSubsError,
-)
-
-__all__ = [
-    "clean_subtitle",
-    "list_languages",
-    "filter_preferred",
-    "fetch_subtitle_content",
-    "Summarizer",
-    "OllamaSummarizer",
-    "CleanedTranscript",
-    "NoSubtitlesAvailableError",
-    "SubtitleContent",
-    "SubtitleDownloadError",
-    "SubtitleFormat",
-    "SubtitleLanguage",
-    "SubtitleSource",
-    "SummarizationError",
-    "YtSubsError",
-]
+import importlib
+from typing import TYPE_CHECKING
+
+# Public name -> submodule defining it. Submodules are imported on first
+# attribute access, so ``import yt_subs.cleaning`` or ``yt-subs --help``
+# never pays for yt-dlp, asyncio or sqlite3.
+_EXPORTS = {
+    "clean_subtitle": "cleaning",
+    "clean_lines": "cleaning",
+    "dedup_lines": "cleaning",
+    "list_languages": "subtitles",
+    "extract_video_id": "subtitles",
+    "filter_preferred": "subtitles",
+    "find_language": "subtitles",
+    "fetch_subtitle_content": "subtitles",
+    "stream_subtitle_lines": "subtitles",
+    "SubtitleParser": "formats",
+    "register_parser": "formats",
+    "select_format": "formats",
+    "download_transcript": "pipeline",
+    "fetch_transcript": "pipeline",
+    "run_batch": "pipeline",
+    "summarize_languages": "pipeline",
+    "clean_many": "bulk",
+    "clean_files": "bulk",
+    "resummarize_files": "bulk",
+    "FileResult": "bulk",
+    "alist_languages": "aio",
+    "afetch_subtitle_content": "aio",
+    "astream_subtitle_lines": "aio",
+    "adownload_transcript": "aio",
+    "afetch_transcript": "aio",
+    "arun_batch": "aio",
+    "iter_playlist_video_ids": "playlist",
+    "iter_new_video_ids": "playlist",
+    "SyncState": "playlist",
+    "SubtitleService": "server",
+    "SubtitleServer": "server",
+    "ServerClient": "client",
+    "MetadataCache": "cache",
+    "HTTPSession": "transport",
+    "AsyncHTTPSession": "aio",
+    "Summarizer": "summarizer",
+    "StreamingSummarizer": "summarizer",
+    "OllamaSummarizer": "summarizer",
+    "AsyncSummarizer": "aio",
+    "AsyncOllamaSummarizer": "aio",
+    "CachingSummarizer": "summarizer",
+    "ChunkedSummarizer": "chunking",
+    "PooledSummarizer": "pool",
+    "CompressingSummarizer": "compress",
+    "compress_transcript": "compress",
+    "CueTrack": "cues",
+    "parse_cues": "cues",
+    "count_tokens": "tokens",
+    "use_tokenizer": "tokens",
+    "split_transcript": "chunking",
+    "TranscriptStore": "store",
+    "SearchHit": "store",
+    "SummaryStore": "cache",
+    "SQLiteSummaryStore": "cache",
+    "BatchResult": "types",
+    "CleanedTranscript": "types",
+    "NoSubtitlesAvailableError": "types",
+    "SubtitleContent": "types",
+    "SubtitleDownloadError": "types",
+    "SubtitleFormat": "types",
+    "SubtitleLanguage": "types",
+    "SubtitleSource": "types",
+    "SummarizationError": "types",
+    "ServerError": "types",
+    "ServerUnavailableError": "types",
+    "YtSubsError": "types",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .aio import (
+        AsyncHTTPSession,
+        AsyncOllamaSummarizer,
+        AsyncSummarizer,
+        adownload_transcript,
+        afetch_subtitle_content,
+        afetch_transcript,
+        alist_languages,
+        arun_batch,
+        astream_subtitle_lines,
+    )
+    from .bulk import FileResult, clean_files, clean_many, resummarize_files
+    from .cache import MetadataCache, SQLiteSummaryStore, SummaryStore
+    from .chunking import ChunkedSummarizer, split_transcript
+    from .cleaning import clean_lines, clean_subtitle, dedup_lines
+    from .client import ServerClient
+    from .compress import CompressingSummarizer, compress_transcript
+    from .cues import CueTrack, parse_cues
+    from .formats import SubtitleParser, register_parser, select_format
+    from .pipeline import (
+        download_transcript,
+        fetch_transcript,
+        run_batch,
+        summarize_languages,
+    )
+    from .playlist import SyncState, iter_new_video_ids, iter_playlist_video_ids
+    from .pool import PooledSummarizer
+    from .server import SubtitleServer, SubtitleService
+    from .store import SearchHit, TranscriptStore
+    from .subtitles import (
+        extract_video_id,
+        fetch_subtitle_content,
+        filter_preferred,
+        find_language,
+        list_languages,
+        stream_subtitle_lines,
+    )
+    from .summarizer import (
+        CachingSummarizer,
+        OllamaSummarizer,
+        StreamingSummarizer,
+        Summarizer,
+    )
+    from .tokens import count_tokens, use_tokenizer
+    from .transport import HTTPSession
+    from .types import (
+        BatchResult,
+        CleanedTranscript,
+        NoSubtitlesAvailableError,
+        ServerError,
+        ServerUnavailableError,
+        SubtitleContent,
+        SubtitleDownloadError,
+        SubtitleFormat,
+        SubtitleLanguage,
+        SubtitleSource,
+        SummarizationError,
+        YtSubsError,
+    )
@@ -0,0 +1,518 @@
+"""asyncio counterparts of the blocking pipeline.
+
+HTTP requests (subtitle downloads, Ollama) are natively async over
+keep-alive connections; yt-dlp extraction, which has no async API, runs in
+an executor. ``arun_batch`` keeps a bounded number of videos in flight.
+"""
+
+import asyncio
+import functools
+import ssl
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import Executor
+from typing import Protocol, runtime_checkable
+from urllib.parse import urlsplit
+
+from .cache import MetadataCache
+from .cleaning import TranscriptCleaner
+from .formats import is_line_format, select_format, transcript_lines
+from .pipeline import select_language
+from .subtitles import LineSplitter, list_languages
+from .summarizer import decode_stream_line, encode_generate_request
+from .transport import (
+    CHUNK_SIZE,
+    DEFAULT_BACKOFF,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_RETRIES,
+    DEFAULT_TIMEOUT,
+    IDEMPOTENT_METHODS,
+    RETRY_STATUSES,
+    ContentDecoder,
+    HTTPStatusError,
+)
+from .types import (
+    DEFAULT_MODEL,
+    DEFAULT_OLLAMA_URL,
+    DEFAULT_SUMMARIZATION_PROMPT,
+    BatchResult,
+    CleanedTranscript,
+    NoSubtitlesAvailableError,
+    SubtitleContent,
+    SubtitleDownloadError,
+    SubtitleLanguage,
+    SummarizationError,
+)
+
+DEFAULT_ASYNC_CONCURRENCY = 64
+DEFAULT_OLLAMA_TIMEOUT = 600.0
+
+_PoolKey = tuple[str, str, int]
+_Connection = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+_STALE_ERRORS = (ConnectionError, asyncio.IncompleteReadError)
+
+
+class AsyncResponse:
+    """An HTTP/1.1 response read from an asyncio stream."""
+
+    def __init__(
+        self,
+        session: "AsyncHTTPSession",
+        key: _PoolKey,
+        conn: _Connection,
+        status: int,
+        reason: str,
+        headers: dict[str, str],
+        keep_alive: bool,
+        timeout: float | None,
+    ):
+        self._session = session
+        self._timeout = timeout
+        self._key = key
+        self._conn: _Connection | None = conn
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self._keep_alive = keep_alive
+        self._complete = False
+        encoding = headers.get("content-encoding", "").strip().lower()
+        self._decoder = ContentDecoder(encoding) if encoding in ("gzip", "deflate") else None
+
+    async def _read(self, reader: asyncio.StreamReader, size: int) -> bytes:
+        return await asyncio.wait_for(reader.read(size), self._timeout)
+
+    async def _raw_chunks(self) -> AsyncIterator[bytes]:
+        reader = self._conn[0]
+        timeout = self._timeout
+        if self.headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await asyncio.wait_for(reader.readline(), timeout)
+                size = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await asyncio.wait_for(reader.readline(), timeout)).strip():
+                        pass
+                    return
+                yield await asyncio.wait_for(reader.readexactly(size), timeout)
+                await asyncio.wait_for(reader.readexactly(2), timeout)
+        elif "content-length" in self.headers:
+            remaining = int(self.headers["content-length"])
+            while remaining:
+                data = await self._read(reader, min(remaining, CHUNK_SIZE))
+                if not data:
+                    raise asyncio.IncompleteReadError(b"", remaining)
+                remaining -= len(data)
+                yield data
+        else:
+            self._keep_alive = False
+            while data := await self._read(reader, CHUNK_SIZE):
+                yield data
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Yield the decoded body incrementally."""
+        try:
+            async for data in self._raw_chunks():
+                if self._decoder is not None:
+                    data = self._decoder.decompress(data)
+                if data:
+                    yield data
+            self._complete = True
+            if self._decoder is not None:
+                tail = self._decoder.flush()
+                if tail:
+                    yield tail
+        finally:
+            await self.aclose()
+
+    async def iter_lines(self) -> AsyncIterator[bytes]:
+        """Yield the decoded body line by line, without line terminators."""
+        pending = b""
+        async for chunk in self.iter_chunks():
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                yield line.removesuffix(b"\r")
+        if pending:
+            yield pending
+
+    async def read(self) -> bytes:
+        return b"".join([chunk async for chunk in self.iter_chunks()])
+
+    async def aclose(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        if self._complete and self._keep_alive:
+            self._session._release(self._key, conn)
+        else:
+            conn[1].close()
+
+    async def __aenter__(self) -> "AsyncResponse":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+class AsyncHTTPSession:
+    """asyncio HTTP/1.1 client with keep-alive pools, retries and metrics.
+
+    Mirrors ``transport.HTTPSession``; use one session per event loop.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ):
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff = backoff
+        self._pool_size = pool_size
+        self._pools: dict[_PoolKey, list[_Connection]] = {}
+        self._ssl: ssl.SSLContext | None = None
+        self._opened = 0
+        self._reused = 0
+
+    @property
+    def connections_opened(self) -> int:
+        return self._opened
+
+    @property
+    def connections_reused(self) -> int:
+        return self._reused
+
+    async def _acquire(self, key: _PoolKey, timeout: float | None) -> tuple[_Connection, bool]:
+        pool = self._pools.get(key)
+        while pool:
+            reader, writer = pool.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                self._reused += 1
+                return (reader, writer), True
+            writer.close()
+
+        scheme, host, port = key
+        if scheme == "https" and self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        conn = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=self._ssl if scheme == "https" else None),
+            timeout,
+        )
+        self._opened += 1
+        return conn, False
+
+    def _release(self, key: _PoolKey, conn: _Connection) -> None:
+        pool = self._pools.setdefault(key, [])
+        if len(pool) < self._pool_size:
+            pool.append(conn)
+        else:
+            conn[1].close()
+
+    async def _send(
+        self,
+        conn: _Connection,
+        method: str,
+        target: str,
+        host: str,
+        body: bytes | None,
+        headers: dict[str, str],
+        timeout: float | None,
+    ) -> None:
+        writer = conn[1]
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await asyncio.wait_for(writer.drain(), timeout)
+
+    async def _receive(
+        self, key: _PoolKey, conn: _Connection, timeout: float | None
+    ) -> AsyncResponse:
+        reader = conn[0]
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        if not status_line:
+            raise ConnectionResetError("connection closed before response")
+        version, status, *reason = status_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        response_headers: dict[str, str] = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        keep_alive = (
+            version == "HTTP/1.1"
+            and response_headers.get("connection", "").lower() != "close"
+        )
+        return AsyncResponse(
+            self,
+            key,
+            conn,
+            int(status),
+            reason[0] if reason else "",
+            response_headers,
+            keep_alive,
+            timeout,
+        )
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> AsyncResponse:
+        """Send a request and return the response with its body unread."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        host = parts.netloc.rpartition("@")[2]
+
+        request_headers = {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        request_headers.update(headers or {})
+        if timeout is None:
+            timeout = self._timeout
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        retries = self._retries if idempotent else 0
+
+        attempt = 0
+        while True:
+            conn, reused = await self._acquire(key, timeout)
+            sent = False
+            try:
+                await self._send(conn, method, target, host, body, request_headers, timeout)
+                sent = True
+                response = await self._receive(key, conn, timeout)
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as exc:
+                conn[1].close()
+                # Once sent, a POST may have reached the server; it is not resent.
+                if reused and isinstance(exc, _STALE_ERRORS) and (idempotent or not sent):
+                    continue
+                if attempt >= retries:
+                    raise
+                await asyncio.sleep(self._backoff * 2**attempt)
+                attempt += 1
+                continue
+
+            if response.status in RETRY_STATUSES and attempt < retries:
+                await response.read()
+                await asyncio.sleep(self._backoff * 2**attempt)
+                attempt += 1
+                continue
+            if response.status >= 400:
+                body = await response.read()
+                raise HTTPStatusError(response.status, response.reason, url, body)
+            return response
+
+    async def aclose(self) -> None:
+        """Close all idle pooled connections."""
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            for _, writer in pool:
+                writer.close()
+
+
+async def alist_languages(
+    url: str,
+    cache: MetadataCache | None = None,
+    refresh: bool = False,
+    executor: Executor | None = None,
+) -> list[SubtitleLanguage]:
+    """Async ``list_languages``; yt-dlp runs in ``executor`` (default: the loop's)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(list_languages, url, cache=cache, refresh=refresh)
+    )
+
+
+async def astream_subtitle_lines(
+    language: SubtitleLanguage,
+    session: AsyncHTTPSession,
+    preferred_ext: str | None = None,
+) -> AsyncIterator[str]:
+    """Download subtitles and yield raw lines as the response arrives."""
+    fmt = select_format(language, preferred_ext)
+    splitter = LineSplitter()
+    try:
+        response = await session.request("GET", fmt.url)
+        async with response:
+            async for chunk in response.iter_chunks():
+                for line in splitter.feed(chunk):
+                    yield line
+        for line in splitter.finish():
+            yield line
+    except Exception as exc:
+        raise SubtitleDownloadError(
+            f"Failed to download subtitles for '{language.code}': {exc}"
+        ) from exc
+
+
+async def afetch_subtitle_content(
+    language: SubtitleLanguage,
+    session: AsyncHTTPSession,
+    preferred_ext: str | None = None,
+) -> SubtitleContent:
+    """Async ``fetch_subtitle_content``."""
+    ext = select_format(language, preferred_ext).ext
+    lines = [line async for line in astream_subtitle_lines(language, session, ext)]
+    return SubtitleContent(language=language, raw_text="\n".join(lines), ext=ext)
+
+
+async def adownload_transcript(
+    language: SubtitleLanguage,
+    session: AsyncHTTPSession,
+    preferred_ext: str | None = None,
+) -> CleanedTranscript:
+    """Async ``download_transcript``: VTT/SRT lines are cleaned as they arrive."""
+    ext = select_format(language, preferred_ext).ext
+    if not is_line_format(ext):
+        raw_lines = [line async for line in astream_subtitle_lines(language, session, ext)]
+        text = "\n".join(transcript_lines(raw_lines, ext))
+        return CleanedTranscript(language_code=language.code, text=text)
+
+    cleaner = TranscriptCleaner()
+    lines = []
+    async for raw_line in astream_subtitle_lines(language, session, ext):
+        line = cleaner.push(raw_line)
+        if line is not None:
+            lines.append(line)
+    line = cleaner.flush()
+    if line is not None:
+        lines.append(line)
+    return CleanedTranscript(language_code=language.code, text="\n".join(lines))
+
+
+async def afetch_transcript(
+    url: str,
+    session: AsyncHTTPSession,
+    lang: str | None = None,
+    metadata_cache: MetadataCache | None = None,
+    refresh: bool = False,
+    executor: Executor | None = None,
+) -> CleanedTranscript:
+    """Async ``fetch_transcript``."""
+    languages = await alist_languages(url, metadata_cache, refresh, executor)
+    return await adownload_transcript(select_language(languages, lang), session)
+
+
+@runtime_checkable
+class AsyncSummarizer(Protocol):
+    async def summarize(self, transcript: str, prompt: str) -> str: ...
+
+
+class AsyncOllamaSummarizer:
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        base_url: str = DEFAULT_OLLAMA_URL,
+        session: AsyncHTTPSession | None = None,
+        timeout: float = DEFAULT_OLLAMA_TIMEOUT,
+        options: dict | None = None,
+        keep_alive: str | float | None = None,
+    ):
+        self._model = model
+        self._base_url = base_url
+        self._session = session or AsyncHTTPSession()
+        self._timeout = timeout
+        self._options = dict(options or {})
+        self._keep_alive = keep_alive
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @property
+    def options(self) -> dict:
+        return dict(self._options)
+
+    async def _post(self, transcript: str, prompt: str, stream: bool):
+        return await self._session.request(
+            "POST",
+            f"{self._base_url}/api/generate",
+            body=encode_generate_request(
+                self._model, transcript, prompt, stream, self._options, self._keep_alive
+            ),
+            headers={"Content-Type": "application/json"},
+            timeout=self._timeout,
+        )
+
+    async def summarize(self, transcript: str, prompt: str) -> str:
+        tokens = [token async for token in self.stream(transcript, prompt)]
+        return "".join(tokens)
+
+    async def stream(self, transcript: str, prompt: str) -> AsyncIterator[str]:
+        """Yield summary tokens as Ollama generates them."""
+        try:
+            response = await self._post(transcript, prompt, stream=True)
+            async with response:
+                async for line in response.iter_lines():
+                    token = decode_stream_line(line)
+                    if token:
+                        yield token
+        except Exception as exc:
+            raise SummarizationError(f"Ollama summarization failed: {exc}") from exc
+
+
+async def arun_batch(
+    urls: Iterable[str],
+    summarizer: AsyncSummarizer,
+    *,
+    session: AsyncHTTPSession | None = None,
+    lang: str | None = None,
+    prompt: str = DEFAULT_SUMMARIZATION_PROMPT,
+    concurrency: int = DEFAULT_ASYNC_CONCURRENCY,
+    metadata_cache: MetadataCache | None = None,
+    refresh: bool = False,
+    executor: Executor | None = None,
+) -> AsyncIterator[BatchResult]:
+    """Process many URLs concurrently, yielding results in completion order.
+
+    At most ``concurrency`` videos are in flight at once, and ``urls`` is
+    read only as they finish, so it may be a long or endless iterator.
+    Extraction threads are further bounded by ``executor`` (default: the
+    loop's executor). Closing the iterator early cancels the videos in
+    flight and waits for them before the session is closed.
+    """
+    own_session = session is None
+    session = session or AsyncHTTPSession()
+
+    async def process(url: str) -> BatchResult:
+        try:
+            transcript = await afetch_transcript(
+                url, session, lang, metadata_cache, refresh, executor
+            )
+        except Exception as exc:
+            permanent = isinstance(exc, NoSubtitlesAvailableError)
+            return BatchResult(url=url, error=str(exc), permanent=permanent)
+        try:
+            summary = await summarizer.summarize(transcript.text, prompt)
+        except Exception as exc:
+            return BatchResult(url=url, language_code=transcript.language_code, error=str(exc))
+        return BatchResult(url=url, language_code=transcript.language_code, summary=summary)
+
+    pending: set[asyncio.Future[BatchResult]] = set()
+    try:
+        for url in urls:
+            pending.add(asyncio.ensure_future(process(url)))
+            if len(pending) >= concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if own_session:
+            await session.aclose()
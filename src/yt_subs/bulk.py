@@ -0,0 +1,280 @@
+"""Cleaning and re-summarizing saved subtitle files in bulk.
+
+Cleaning is pure Python bound by the GIL, so ``clean_many`` shards it over
+a process pool. Inputs are sent in chunks, so each round trip to a worker
+cleans several files, and only a few chunks per worker are in flight at
+once, so results are yielded in input order without piling up. Files cross
+to workers as paths and are read there through ``mmap``, never copied
+through the parent.
+
+``resummarize_files`` feeds the cleaned transcripts to a thread pool that
+keeps ``summary_workers`` requests in flight. Neither yt-dlp nor YouTube
+is contacted.
+"""
+
+import mmap
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from pathlib import Path
+
+from .cleaning import clean_subtitle
+from .formats import parse_track, supported_formats
+from .pipeline import DEFAULT_SUMMARY_WORKERS
+from .summarizer import Summarizer
+from .types import (
+    DEFAULT_SUMMARIZATION_PROMPT,
+    CleanedTranscript,
+    SubtitleContent,
+    SubtitleLanguage,
+    SubtitleSource,
+    YtSubsError,
+)
+
+# Language code of files whose name does not carry one ("und" is BCP 47
+# for undetermined).
+UNKNOWN_LANGUAGE = "und"
+# Largest number of inputs handed to a cleaning process at a time. Smaller
+# inputs are split into about four chunks per worker to even out the load.
+MAX_CHUNK_SIZE = 32
+# Chunks in flight per worker: enough to keep every worker busy while the
+# oldest chunk is yielded, few enough to bound memory held by results.
+_CHUNKS_PER_WORKER = 2
+
+SubtitleInput = Path | str | SubtitleContent
+
+
+@dataclass(frozen=True)
+class FileResult:
+    path: Path
+    language_code: str | None = None
+    summary: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def is_subtitle_file(path: Path) -> bool:
+    return path.suffix[1:].lower() in supported_formats()
+
+
+def find_subtitle_files(paths: Iterable[Path | str]) -> list[Path]:
+    """``paths``, with each directory replaced by the subtitle files under it.
+
+    Directory contents are sorted; files named explicitly are kept whatever
+    their extension.
+    """
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found = (p for p in path.rglob("*") if p.is_file() and is_subtitle_file(p))
+            files.extend(sorted(found))
+        else:
+            files.append(path)
+    return files
+
+
+def output_names(paths: Iterable[Path | str], suffix: str = ".txt") -> dict[Path, Path]:
+    """Each file ``find_subtitle_files(paths)`` finds, mapped to its output name.
+
+    A file found in a directory keeps its path relative to that directory;
+    a file named explicitly keeps just its name. The extension is replaced
+    by ``suffix``. Raises ``ValueError`` if two files would share a name,
+    such as ``talk.en.vtt`` and ``talk.en.srt``.
+    """
+    names: dict[Path, Path] = {}
+    sources: dict[Path, Path] = {}
+    for root in map(Path, paths):
+        for path in find_subtitle_files([root]):
+            relative = path.relative_to(root) if root.is_dir() else Path(path.name)
+            name = relative.with_suffix(suffix)
+            other = sources.setdefault(name, path)
+            if other != path:
+                raise ValueError(f"{other} and {path} would both be written to {name}")
+            names[path] = name
+    return names
+
+
+def language_from_path(path: Path) -> str | None:
+    """The language code in a yt-dlp file name (``<title>.<lang>.vtt``), if any."""
+    stem = Path(path.stem)
+    code = stem.suffix[1:]
+    return code if code and len(code) <= 12 and " " not in code else None
+
+
+def read_subtitle_file(path: Path | str) -> str:
+    """The text of a UTF-8 subtitle file, decoded straight from a memory map."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return str(mapped, "utf-8-sig")
+
+
+def _clean_text(raw_text: str, ext: str, code: str, timestamps: bool) -> CleanedTranscript:
+    if timestamps:
+        track = parse_track(raw_text.splitlines(), ext)
+        return CleanedTranscript(language_code=code, text=track.timestamped_text())
+    language = SubtitleLanguage(code=code, name=code, source=SubtitleSource.MANUAL, formats=())
+    return clean_subtitle(SubtitleContent(language=language, raw_text=raw_text, ext=ext))
+
+
+def clean_file(
+    path: Path | str, lang: str | None = None, timestamps: bool = False
+) -> CleanedTranscript:
+    """Read and clean one subtitle file; the format comes from its extension.
+
+    The language is ``lang``, else the one in the file name. With
+    ``timestamps``, each line is prefixed with its cue's ``[m:ss]`` time.
+    """
+    path = Path(path)
+    code = lang or language_from_path(path) or UNKNOWN_LANGUAGE
+    ext = path.suffix[1:].lower() or "vtt"
+    return _clean_text(read_subtitle_file(path), ext, code, timestamps)
+
+
+def _clean_input(item: SubtitleInput, lang: str | None, timestamps: bool) -> CleanedTranscript:
+    if isinstance(item, SubtitleContent):
+        if timestamps:
+            return _clean_text(item.raw_text, item.ext, item.language.code, timestamps)
+        return clean_subtitle(item)
+    return clean_file(item, lang, timestamps)
+
+
+def _clean_chunk(
+    items: Sequence[SubtitleInput], lang: str | None, timestamps: bool
+) -> list[CleanedTranscript | Exception]:
+    """Clean a chunk in a worker process, returning failures in place of results."""
+    results: list[CleanedTranscript | Exception] = []
+    for item in items:
+        try:
+            results.append(_clean_input(item, lang, timestamps))
+        except (OSError, UnicodeDecodeError, YtSubsError, ValueError) as exc:
+            results.append(exc)
+    return results
+
+
+def _clean_chunks(
+    items: Sequence[SubtitleInput],
+    lang: str | None,
+    timestamps: bool,
+    workers: int | None,
+    chunk_size: int | None,
+) -> Iterator[CleanedTranscript | Exception]:
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(items) < 2:
+        yield from _clean_chunk(items, lang, timestamps)
+        return
+    if chunk_size is None:
+        chunk_size = max(1, min(MAX_CHUNK_SIZE, len(items) // (4 * workers)))
+    chunks = (items[i : i + chunk_size] for i in range(0, len(items), chunk_size))
+    pool = ProcessPoolExecutor(min(workers, -(-len(items) // chunk_size)))
+    try:
+        pending: deque[Future[list[CleanedTranscript | Exception]]] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_clean_chunk, chunk, lang, timestamps))
+            if len(pending) >= _CHUNKS_PER_WORKER * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def clean_many(
+    items: Iterable[SubtitleInput],
+    *,
+    lang: str | None = None,
+    timestamps: bool = False,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[CleanedTranscript]:
+    """Clean many subtitle files or ``SubtitleContent`` on a process pool.
+
+    Paths (``Path`` or ``str``) are cleaned like ``clean_file``; contents
+    like ``clean_subtitle``. Transcripts are yielded in input order. Work
+    is split over ``workers`` processes (default: one per CPU) in chunks of
+    ``chunk_size`` inputs (default: about four chunks per worker, at most
+    ``MAX_CHUNK_SIZE``). A single input or ``workers=1`` is cleaned in this
+    process. The first input that cannot be read or parsed raises its error.
+    """
+    for result in _clean_chunks(list(items), lang, timestamps, workers, chunk_size):
+        if isinstance(result, Exception):
+            raise result
+        yield result
+
+
+def clean_files(
+    paths: Iterable[Path | str],
+    lang: str | None = None,
+    timestamps: bool = False,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[tuple[Path, CleanedTranscript | str]]:
+    """``clean_many`` over files, yielding ``(path, transcript)`` in input order.
+
+    A file that cannot be read or parsed gets an error message in place of
+    its transcript, and the others are still cleaned.
+    """
+    files = [Path(p) for p in paths]
+    results = _clean_chunks(files, lang, timestamps, workers, chunk_size)
+    for path, result in zip(files, results):
+        yield path, str(result) if isinstance(result, Exception) else result
+
+
+def resummarize_files(
+    paths: Iterable[Path | str],
+    summarizer: Summarizer,
+    *,
+    prompt: str = DEFAULT_SUMMARIZATION_PROMPT,
+    lang: str | None = None,
+    timestamps: bool = False,
+    clean_workers: int | None = None,
+    summary_workers: int = DEFAULT_SUMMARY_WORKERS,
+) -> Iterator[FileResult]:
+    """Clean and summarize saved subtitle files, yielding results as they finish.
+
+    Cleaning runs ahead on its own processes, so the model is never left
+    waiting for the next transcript; up to four times ``summary_workers``
+    requests are queued at once.
+    """
+    max_pending = 4 * summary_workers
+    with ThreadPoolExecutor(summary_workers, thread_name_prefix="yt-subs-llm") as llm_pool:
+        pending: dict[Future[str], tuple[Path, str]] = {}
+
+        def finished(futures: Iterable[Future[str]]) -> Iterator[FileResult]:
+            for future in futures:
+                path, code = pending.pop(future)
+                try:
+                    yield FileResult(path, code, summary=future.result())
+                except Exception as exc:
+                    yield FileResult(path, code, error=str(exc))
+
+        for path, transcript in clean_files(paths, lang, timestamps, clean_workers):
+            if isinstance(transcript, str):
+                yield FileResult(path, error=transcript)
+                continue
+            if not transcript.text:
+                yield FileResult(path, transcript.language_code, error="no caption text")
+                continue
+            future = llm_pool.submit(summarizer.summarize, transcript.text, prompt)
+            pending[future] = (path, transcript.language_code)
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from finished(done)
+            else:
+                yield from finished([f for f in list(pending) if f.done()])
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from finished(done)
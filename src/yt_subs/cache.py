@@ -0,0 +1,238 @@
+"""Persistent on-disk caches.
+
+Entries are small JSON files written atomically (temp file + ``os.replace``)
+so several processes can share one cache directory safely.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import warnings
+from pathlib import Path
+from typing import Protocol
+from urllib.parse import parse_qs, urlparse
+
+from .types import SubtitleFormat, SubtitleLanguage, SubtitleSource
+
+DEFAULT_METADATA_TTL = 6 * 60 * 60
+DEFAULT_METADATA_MAX_ENTRIES = 10_000
+
+# Signed subtitle URLs are treated as stale this many seconds before they expire,
+# so a cached URL is never handed out just before it stops working.
+_EXPIRY_MARGIN = 5 * 60
+
+
+def default_cache_dir() -> Path:
+    """Return the cache root: ``$YT_SUBS_CACHE_DIR`` or ``$XDG_CACHE_HOME/yt-subs``."""
+    override = os.environ.get("YT_SUBS_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "yt-subs"
+
+
+def url_expiry(url: str) -> float | None:
+    """Return the ``expire`` timestamp embedded in a signed URL, if any."""
+    values = parse_qs(urlparse(url).query).get("expire")
+    if not values:
+        return None
+    try:
+        return float(values[0])
+    except ValueError:
+        return None
+
+
+def _languages_expiry(languages: list[SubtitleLanguage]) -> float | None:
+    expiries = [
+        expiry
+        for lang in languages
+        for fmt in lang.formats
+        if (expiry := url_expiry(fmt.url)) is not None
+    ]
+    return min(expiries) if expiries else None
+
+
+def encode_languages(languages: list[SubtitleLanguage]) -> list[dict]:
+    return [
+        {
+            "code": lang.code,
+            "name": lang.name,
+            "source": lang.source.value,
+            "formats": [{"ext": f.ext, "url": f.url} for f in lang.formats],
+        }
+        for lang in languages
+    ]
+
+
+def decode_languages(raw: list[dict]) -> list[SubtitleLanguage]:
+    return [
+        SubtitleLanguage(
+            code=entry["code"],
+            name=entry["name"],
+            source=SubtitleSource(entry["source"]),
+            formats=tuple(
+                SubtitleFormat(ext=f["ext"], url=f["url"]) for f in entry["formats"]
+            ),
+        )
+        for entry in raw
+    ]
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write ``text`` to ``path`` so readers never observe a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=path.suffix)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class MetadataCache:
+    """Cache of parsed subtitle language lists, keyed by video ID.
+
+    An entry is served while it is younger than ``ttl`` seconds and none of
+    its signed subtitle URLs have expired. The directory holds at most
+    ``max_entries`` files; the least recently used ones are evicted first.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str | None = None,
+        ttl: float = DEFAULT_METADATA_TTL,
+        max_entries: int = DEFAULT_METADATA_MAX_ENTRIES,
+    ):
+        self._dir = Path(directory) if directory else default_cache_dir() / "metadata"
+        self._ttl = ttl
+        self._max_entries = max_entries
+
+    @property
+    def directory(self) -> Path:
+        return self._dir
+
+    def _path(self, video_id: str) -> Path:
+        return self._dir / f"{video_id}.json"
+
+    def get(self, video_id: str) -> list[SubtitleLanguage] | None:
+        """Return the cached languages, or None if missing or stale."""
+        path = self._path(video_id)
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+            now = time.time()
+            if now - record["created"] > self._ttl:
+                return None
+            expires = record.get("expires")
+            if expires is not None and expires - _EXPIRY_MARGIN <= now:
+                return None
+            languages = decode_languages(record["languages"])
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return languages
+
+    def put(self, video_id: str, languages: list[SubtitleLanguage]) -> None:
+        """Store languages for a video, evicting old entries if over capacity."""
+        record = {
+            "video_id": video_id,
+            "created": time.time(),
+            "expires": _languages_expiry(languages),
+            "languages": encode_languages(languages),
+        }
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self._path(video_id), json.dumps(record))
+            self._evict()
+        except OSError:
+            # A cache that cannot be written is just a slower cache.
+            pass
+
+    def _evict(self) -> None:
+        entries = []
+        with os.scandir(self._dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and not entry.name.startswith("."):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except FileNotFoundError:
+                        continue
+        excess = len(entries) - self._max_entries
+        if excess <= 0:
+            return
+        entries.sort()
+        for _, path in entries[:excess]:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+class SummaryStore(Protocol):
+    def get(self, key: str) -> str | None: ...
+
+    def put(self, key: str, summary: str) -> None: ...
+
+
+class SQLiteSummaryStore:
+    """Summary store backed by a single SQLite file.
+
+    Safe to share between threads; WAL mode lets several processes read
+    while one writes. Opening raises ``OSError`` or ``sqlite3.Error``;
+    after that, a failed read is a miss and a failed write is skipped with
+    a warning, since a summary is still good without its cache entry.
+    """
+
+    def __init__(self, path: Path | str | None = None):
+        self._path = Path(path) if path else default_cache_dir() / "summaries.sqlite3"
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        import sqlite3
+
+        self._errors = sqlite3.Error
+        self._conn = sqlite3.connect(self._path, timeout=30, check_same_thread=False)
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS summaries ("
+                    " key TEXT PRIMARY KEY,"
+                    " summary TEXT NOT NULL,"
+                    " created REAL NOT NULL)"
+                )
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def get(self, key: str) -> str | None:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT summary FROM summaries WHERE key = ?", (key,)
+                ).fetchone()
+        except self._errors:
+            return None
+        return row[0] if row else None
+
+    def put(self, key: str, summary: str) -> None:
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO summaries (key, summary, created) VALUES (?, ?, ?)",
+                    (key, summary, time.time()),
+                )
+        except self._errors as exc:
+            warnings.warn(f"failed to cache summary: {exc}", stacklevel=2)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,211 @@
+"""Map-reduce summarization for transcripts that exceed the model context.
+
+The transcript is split into token-budgeted, overlapping windows on cue
+(line) or sentence boundaries. Windows are summarized in parallel across one
+or more backends, and the partial summaries are reduced hierarchically until
+they fit a single final request.
+"""
+
+import re
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+from . import metrics
+from .compress import compress_transcript
+from .summarizer import StreamingSummarizer, Summarizer
+from .tokens import Strategy, choose_strategy, estimate_tokens
+from .types import DEFAULT_CHUNK_PROMPT, DEFAULT_REDUCE_PROMPT
+
+DEFAULT_CHUNK_TOKENS = 3000
+DEFAULT_CHUNK_OVERLAP = 200
+DEFAULT_FAN_OUT = 4
+DEFAULT_REDUCE_DEPTH = 3
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?…。])\s+")
+
+
+def _split_oversized(unit: str, max_tokens: int) -> Iterator[str]:
+    """Break a unit that alone exceeds the budget at sentences, then words."""
+    for sentence in _SENTENCE_END_RE.split(unit):
+        if estimate_tokens(sentence) <= max_tokens:
+            yield sentence
+            continue
+        words: list[str] = []
+        size = 0
+        for word in sentence.split():
+            cost = estimate_tokens(word) + 1
+            if words and size + cost > max_tokens:
+                yield " ".join(words)
+                words, size = [], 0
+            words.append(word)
+            size += cost
+        if words:
+            yield " ".join(words)
+
+
+def _units(text: str, max_tokens: int) -> Iterator[tuple[str, int]]:
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        tokens = estimate_tokens(line)
+        if tokens <= max_tokens:
+            yield line, tokens
+        else:
+            for part in _split_oversized(line, max_tokens):
+                yield part, estimate_tokens(part)
+
+
+def _check_budget(max_tokens: int, overlap_tokens: int) -> None:
+    if max_tokens < 1:
+        raise ValueError("max_tokens must be positive")
+    if not 0 <= overlap_tokens < max_tokens:
+        raise ValueError("overlap_tokens must be in [0, max_tokens)")
+
+
+def split_transcript(
+    text: str,
+    max_tokens: int = DEFAULT_CHUNK_TOKENS,
+    overlap_tokens: int = DEFAULT_CHUNK_OVERLAP,
+) -> list[str]:
+    """Split text into windows of at most ``max_tokens`` estimated tokens.
+
+    Consecutive windows share up to ``overlap_tokens`` of trailing context so
+    that points spanning a boundary are not lost.
+    """
+    _check_budget(max_tokens, overlap_tokens)
+
+    chunks: list[str] = []
+    window: list[tuple[str, int]] = []
+    size = 0
+
+    for unit, tokens in _units(text, max_tokens):
+        if window and size + tokens > max_tokens:
+            chunks.append("\n".join(u for u, _ in window))
+            carry: list[tuple[str, int]] = []
+            carried = 0
+            for prev, prev_tokens in reversed(window):
+                if carried + prev_tokens > overlap_tokens:
+                    break
+                carry.insert(0, (prev, prev_tokens))
+                carried += prev_tokens
+            if carried + tokens > max_tokens:
+                carry, carried = [], 0
+            window, size = carry, carried
+        window.append((unit, tokens))
+        size += tokens
+
+    if window:
+        chunks.append("\n".join(u for u, _ in window))
+    return chunks
+
+
+class ChunkedSummarizer:
+    """Summarizer that map-reduces long transcripts over one or more backends.
+
+    The transcript's tokens are counted once to choose a strategy before
+    any request is sent. Transcripts that fit in a single chunk go straight
+    to the first backend. Longer ones are compressed to ``compress_tokens``
+    when that is set; otherwise they are split, summarized with at most
+    ``fan_out`` concurrent requests (assigned round-robin across
+    ``backends``), and reduced for at most ``reduce_depth`` levels before the
+    final summary is requested.
+    """
+
+    def __init__(
+        self,
+        backends: Summarizer | Sequence[Summarizer],
+        chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+        overlap_tokens: int = DEFAULT_CHUNK_OVERLAP,
+        fan_out: int = DEFAULT_FAN_OUT,
+        reduce_depth: int = DEFAULT_REDUCE_DEPTH,
+        chunk_prompt: str = DEFAULT_CHUNK_PROMPT,
+        reduce_prompt: str = DEFAULT_REDUCE_PROMPT,
+        compress_tokens: int | None = None,
+    ):
+        if not isinstance(backends, Sequence):
+            backends = [backends]
+        if not backends:
+            raise ValueError("at least one backend is required")
+        if fan_out < 1 or reduce_depth < 1:
+            raise ValueError("fan_out and reduce_depth must be at least 1")
+        if compress_tokens is not None and compress_tokens < 1:
+            raise ValueError("compress_tokens must be at least 1")
+        _check_budget(chunk_tokens, overlap_tokens)
+        self._backends = list(backends)
+        self._chunk_tokens = chunk_tokens
+        self._overlap_tokens = overlap_tokens
+        self._fan_out = fan_out
+        self._reduce_depth = reduce_depth
+        self._chunk_prompt = chunk_prompt
+        self._reduce_prompt = reduce_prompt
+        self._compress_tokens = compress_tokens
+
+    @property
+    def model(self) -> str | None:
+        return getattr(self._backends[0], "model", None)
+
+    @property
+    def options(self) -> dict:
+        options = {
+            **(getattr(self._backends[0], "options", None) or {}),
+            "chunk_tokens": self._chunk_tokens,
+            "overlap_tokens": self._overlap_tokens,
+            "reduce_depth": self._reduce_depth,
+        }
+        if self._compress_tokens is not None:
+            options["compress_tokens"] = self._compress_tokens
+        return options
+
+    def plan(self, transcript: str) -> Strategy:
+        """Return the strategy ``summarize`` would use for ``transcript``."""
+        return choose_strategy(
+            estimate_tokens(transcript), self._chunk_tokens, self._compress_tokens
+        )
+
+    def _map(self, chunks: list[str], prompt: str) -> list[str]:
+        def run(indexed: tuple[int, str]) -> str:
+            i, chunk = indexed
+            return self._backends[i % len(self._backends)].summarize(chunk, prompt)
+
+        workers = min(self._fan_out, len(chunks))
+        with ThreadPoolExecutor(workers, thread_name_prefix="yt-subs-chunk") as pool:
+            return list(pool.map(run, enumerate(chunks)))
+
+    def _prepare(self, transcript: str) -> str:
+        """Shrink the transcript to something that fits one final request."""
+        with metrics.span("plan") as timing:
+            tokens = estimate_tokens(transcript)
+            strategy = choose_strategy(tokens, self._chunk_tokens, self._compress_tokens)
+            timing.set(strategy=strategy.value, tokens=tokens)
+        if strategy is Strategy.SINGLE:
+            return transcript
+        if strategy is Strategy.COMPRESSED:
+            transcript = compress_transcript(transcript, self._compress_tokens).text
+        return self._reduce(transcript)
+
+    def _reduce(self, transcript: str) -> str:
+        text = transcript
+        for depth in range(self._reduce_depth):
+            if estimate_tokens(text) <= self._chunk_tokens:
+                break
+            first = depth == 0
+            chunks = split_transcript(
+                text, self._chunk_tokens, self._overlap_tokens if first else 0
+            )
+            if len(chunks) <= 1:
+                break
+            partials = self._map(chunks, self._chunk_prompt if first else self._reduce_prompt)
+            text = "\n\n".join(p.strip() for p in partials)
+        return text
+
+    def summarize(self, transcript: str, prompt: str) -> str:
+        return self._backends[0].summarize(self._prepare(transcript), prompt)
+
+    def stream(self, transcript: str, prompt: str) -> Iterator[str]:
+        """Run the map/reduce phases, then stream the final summary."""
+        text = self._prepare(transcript)
+        final = self._backends[0]
+        if isinstance(final, StreamingSummarizer):
+            yield from final.stream(text, prompt)
+        else:
+            yield final.summarize(text, prompt)
@@ -1,70 +1,172 @@
 import re
+from collections import deque
+from collections.abc import Iterable, Iterator
 
+from . import metrics
 from .types import CleanedTranscript, SubtitleContent
 
-_METADATA_RE = re.compile(r"^(WEBVTT|Kind:|Language:|NOTE)")
-_TIMESTAMP_RE = re.compile(r".*-->.*")
-_SEQ_NUMBER_RE = re.compile(r"^\d+$")
+_METADATA_PREFIXES = ("WEBVTT", "Kind:", "Language:", "NOTE")
 _HTML_TAG_RE = re.compile(r"<[^>]*>")
 _POSITIONING_RE = re.compile(r"align:start position:\d+%?")
 _INLINE_TIMESTAMP_RE = re.compile(r"\b\d{2}:\d{2}:\d{2}\.\d+\b")
 
+DEFAULT_DEDUP_WINDOW = 16
+# Shorter tail/head matches ("of the") are too likely to be coincidence.
+_MIN_OVERLAP_WORDS = 3
 
-def _is_metadata(line: str) -> bool:
-    return bool(_METADATA_RE.match(line))
 
+def _clean_line(raw_line: str) -> str:
+    """Classify and strip one subtitle line in a single pass.
 
-def _is_timestamp(line: str) -> bool:
-    return bool(_TIMESTAMP_RE.match(line))
+    Returns the transcript text of the line, or "" for metadata, cue
+    timing, sequence numbers and lines with nothing left after stripping.
+    Each regex runs only when a cheap substring check shows it can match,
+    so plain text lines never touch the regex engine.
+    """
+    if raw_line.startswith(_METADATA_PREFIXES) or "-->" in raw_line:
+        return ""
+
+    line = raw_line.strip()
+    if line.isdecimal():
+        return ""
 
+    if "<" in line:
+        line = _HTML_TAG_RE.sub("", line)
+    if "align:start" in line:
+        line = _POSITIONING_RE.sub("", line)
+    if ":" in line:
+        line = _INLINE_TIMESTAMP_RE.sub("", line)
+    return line.strip()
 
-def _is_seq_number(line: str) -> bool:
-    return bool(_SEQ_NUMBER_RE.match(line))
 
+def _overlap_words(previous: list[str], current: list[str]) -> int:
+    """Length of the longest tail of ``previous`` that starts ``current``."""
+    for size in range(min(len(previous), len(current)), _MIN_OVERLAP_WORDS - 1, -1):
+        if previous[-size:] == current[:size]:
+            return size
+    return 0
 
-def _strip_tags(line: str) -> str:
-    return _HTML_TAG_RE.sub("", line)
 
+class Deduplicator:
+    """Push-based caption deduplication using constant memory.
 
-def _strip_positioning(line: str) -> str:
-    return _POSITIONING_RE.sub("", line)
+    - A line equal to one of the last ``window`` emitted lines is dropped;
+      repeats further apart (choruses, catchphrases) are kept.
+    - A line already contained in the previous one is dropped, and a line
+      that extends it ("karaoke" growth) replaces it.
+    - A line starting with the previous line's last words has that overlap
+      removed, so rolling captions read as continuous text.
 
+    One line is held back until the next arrives, since it may still grow.
+    """
 
-def _strip_inline_timestamps(line: str) -> str:
-    return _INLINE_TIMESTAMP_RE.sub("", line)
+    def __init__(self, window: int = DEFAULT_DEDUP_WINDOW):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self._window = window
+        self._recent: deque[str] = deque()
+        self._recent_set: set[str] = set()
+        self._pending: str | None = None
+        # Full text of the most recent caption line; ``_pending`` may be a
+        # trimmed or extended version of it.
+        self._shown = ""
+
+    def _emit(self) -> str | None:
+        line = self._pending
+        if line is not None:
+            if len(self._recent) == self._window:
+                self._recent_set.discard(self._recent.popleft())
+            self._recent.append(line)
+            self._recent_set.add(line)
+        return line
+
+    def push(self, line: str) -> str | None:
+        """Add a line; return a finished line if one is ready."""
+        shown = self._shown
+        if line in self._recent_set or f" {line} " in f" {shown} ":
+            return None
+
+        full = line
+        if self._pending is not None:
+            # Growth ends on a word boundary: "No" then "Nobody came" are two lines.
+            if line == shown or line.startswith(shown + " "):
+                self._pending += line[len(shown):]
+                self._shown = line
+                return None
+            head = line.split(maxsplit=_MIN_OVERLAP_WORDS)[:_MIN_OVERLAP_WORDS]
+            # Cheap substring test first; most lines share no overlap at all.
+            if len(head) == _MIN_OVERLAP_WORDS and " ".join(head) in shown:
+                words = line.split()
+                overlap = _overlap_words(shown.split(), words)
+                if overlap:
+                    line = " ".join(words[overlap:])
+                    if line in self._recent_set:
+                        self._shown = full
+                        return None
+
+        ready = self._emit()
+        self._pending, self._shown = line, full
+        return ready
+
+    def flush(self) -> str | None:
+        """Return the held-back line, if any, at the end of input."""
+        ready = self._emit()
+        self._pending, self._shown = None, ""
+        return ready
+
+
+class TranscriptCleaner:
+    """Push-based cleaner: raw subtitle lines in, transcript lines out."""
+
+    def __init__(self, window: int = DEFAULT_DEDUP_WINDOW):
+        self._dedup = Deduplicator(window)
+
+    def push(self, raw_line: str) -> str | None:
+        line = _clean_line(raw_line)
+        return self._dedup.push(line) if line else None
+
+    def flush(self) -> str | None:
+        return self._dedup.flush()
+
+
+def dedup_lines(
+    lines: Iterable[str], window: int = DEFAULT_DEDUP_WINDOW
+) -> Iterator[str]:
+    """Lazily remove caption repetition (see ``Deduplicator``)."""
+    dedup = Deduplicator(window)
+    for line in lines:
+        ready = dedup.push(line)
+        if ready is not None:
+            yield ready
+    ready = dedup.flush()
+    if ready is not None:
+        yield ready
+
+
+def clean_lines(
+    raw_lines: Iterable[str], window: int = DEFAULT_DEDUP_WINDOW
+) -> Iterator[str]:
+    """Lazily turn raw VTT/SRT lines into deduplicated transcript lines.
+
+    Consumes its input one line at a time, so it can be fed straight from a
+    network stream without holding the whole subtitle file in memory.
+    """
+    cleaned = (line for line in map(_clean_line, raw_lines) if line)
+    return dedup_lines(cleaned, window)
 
 
 def clean_subtitle(content: SubtitleContent) -> CleanedTranscript:
-    """Clean VTT/SRT subtitle text into a plain transcript.
+    """Clean subtitle text into a plain transcript.
 
     Strips metadata, timestamps, HTML tags, positioning info,
-    and deduplicates lines (preserving order).
+    and removes caption repetition (preserving order). Formats other than
+    VTT/SRT are parsed according to ``content.ext``.
     """
-    seen: set[str] = set()
-    lines: list[str] = []
-
-    for raw_line in content.raw_text.splitlines():
-        if _is_metadata(raw_line):
-            continue
-        if _is_timestamp(raw_line):
-            continue
-        if _is_seq_number(raw_line.strip()):
-            continue
-
-        line = _strip_tags(raw_line)
-        line = _strip_positioning(line)
-        line = _strip_inline_timestamps(line)
-        line = line.strip()
-
-        if not line:
-            continue
-        if line in seen:
-            continue
-
-        seen.add(line)
-        lines.append(line)
-
-    return CleanedTranscript(
-        language_code=content.language.code,
-        text="\n".join(lines),
-    )
+    # Imported here: the format parsers build on this module.
+    from .formats import transcript_lines
+
+    with metrics.span("clean", lang=content.language.code) as timing:
+        lines = list(transcript_lines(content.raw_text.splitlines(), content.ext))
+        text = "\n".join(lines)
+        timing.set(lines=len(lines), chars=len(text))
+    return CleanedTranscript(language_code=content.language.code, text=text)
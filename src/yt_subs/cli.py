@@ -1,25 +1,214 @@
 import argparse
+import contextlib
+import json
 import os
 import sys
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import TypeVar
 
-from .cleaning import clean_subtitle
+from . import metrics
+from .bulk import clean_files, find_subtitle_files, output_names, resummarize_files
+from .cache import MetadataCache, SQLiteSummaryStore
+from .chunking import (
+    DEFAULT_CHUNK_OVERLAP,
+    DEFAULT_CHUNK_TOKENS,
+    DEFAULT_FAN_OUT,
+    DEFAULT_REDUCE_DEPTH,
+    ChunkedSummarizer,
+)
+from .client import ServerClient
+from .pipeline import (
+    DEFAULT_IO_WORKERS,
+    DEFAULT_SUMMARY_WORKERS,
+    download_transcript,
+    run_batch,
+    stored_transcript,
+    summarize_languages,
+)
+from .playlist import DEFAULT_KNOWN_STREAK, SyncState, iter_new_video_ids
+from .pool import LEAST_OUTSTANDING, STRATEGIES, PooledSummarizer
+from .store import DEFAULT_SEARCH_LIMIT, TranscriptStore
 from .subtitles import (
-    fetch_subtitle_content,
+    extract_video_id,
     filter_preferred,
+    find_language,
     list_languages,
 )
-from .summarizer import OllamaSummarizer, Summarizer
+from .summarizer import (
+    CachingSummarizer,
+    OllamaSummarizer,
+    StreamingSummarizer,
+    Summarizer,
+)
+from .tokens import (
+    DEFAULT_MAX_CONTEXT,
+    DEFAULT_RESPONSE_TOKENS,
+    TEMPLATE_TOKENS,
+    estimate_tokens,
+    request_context,
+)
 from .types import (
+    DEFAULT_CHUNK_PROMPT,
     DEFAULT_MODEL,
+    DEFAULT_OLLAMA_URL,
     DEFAULT_PREFERRED_LANGS,
+    DEFAULT_REDUCE_PROMPT,
     DEFAULT_SUMMARIZATION_PROMPT,
+    DEFAULT_TIMESTAMPED_PROMPT,
+    BatchResult,
     NoSubtitlesAvailableError,
+    ServerUnavailableError,
     SubtitleLanguage,
     SubtitleSource,
     YtSubsError,
 )
 
 
+# Persist sync progress periodically so an interrupted run keeps its work.
+_SYNC_SAVE_EVERY = 25
+
+T = TypeVar("T")
+
+
+def _add_batch_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--io-workers",
+        type=int,
+        default=DEFAULT_IO_WORKERS,
+        metavar="N",
+        help=f"Batch mode: concurrent metadata/subtitle downloads "
+        f"(default: {DEFAULT_IO_WORKERS})",
+    )
+    parser.add_argument(
+        "--summary-workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help=f"Batch mode: concurrent summarization requests "
+        f"(default: {DEFAULT_SUMMARY_WORKERS} per Ollama endpoint)",
+    )
+
+
+def _add_summarizer_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--ollama-url",
+        action="append",
+        dest="ollama_urls",
+        metavar="URL",
+        help=f"Ollama endpoint; repeat to load-balance summaries across hosts "
+        f"(default: {DEFAULT_OLLAMA_URL})",
+    )
+    parser.add_argument(
+        "--balance",
+        choices=STRATEGIES,
+        default=LEAST_OUTSTANDING,
+        help=f"How requests are spread over several --ollama-url hosts "
+        f"(default: {LEAST_OUTSTANDING})",
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=DEFAULT_CHUNK_TOKENS,
+        metavar="N",
+        help=f"Split transcripts longer than N tokens and summarize the parts "
+        f"(default: {DEFAULT_CHUNK_TOKENS})",
+    )
+    parser.add_argument(
+        "--chunk-overlap",
+        type=int,
+        default=DEFAULT_CHUNK_OVERLAP,
+        metavar="N",
+        help=f"Tokens of context shared by consecutive chunks "
+        f"(default: {DEFAULT_CHUNK_OVERLAP})",
+    )
+    parser.add_argument(
+        "--fan-out",
+        type=int,
+        default=DEFAULT_FAN_OUT,
+        metavar="N",
+        help=f"Concurrent chunk summaries per video (default: {DEFAULT_FAN_OUT})",
+    )
+    parser.add_argument(
+        "--reduce-depth",
+        type=int,
+        default=DEFAULT_REDUCE_DEPTH,
+        metavar="N",
+        help=f"Maximum levels of summary merging (default: {DEFAULT_REDUCE_DEPTH})",
+    )
+    parser.add_argument(
+        "--compress",
+        type=int,
+        metavar="TOKENS",
+        help="Transcripts too long for one request are cut to their most "
+        "informative sentences, about TOKENS tokens, instead of being chunked",
+    )
+    parser.add_argument(
+        "--keep-alive",
+        metavar="DURATION",
+        help="How long Ollama keeps the model loaded after a request, e.g. 30m, "
+        "or -1 for ever (default: the server's setting)",
+    )
+    parser.add_argument(
+        "--num-ctx",
+        type=int,
+        metavar="N",
+        help="Model context size in tokens (Ollama option num_ctx)",
+    )
+    parser.add_argument(
+        "--max-ctx",
+        type=int,
+        default=DEFAULT_MAX_CONTEXT,
+        metavar="N",
+        help=f"Without --num-ctx, size the context to fit the run's prompts and "
+        f"a full chunk, up to N tokens (default: {DEFAULT_MAX_CONTEXT})",
+    )
+    parser.add_argument(
+        "--num-predict",
+        type=int,
+        metavar="N",
+        help="Maximum tokens to generate per summary (Ollama option num_predict)",
+    )
+    parser.add_argument(
+        "--option",
+        action="append",
+        dest="ollama_options",
+        metavar="KEY=VALUE",
+        help="Other Ollama generation option, e.g. temperature=0.2; repeatable",
+    )
+    parser.add_argument(
+        "--warm-up",
+        action="store_true",
+        help="Load the model and the prompt prefix while subtitles download",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the on-disk metadata, summary and transcript caches",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached metadata, transcripts and summaries and recompute them "
+        "(the cache is updated)",
+    )
+
+
+def _add_metrics_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--metrics",
+        choices=("jsonl", "prometheus"),
+        help="Record per-stage timings: one JSON line per stage as it finishes, "
+        "or Prometheus text totals at exit",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="FILE",
+        help="Append metrics to FILE instead of stderr",
+    )
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="yt-subs",
@@ -29,10 +218,266 @@ def build_parser() -> argparse.ArgumentParser:
         "-l",
         metavar="LANG",
         dest="lang",
-        help="Subtitle language code (e.g. en, es, fr). "
-        "If omitted, shows interactive language picker.",
+        help="Subtitle language code (e.g. en, es, fr), or a comma-separated list "
+        "(en,fa,fr) to summarize each. If omitted, shows interactive language picker.",
+    )
+    parser.add_argument(
+        "--all-preferred",
+        action="store_true",
+        help=f"Summarize every available preferred language "
+        f"({', '.join(DEFAULT_PREFERRED_LANGS)})",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        metavar="DIR",
+        help="Write each summary to DIR/<video id>.<lang>.txt instead of stdout",
+    )
+    parser.add_argument(
+        "urls",
+        nargs="*",
+        metavar="url",
+        help="YouTube video URL. Several URLs run in batch mode.",
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        metavar="FILE",
+        help="Read URLs from FILE, one per line ('-' for stdin). Implies batch mode.",
+    )
+    parser.add_argument(
+        "--server",
+        metavar="URL",
+        default=os.environ.get("YT_SUBS_SERVER"),
+        help="Send single-video requests to a running 'yt-subs serve' daemon "
+        "(default: $YT_SUBS_SERVER); falls back to local processing if unreachable",
+    )
+    parser.add_argument(
+        "--timestamps",
+        action="store_true",
+        help="Prefix transcript lines with [m:ss] cue times and ask the model "
+        "to cite them",
+    )
+    _add_batch_arguments(parser)
+    _add_summarizer_arguments(parser)
+    _add_metrics_arguments(parser)
+    return parser
+
+
+def build_serve_parser() -> argparse.ArgumentParser:
+    # The daemon module pulls in http.server; only ``serve`` needs it.
+    from .server import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_SERVER_WORKERS
+
+    parser = argparse.ArgumentParser(
+        prog="yt-subs serve",
+        description="Run a local HTTP/JSON daemon that keeps yt-dlp and Ollama "
+        "clients warm between requests",
+    )
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Address to listen on (default: {DEFAULT_HOST})",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port to listen on (default: {DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_SERVER_WORKERS,
+        metavar="N",
+        help=f"Requests processed concurrently; others wait in line "
+        f"(default: {DEFAULT_SERVER_WORKERS})",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Log each request to stderr",
+    )
+    _add_summarizer_arguments(parser)
+    _add_metrics_arguments(parser)
+    return parser
+
+
+def build_clean_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="yt-subs clean",
+        description="Turn saved subtitle files into plain transcripts on every CPU",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        type=Path,
+        metavar="path",
+        help="Subtitle file (.vtt, .srt, ...) or a directory searched for them",
+    )
+    parser.add_argument(
+        "-l",
+        metavar="LANG",
+        dest="lang",
+        help="Language code of the files (default: taken from <name>.<lang>.vtt)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        metavar="DIR",
+        help="Write each transcript to DIR/<relative path>.txt instead of JSON lines on stdout",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Cleaning processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Files sent to a process at a time (default: about four chunks per process)",
+    )
+    parser.add_argument(
+        "--timestamps",
+        action="store_true",
+        help="Prefix transcript lines with their [m:ss] cue times",
+    )
+    _add_metrics_arguments(parser)
+    return parser
+
+
+def build_resummarize_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="yt-subs resummarize",
+        description="Summarize saved subtitle files again (e.g. with a new model "
+        "or prompt) without contacting YouTube",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        type=Path,
+        metavar="path",
+        help="Subtitle file (.vtt, .srt, ...) or a directory searched for them",
+    )
+    parser.add_argument(
+        "-l",
+        metavar="LANG",
+        dest="lang",
+        help="Language code of the files (default: taken from <name>.<lang>.vtt)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        metavar="DIR",
+        help="Write each summary to DIR/<relative path>.txt instead of JSON lines on stdout",
+    )
+    parser.add_argument(
+        "--clean-workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Processes cleaning subtitle files (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--summary-workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help=f"Concurrent summarization requests "
+        f"(default: {DEFAULT_SUMMARY_WORKERS} per Ollama endpoint)",
+    )
+    parser.add_argument(
+        "--timestamps",
+        action="store_true",
+        help="Prefix transcript lines with [m:ss] cue times and ask the model "
+        "to cite them",
+    )
+    _add_summarizer_arguments(parser)
+    _add_metrics_arguments(parser)
+    return parser
+
+
+def build_search_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="yt-subs search",
+        description="Full-text search over every transcript downloaded so far",
+    )
+    parser.add_argument(
+        "query",
+        nargs="+",
+        help='Words that must all occur; FTS5 syntax ("exact phrase", OR, NOT, '
+        "prefix*) is supported",
+    )
+    parser.add_argument(
+        "-l",
+        metavar="LANG",
+        dest="lang",
+        help="Only search transcripts in this language",
+    )
+    parser.add_argument(
+        "-n",
+        "--limit",
+        type=int,
+        default=DEFAULT_SEARCH_LIMIT,
+        metavar="N",
+        help=f"Show at most N matches (default: {DEFAULT_SEARCH_LIMIT})",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print one JSON object per match",
+    )
+    return parser
+
+
+def build_sync_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="yt-subs sync",
+        description="Summarize videos from playlists or channels that were not "
+        "processed by an earlier sync",
+    )
+    parser.add_argument(
+        "-l",
+        metavar="LANG",
+        dest="lang",
+        help="Subtitle language code (default: first preferred language available)",
+    )
+    parser.add_argument(
+        "urls",
+        nargs="+",
+        metavar="url",
+        help="Playlist or channel URL",
+    )
+    parser.add_argument(
+        "--state",
+        type=Path,
+        metavar="FILE",
+        help="File recording processed video IDs "
+        "(default: sync-state.json in the cache directory)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help=f"Scan every channel entry instead of stopping after {DEFAULT_KNOWN_STREAK} "
+        f"consecutive already-known videos (playlists are always scanned in full)",
+    )
+    parser.add_argument(
+        "--timestamps",
+        action="store_true",
+        help="Prefix transcript lines with [m:ss] cue times and ask the model "
+        "to cite them",
     )
-    parser.add_argument("url", help="YouTube video URL")
+    _add_batch_arguments(parser)
+    _add_summarizer_arguments(parser)
+    _add_metrics_arguments(parser)
     return parser
 
 
@@ -63,66 +508,796 @@ def interactive_select(languages: list[SubtitleLanguage]) -> SubtitleLanguage |
     return None
 
 
-def _find_language_by_code(
-    languages: list[SubtitleLanguage], code: str
-) -> SubtitleLanguage | None:
-    """Find first matching language by code, preferring manual over auto."""
-    manual = [l for l in languages if l.code == code and l.source == SubtitleSource.MANUAL]
-    if manual:
-        return manual[0]
-    auto = [l for l in languages if l.code == code and l.source == SubtitleSource.AUTO]
-    if auto:
-        return auto[0]
-    return None
+def _choose_language(languages: list[SubtitleLanguage]) -> SubtitleLanguage | None:
+    """A preferred language picked from the menu; errors are reported on stderr."""
+    preferred = filter_preferred(languages, DEFAULT_PREFERRED_LANGS)
+    if not preferred:
+        print("error: no subtitles available for this video.", file=sys.stderr)
+        return None
 
+    selected = interactive_select(preferred)
+    if selected is None:
+        print("error: no language selected.", file=sys.stderr)
+    return selected
 
-def main(argv: list[str] | None = None, summarizer: Summarizer | None = None) -> int:
-    parser = build_parser()
-    args = parser.parse_args(argv)
 
-    model = os.environ.get("YT_SUBS_MODEL", DEFAULT_MODEL)
+def _prompt(args: argparse.Namespace) -> str:
+    # ``serve`` has no --timestamps option.
+    if getattr(args, "timestamps", False):
+        return DEFAULT_TIMESTAMPED_PROMPT
+    return DEFAULT_SUMMARIZATION_PROMPT
+
+
+def _split_languages(value: str | None) -> list[str]:
+    """Language codes from a comma-separated -l value, without duplicates."""
+    if not value:
+        return []
+    return list(dict.fromkeys(code.strip() for code in value.split(",") if code.strip()))
+
+
+def _write_summary(output_dir: Path, url: str, result: BatchResult) -> Path:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{extract_video_id(url) or 'video'}.{result.language_code}.txt"
+    path.write_text(result.summary + "\n", encoding="utf-8")
+    return path
+
+
+def _run_languages(
+    args: argparse.Namespace,
+    url: str,
+    languages: list[SubtitleLanguage],
+    codes: list[str],
+    summarizer: Summarizer,
+    store: TranscriptStore | None,
+) -> int:
+    """Download and summarize several languages of one video concurrently.
+
+    Without -l or --all-preferred (``-o`` alone), the language is chosen
+    from the menu, as for a summary printed to stdout.
+    """
+    failures = 0
+    selected = []
+    if args.all_preferred:
+        codes = list(DEFAULT_PREFERRED_LANGS)
+    elif not codes:
+        chosen = _choose_language(languages)
+        if chosen is None:
+            return 1
+        selected.append(chosen)
+    for code in codes:
+        language = find_language(languages, code)
+        if language is not None:
+            selected.append(language)
+        elif not args.all_preferred:
+            print(f"error: no subtitles found for language '{code}'.", file=sys.stderr)
+            failures += 1
+    if not selected:
+        if args.all_preferred:
+            print("error: no subtitles available for this video.", file=sys.stderr)
+        return 1
+
+    codes_text = ", ".join(language.code for language in selected)
+    print(f"Downloading {codes_text} subtitles...", file=sys.stderr)
+    for result in summarize_languages(
+        url,
+        selected,
+        summarizer,
+        prompt=_prompt(args),
+        io_workers=args.io_workers,
+        summary_workers=args.summary_workers,
+        timestamps=args.timestamps,
+        store=store,
+        refresh=args.refresh,
+    ):
+        if not result.ok:
+            failures += 1
+            print(f"error: {result.language_code}: {result.error}", file=sys.stderr)
+        elif args.output_dir:
+            try:
+                path = _write_summary(args.output_dir, url, result)
+            except OSError as exc:
+                print(f"error: failed to write summary: {exc}", file=sys.stderr)
+                failures += 1
+            else:
+                print(f"Wrote {path}", file=sys.stderr)
+        else:
+            print(f"== {result.language_code} ==\n{result.summary}\n", flush=True)
+    return 1 if failures else 0
+
+
+def _iter_input_urls(path: str) -> Iterator[str]:
+    """Yield non-empty, non-comment lines from a file or stdin."""
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in stream:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
 
+
+def _iter_urls(args: argparse.Namespace) -> Iterator[str]:
+    yield from args.urls
+    if args.input:
+        yield from _iter_input_urls(args.input)
+
+
+def _run_batch(
+    args: argparse.Namespace,
+    urls: Iterable[str],
+    summarizer: Summarizer,
+    metadata_cache: MetadataCache | None,
+    on_success: Callable[[BatchResult], None] | None = None,
+    on_failure: Callable[[BatchResult], None] | None = None,
+) -> int:
+    """Process many URLs, printing one JSON line per video as it finishes."""
+    failures = 0
+    store = None if args.no_cache else _open_store(TranscriptStore, "transcript store")
     try:
-        languages = list_languages(args.url)
-    except Exception as exc:
-        print(f"error: failed to fetch video info: {exc}", file=sys.stderr)
+        for result in run_batch(
+            urls,
+            summarizer,
+            lang=args.lang,
+            prompt=_prompt(args),
+            io_workers=args.io_workers,
+            summary_workers=args.summary_workers,
+            metadata_cache=metadata_cache,
+            refresh=args.refresh,
+            timestamps=args.timestamps,
+            store=store,
+        ):
+            record = {"url": result.url, "ok": result.ok, "language": result.language_code}
+            if result.ok:
+                record["summary"] = result.summary
+                if on_success is not None:
+                    on_success(result)
+            else:
+                failures += 1
+                record["error"] = result.error
+                print(f"error: {result.url}: {result.error}", file=sys.stderr)
+                if on_failure is not None:
+                    on_failure(result)
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+    except OSError as exc:
+        print(f"error: failed to read URLs: {exc}", file=sys.stderr)
+        return 1
+    except YtSubsError as exc:
+        print(f"error: {exc}", file=sys.stderr)
         return 1
+    finally:
+        if store is not None:
+            store.close()
 
-    if args.lang:
-        selected = _find_language_by_code(languages, args.lang)
-        if selected is None:
-            print(
-                f"error: no subtitles found for language '{args.lang}'.",
-                file=sys.stderr,
-            )
-            return 1
+    if isinstance(summarizer, CachingSummarizer):
+        print(
+            f"summary cache: {summarizer.hits} hits, {summarizer.misses} misses",
+            file=sys.stderr,
+        )
+    return 1 if failures else 0
+
+
+def _parse_keep_alive(value: str | None) -> str | float | None:
+    """Ollama takes a duration string ("30m") or a number of seconds (-1)."""
+    if value is None:
+        return None
+    try:
+        return float(value) if "." in value else int(value)
+    except ValueError:
+        return value
+
+
+def _ollama_options(args: argparse.Namespace) -> dict:
+    """Collect generation options from --num-ctx, --num-predict and --option."""
+    options = {}
+    for item in args.ollama_options or []:
+        key, sep, value = item.partition("=")
+        if not sep or not key:
+            raise ValueError(f"--option expects KEY=VALUE, got '{item}'")
+        try:
+            options[key] = json.loads(value)
+        except json.JSONDecodeError:
+            options[key] = value
+    if args.num_ctx is not None:
+        options["num_ctx"] = args.num_ctx
+    if args.num_predict is not None:
+        options["num_predict"] = args.num_predict
+    return options
+
+
+def _chunk_budget(args: argparse.Namespace, options: dict) -> int:
+    """--chunk-tokens, lowered if needed so a chunk, the prompt and the response fit."""
+    limit = options.get("num_ctx", args.max_ctx)
+    response = options.get("num_predict", DEFAULT_RESPONSE_TOKENS)
+    if response < 0:
+        response = DEFAULT_RESPONSE_TOKENS
+    overhead = estimate_tokens(_prompt(args)) + TEMPLATE_TOKENS + response
+    if limit - overhead < 1:
+        raise ValueError(f"a {limit}-token context leaves no room for the transcript")
+    return min(args.chunk_tokens, limit - overhead)
+
+
+def _run_context(args: argparse.Namespace, options: dict, chunk_tokens: int) -> int:
+    """num_ctx for every request of a run: the largest prompt plus a full chunk.
+
+    Ollama reloads the model whenever num_ctx changes, so map, reduce, final
+    and warm-up requests all share this one size.
+    """
+    response = options.get("num_predict", DEFAULT_RESPONSE_TOKENS)
+    if response < 0:
+        response = DEFAULT_RESPONSE_TOKENS
+    prompts = (_prompt(args), DEFAULT_CHUNK_PROMPT, DEFAULT_REDUCE_PROMPT)
+    prompt_tokens = max(map(estimate_tokens, prompts)) + chunk_tokens
+    return request_context(prompt_tokens, response, args.max_ctx)
+
+
+def _warm_up(backends: list[OllamaSummarizer], prompt: str, transcript_tokens: int) -> None:
+    """Load the model on every backend in the background."""
+
+    def run(backend: OllamaSummarizer) -> None:
+        try:
+            backend.warm_up(prompt, transcript_tokens)
+        except YtSubsError as exc:
+            print(f"warning: {exc}", file=sys.stderr)
+
+    for backend in backends:
+        threading.Thread(target=run, args=(backend,), name="yt-subs-warm-up", daemon=True).start()
+
+
+def _generation_options(
+    args: argparse.Namespace, transcript: str | None = None
+) -> tuple[dict, int]:
+    """The Ollama options and chunk budget of a run; see ``_build_summarizer``."""
+    options = _ollama_options(args)
+    chunk_tokens = _chunk_budget(args, options)
+    single_shot = transcript is not None and estimate_tokens(transcript) <= chunk_tokens
+    if "num_ctx" not in options and not single_shot:
+        options["num_ctx"] = _run_context(args, options, chunk_tokens)
+    return options, chunk_tokens
+
+
+def _build_summarizer(
+    args: argparse.Namespace, model: str, transcript: str | None = None
+) -> Summarizer:
+    """The summarizer for a run, with one num_ctx for all its requests.
+
+    Given the ``transcript`` of a single-video run that fits in one request,
+    num_ctx is instead sized to that request (unless --num-ctx is set).
+    """
+    options, chunk_tokens = _generation_options(args, transcript)
+    keep_alive = _parse_keep_alive(args.keep_alive)
+    backends = [
+        OllamaSummarizer(
+            model=model,
+            base_url=url,
+            options=options,
+            keep_alive=keep_alive,
+            max_context=args.max_ctx,
+        )
+        for url in args.ollama_urls or [DEFAULT_OLLAMA_URL]
+    ]
+    if args.warm_up:
+        _warm_up(backends, _prompt(args), chunk_tokens)
+    pooled: Summarizer = backends[0]
+    if len(backends) > 1:
+        pooled = PooledSummarizer(backends, strategy=args.balance)
+    summarizer: Summarizer = ChunkedSummarizer(
+        pooled,
+        chunk_tokens=chunk_tokens,
+        overlap_tokens=args.chunk_overlap,
+        fan_out=args.fan_out,
+        reduce_depth=args.reduce_depth,
+        compress_tokens=args.compress,
+    )
+    store = None if args.no_cache else _open_store(SQLiteSummaryStore, "summary cache")
+    if store is not None:
+        summarizer = CachingSummarizer(summarizer, store, refresh=args.refresh)
+    return summarizer
+
+
+def _close_summarizer(summarizer: Summarizer) -> None:
+    """Close the summary cache a summarizer built by ``_build_summarizer`` holds."""
+    if isinstance(summarizer, CachingSummarizer):
+        summarizer.close()
+
+
+def _open_store(open_store: Callable[[], T], name: str) -> T | None:
+    """``open_store()``, or None with a warning if its file cannot be opened."""
+    import sqlite3
+
+    try:
+        return open_store()
+    except (sqlite3.Error, OSError) as exc:
+        print(f"warning: {name} unavailable, continuing without it: {exc}", file=sys.stderr)
+        return None
+
+
+def _check_worker_counts(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.summary_workers is None:
+        endpoints = len(args.ollama_urls or [DEFAULT_OLLAMA_URL])
+        args.summary_workers = DEFAULT_SUMMARY_WORKERS * endpoints
+    if args.io_workers < 1 or args.summary_workers < 1:
+        parser.error("worker counts must be at least 1")
+
+
+def _sync_main(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    summarizer: Summarizer | None,
+) -> int:
+    _check_worker_counts(parser, args)
+
+    if summarizer is None:
+        model = os.environ.get("YT_SUBS_MODEL", DEFAULT_MODEL)
+        try:
+            summarizer = _build_summarizer(args, model)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    state = SyncState(args.state)
+    known_streak = None if args.full else DEFAULT_KNOWN_STREAK
+    urls = (
+        f"https://www.youtube.com/watch?v={video_id}"
+        for video_id in iter_new_video_ids(args.urls, state, known_streak)
+    )
+    processed = skipped = 0
+
+    def checkpoint() -> None:
+        if (processed + skipped) % _SYNC_SAVE_EVERY:
+            return
+        try:
+            state.save()
+        except OSError as exc:
+            # The final save tries again and reports its failure as an error.
+            print(f"warning: failed to write sync state: {exc}", file=sys.stderr)
+
+    def record(result: BatchResult) -> None:
+        nonlocal processed
+        video_id = extract_video_id(result.url)
+        if video_id:
+            state.mark(video_id)
+            processed += 1
+            checkpoint()
+
+    def record_failure(result: BatchResult) -> None:
+        # Transient failures (network, Ollama) are retried by the next sync.
+        nonlocal skipped
+        video_id = extract_video_id(result.url)
+        if video_id and result.permanent:
+            state.mark_failed(video_id)
+            skipped += 1
+            checkpoint()
+
+    metadata_cache = None if args.no_cache else MetadataCache()
+    try:
+        status = _run_batch(
+            args,
+            urls,
+            summarizer,
+            metadata_cache,
+            on_success=record,
+            on_failure=record_failure,
+        )
+    finally:
+        try:
+            state.save()
+        except OSError as exc:
+            print(f"error: failed to write sync state: {exc}", file=sys.stderr)
+            status = 1
+    message = f"sync: {processed} new videos processed"
+    if skipped:
+        message += f", {skipped} without subtitles skipped from now on"
+    print(message, file=sys.stderr)
+    return status
+
+
+def _serve_main(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    summarizer: Summarizer | None,
+) -> int:
+    from .server import SubtitleServer, SubtitleService
+
+    if args.workers < 1:
+        parser.error("worker counts must be at least 1")
+
+    if summarizer is None:
+        model = os.environ.get("YT_SUBS_MODEL", DEFAULT_MODEL)
+        try:
+            summarizer = _build_summarizer(args, model)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    service = SubtitleService(
+        summarizer,
+        workers=args.workers,
+        metadata_cache=None if args.no_cache else MetadataCache(),
+    )
+    try:
+        server = SubtitleServer((args.host, args.port), service, verbose=args.verbose)
+    except OSError as exc:
+        print(f"error: cannot listen on {args.host}:{args.port}: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"yt-subs server listening on {server.url}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+@contextlib.contextmanager
+def _metrics_output(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> Iterator[None]:
+    """Enable stage metrics for the duration of a command if requested."""
+    # ``search`` has no metrics options.
+    if not getattr(args, "metrics", None):
+        yield
+        return
+
+    stream = sys.stderr
+    if args.metrics_file:
+        try:
+            stream = open(args.metrics_file, "a", encoding="utf-8")
+        except OSError as exc:
+            parser.error(f"cannot open --metrics-file: {exc}")
+    if args.metrics == "jsonl":
+        recorder = metrics.JSONLinesRecorder(stream)
     else:
-        preferred = filter_preferred(languages, DEFAULT_PREFERRED_LANGS)
-        if not preferred:
-            print("error: no subtitles available for this video.", file=sys.stderr)
+        recorder = metrics.PrometheusRecorder()
+    metrics.enable(recorder)
+    try:
+        yield
+    finally:
+        metrics.disable()
+        if isinstance(recorder, metrics.PrometheusRecorder):
+            stream.write(recorder.render())
+        if stream is not sys.stderr:
+            stream.close()
+
+
+def _search_main(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    summarizer: Summarizer | None,
+) -> int:
+    import sqlite3
+
+    if args.limit < 1:
+        parser.error("--limit must be at least 1")
+    query = " ".join(args.query)
+    try:
+        store = TranscriptStore()
+    except (sqlite3.Error, OSError) as exc:
+        print(f"error: cannot open the transcript store: {exc}", file=sys.stderr)
+        return 1
+    try:
+        hits = store.search(query, language_code=args.lang, limit=args.limit)
+    except ValueError as exc:
+        parser.error(str(exc))
+    finally:
+        store.close()
+
+    for hit in hits:
+        url = f"https://www.youtube.com/watch?v={hit.video_id}"
+        if args.json:
+            record = {
+                "video_id": hit.video_id,
+                "url": url,
+                "language": hit.language_code,
+                "source": hit.source.value,
+                "snippet": hit.snippet,
+            }
+            print(json.dumps(record, ensure_ascii=False))
+        else:
+            print(f"{url} [{hit.language_code}, {hit.source.value}]\n  {hit.snippet}")
+    if not hits:
+        print("no matches", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _write_output(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text + "\n", encoding="utf-8")
+
+
+def _clean_main(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    summarizer: Summarizer | None,
+) -> int:
+    if args.workers is not None and args.workers < 1:
+        parser.error("worker counts must be at least 1")
+    if args.chunk_size is not None and args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    names: dict[Path, Path] = {}
+    if args.output_dir:
+        try:
+            names = output_names(args.paths)
+        except ValueError as exc:
+            parser.error(str(exc))
+        files = list(names)
+    else:
+        files = find_subtitle_files(args.paths)
+    if not files:
+        print("error: no subtitle files found", file=sys.stderr)
+        return 1
+
+    failures = 0
+    for path, transcript in clean_files(
+        files, args.lang, args.timestamps, args.workers, args.chunk_size
+    ):
+        if isinstance(transcript, str):
+            failures += 1
+            print(f"error: {path}: {transcript}", file=sys.stderr)
+            if not args.output_dir:
+                record = {"path": str(path), "ok": False, "error": transcript}
+                print(json.dumps(record, ensure_ascii=False), flush=True)
+        elif args.output_dir:
+            try:
+                _write_output(args.output_dir / names[path], transcript.text)
+            except OSError as exc:
+                print(f"error: failed to write transcript: {exc}", file=sys.stderr)
+                failures += 1
+        else:
+            record = {
+                "path": str(path),
+                "ok": True,
+                "language": transcript.language_code,
+                "text": transcript.text,
+            }
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+    if args.output_dir:
+        print(
+            f"Wrote {len(files) - failures} transcripts to {args.output_dir}",
+            file=sys.stderr,
+        )
+    return 1 if failures else 0
+
+
+def _resummarize_main(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    summarizer: Summarizer | None,
+) -> int:
+    if args.summary_workers is None:
+        endpoints = len(args.ollama_urls or [DEFAULT_OLLAMA_URL])
+        args.summary_workers = DEFAULT_SUMMARY_WORKERS * endpoints
+    if args.summary_workers < 1 or (args.clean_workers is not None and args.clean_workers < 1):
+        parser.error("worker counts must be at least 1")
+
+    names: dict[Path, Path] = {}
+    if args.output_dir:
+        try:
+            names = output_names(args.paths)
+        except ValueError as exc:
+            parser.error(str(exc))
+        files = list(names)
+    else:
+        files = find_subtitle_files(args.paths)
+    if not files:
+        print("error: no subtitle files found", file=sys.stderr)
+        return 1
+
+    if summarizer is None:
+        model = os.environ.get("YT_SUBS_MODEL", DEFAULT_MODEL)
+        try:
+            summarizer = _build_summarizer(args, model)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    failures = 0
+    print(f"Summarizing {len(files)} subtitle files...", file=sys.stderr)
+    for result in resummarize_files(
+        files,
+        summarizer,
+        prompt=_prompt(args),
+        lang=args.lang,
+        timestamps=args.timestamps,
+        clean_workers=args.clean_workers,
+        summary_workers=args.summary_workers,
+    ):
+        if not result.ok:
+            failures += 1
+            print(f"error: {result.path}: {result.error}", file=sys.stderr)
+        if args.output_dir:
+            if result.ok:
+                path = args.output_dir / names[result.path]
+                try:
+                    _write_output(path, result.summary)
+                except OSError as exc:
+                    print(f"error: failed to write summary: {exc}", file=sys.stderr)
+                    failures += 1
+                else:
+                    print(f"Wrote {path}", file=sys.stderr)
+            continue
+        record = {"path": str(result.path), "ok": result.ok, "language": result.language_code}
+        if result.ok:
+            record["summary"] = result.summary
+        else:
+            record["error"] = result.error
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+
+    if isinstance(summarizer, CachingSummarizer):
+        print(
+            f"summary cache: {summarizer.hits} hits, {summarizer.misses} misses",
+            file=sys.stderr,
+        )
+    return 1 if failures else 0
+
+
+_SUBCOMMANDS = {
+    "clean": (build_clean_parser, _clean_main),
+    "resummarize": (build_resummarize_parser, _resummarize_main),
+    "search": (build_search_parser, _search_main),
+    "serve": (build_serve_parser, _serve_main),
+    "sync": (build_sync_parser, _sync_main),
+}
+
+
+def main(argv: list[str] | None = None, summarizer: Summarizer | None = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    build, run = build_parser, _single_or_batch_main
+    if argv and argv[0] in _SUBCOMMANDS:
+        (build, run), argv = _SUBCOMMANDS[argv[0]], argv[1:]
+
+    parser = build()
+    args = parser.parse_args(argv)
+    with _metrics_output(parser, args):
+        return run(parser, args, summarizer)
+
+
+def _single_or_batch_main(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    summarizer: Summarizer | None,
+) -> int:
+    if not args.urls and not args.input:
+        parser.error("a URL or --input is required")
+    _check_worker_counts(parser, args)
+
+    model = os.environ.get("YT_SUBS_MODEL", DEFAULT_MODEL)
+
+    codes = _split_languages(args.lang)
+    several = args.all_preferred or len(codes) > 1
+    if args.all_preferred and codes:
+        parser.error("use either -l or --all-preferred")
+    batch = bool(args.input) or len(args.urls) > 1
+    if batch and (several or args.output_dir):
+        parser.error("several languages and --output-dir need a single video URL")
+
+    with contextlib.ExitStack() as cleanup:
+
+        def build(transcript: str | None = None) -> Summarizer:
+            try:
+                built = _build_summarizer(args, model, transcript)
+            except ValueError as exc:
+                parser.error(str(exc))
+            cleanup.callback(_close_summarizer, built)
+            return built
+
+        # A lone video's summarizer waits for its transcript, so one that fits
+        # a single request gets a num_ctx sized for it; a warm-up cannot wait.
+        deferred = summarizer is None and not (
+            batch or several or args.output_dir or args.warm_up
+        )
+        if deferred:
+            try:
+                _generation_options(args)
+            except ValueError as exc:
+                parser.error(str(exc))
+        elif summarizer is None:
+            summarizer = build()
+
+        def summarize_one(text: str) -> int:
+            single = summarizer if summarizer is not None else build(text)
+            return _summarize_and_print(args, single, text)
+
+        if batch:
+            metadata_cache = None if args.no_cache else MetadataCache()
+            return _run_batch(args, _iter_urls(args), summarizer, metadata_cache)
+
+        if args.server and not (several or args.output_dir or args.timestamps):
+            try:
+                return _run_via_server(args, ServerClient(args.server))
+            except ServerUnavailableError as exc:
+                print(f"warning: {exc}; processing locally", file=sys.stderr)
+
+        metadata_cache = None if args.no_cache else MetadataCache()
+        store = None if args.no_cache else _open_store(TranscriptStore, "transcript store")
+        if store is not None:
+            cleanup.callback(store.close)
+        video_id = extract_video_id(args.urls[0])
+
+        single_code = codes and not (several or args.output_dir)
+        if store is not None and video_id and single_code and not args.refresh:
+            transcript = stored_transcript(store, video_id, codes[0], timestamps=args.timestamps)
+            if transcript is not None:
+                print(f"Using the stored {codes[0]} transcript...", file=sys.stderr)
+                return summarize_one(transcript.text)
+
+        try:
+            languages = list_languages(args.urls[0], cache=metadata_cache, refresh=args.refresh)
+        except Exception as exc:
+            print(f"error: failed to fetch video info: {exc}", file=sys.stderr)
             return 1
 
-        selected = interactive_select(preferred)
-        if selected is None:
-            print("error: no language selected.", file=sys.stderr)
+        if several or args.output_dir:
+            return _run_languages(args, args.urls[0], languages, codes, summarizer, store)
+
+        if codes:
+            selected = find_language(languages, codes[0])
+            if selected is None:
+                print(
+                    f"error: no subtitles found for language '{codes[0]}'.",
+                    file=sys.stderr,
+                )
+                return 1
+        else:
+            selected = _choose_language(languages)
+            if selected is None:
+                return 1
+
+        source_tag = "[manual]" if selected.source == SubtitleSource.MANUAL else "[auto]"
+        print(f"Downloading {selected.code} subtitles ({source_tag})...", file=sys.stderr)
+
+        try:
+            transcript = download_transcript(
+                selected,
+                timestamps=args.timestamps,
+                store=store,
+                video_id=video_id,
+                refresh=args.refresh,
+            )
+        except YtSubsError as exc:
+            print(f"error: {exc}", file=sys.stderr)
             return 1
+        return summarize_one(transcript.text)
 
-    source_tag = "[manual]" if selected.source == SubtitleSource.MANUAL else "[auto]"
-    print(f"Downloading {selected.code} subtitles ({source_tag})...", file=sys.stderr)
+
+def _summarize_and_print(args: argparse.Namespace, summarizer: Summarizer, text: str) -> int:
+    if isinstance(summarizer, StreamingSummarizer):
+        return _print_streamed(summarizer, text, _prompt(args))
 
     try:
-        content = fetch_subtitle_content(selected)
+        summary = summarizer.summarize(text, _prompt(args))
     except YtSubsError as exc:
         print(f"error: {exc}", file=sys.stderr)
         return 1
 
-    transcript = clean_subtitle(content)
+    print(summary)
+    return 0
 
-    if summarizer is None:
-        summarizer = OllamaSummarizer(model=model)
 
+def _run_via_server(args: argparse.Namespace, client: ServerClient) -> int:
+    """Single-video mode with extraction and summarization done by the daemon."""
+    url = args.urls[0]
+    lang = args.lang
     try:
-        summary = summarizer.summarize(transcript.text, DEFAULT_SUMMARIZATION_PROMPT)
+        if lang is None:
+            languages = client.list_languages(url, refresh=args.refresh)
+            preferred = filter_preferred(languages, DEFAULT_PREFERRED_LANGS)
+            if not preferred:
+                print("error: no subtitles available for this video.", file=sys.stderr)
+                return 1
+            selected = interactive_select(preferred)
+            if selected is None:
+                print("error: no language selected.", file=sys.stderr)
+                return 1
+            lang = selected.code
+
+        print(f"Summarizing {lang} subtitles via {client.base_url}...", file=sys.stderr)
+        _, summary = client.summarize(url, lang, DEFAULT_SUMMARIZATION_PROMPT)
+    except ServerUnavailableError:
+        raise
     except YtSubsError as exc:
         print(f"error: {exc}", file=sys.stderr)
         return 1
@@ -131,5 +1306,22 @@ def main(argv: list[str] | None = None, summarizer: Summarizer | None = None) ->
     return 0
 
 
+def _print_streamed(summarizer: StreamingSummarizer, transcript: str, prompt: str) -> int:
+    """Print summary tokens as they arrive rather than after generation ends."""
+    started = False
+    try:
+        for token in summarizer.stream(transcript, prompt):
+            started = True
+            print(token, end="", flush=True)
+    except YtSubsError as exc:
+        if started:
+            print()
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    print()
+    return 0
+
+
 def entrypoint() -> None:
     sys.exit(main())
@@ -0,0 +1,100 @@
+"""Thin client for a running ``yt-subs serve`` daemon."""
+
+import http.client
+import json
+import socket
+from typing import Any
+
+from .cache import decode_languages
+from .summarizer import DEFAULT_OLLAMA_TIMEOUT
+from .transport import HTTPSession, HTTPStatusError
+from .types import (
+    DEFAULT_SUMMARIZATION_PROMPT,
+    NO_SUBTITLES_REASON,
+    CleanedTranscript,
+    NoSubtitlesAvailableError,
+    ServerError,
+    ServerUnavailableError,
+    SubtitleLanguage,
+)
+
+
+# Failures to connect at all: nothing reached the daemon, so the work can
+# safely be done in-process instead.
+_UNREACHABLE = (ConnectionRefusedError, socket.gaierror)
+
+
+def _error_body(exc: HTTPStatusError) -> dict:
+    try:
+        body = json.loads(exc.body)
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+class ServerClient:
+    """Calls the daemon's JSON endpoints and maps errors back to exceptions.
+
+    ``ServerUnavailableError`` means no connection to the daemon could be
+    made, so the caller can fall back to doing the work in-process; a
+    failure after connecting is a plain ``ServerError``.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        session: HTTPSession | None = None,
+        timeout: float = DEFAULT_OLLAMA_TIMEOUT,
+    ):
+        self._base_url = base_url.rstrip("/")
+        # No retries: an absent daemon should be detected immediately.
+        self._session = session or HTTPSession(retries=0)
+        self._timeout = timeout
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+
+    def _post(self, path: str, payload: dict) -> dict[str, Any]:
+        url = f"{self._base_url}{path}"
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        try:
+            response = self._session.request(
+                "POST", url, body=body, headers=headers, timeout=self._timeout
+            )
+            raw = response.read()
+        except HTTPStatusError as exc:
+            error = _error_body(exc)
+            message = str(error.get("error", exc))
+            if exc.status == 404 and error.get("reason") == NO_SUBTITLES_REASON:
+                raise NoSubtitlesAvailableError(message) from exc
+            raise ServerError(message) from exc
+        except _UNREACHABLE as exc:
+            raise ServerUnavailableError(
+                f"yt-subs server at {self._base_url} is not reachable: {exc}"
+            ) from exc
+        except (OSError, http.client.HTTPException) as exc:
+            raise ServerError(f"yt-subs server at {self._base_url} failed: {exc}") from exc
+        try:
+            return json.loads(raw)
+        except ValueError as exc:
+            raise ServerError(f"invalid response from {url}: {exc}") from exc
+
+    def list_languages(self, url: str, refresh: bool = False) -> list[SubtitleLanguage]:
+        result = self._post("/languages", {"url": url, "refresh": refresh})
+        return decode_languages(result["languages"])
+
+    def transcript(self, url: str, lang: str | None = None) -> CleanedTranscript:
+        result = self._post("/transcript", {"url": url, "lang": lang})
+        return CleanedTranscript(language_code=result["language"], text=result["text"])
+
+    def summarize(
+        self,
+        url: str,
+        lang: str | None = None,
+        prompt: str = DEFAULT_SUMMARIZATION_PROMPT,
+    ) -> tuple[str, str]:
+        """Return ``(language_code, summary)`` for a video."""
+        result = self._post("/summarize", {"url": url, "lang": lang, "prompt": prompt})
+        return result["language"], result["summary"]
@@ -0,0 +1,132 @@
+"""Extractive compression of transcripts before they reach the model.
+
+Sentences (caption lines, split further at sentence punctuation) are
+scored by TF-IDF: each distinct word contributes ``log(n / df)``, where
+``df`` is the number of sentences containing it. Words that occur
+everywhere ("the", "um", "so") score near zero in any language, so no stop
+word list is needed. The densest sentences per token are kept, in their
+original order, until the token budget is full.
+"""
+
+import math
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from . import metrics
+from .summarizer import StreamingSummarizer, Summarizer
+from .tokens import estimate_tokens
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?…。])\s+")
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class CompressionResult:
+    text: str
+    original_tokens: int
+    tokens: int
+    seconds: float
+
+    @property
+    def ratio(self) -> float:
+        """How many times smaller the output is (1.0 when unchanged)."""
+        return self.original_tokens / max(self.tokens, 1)
+
+
+def split_sentences(text: str) -> list[str]:
+    sentences = []
+    for line in text.splitlines():
+        for sentence in _SENTENCE_END_RE.split(line.strip()):
+            if sentence:
+                sentences.append(sentence)
+    return sentences
+
+
+def score_sentences(sentences: list[str]) -> list[float]:
+    """TF-IDF information per token of each sentence."""
+    vocabularies = [set(_WORD_RE.findall(s.lower())) for s in sentences]
+    df = Counter(word for words in vocabularies for word in words)
+    n = len(sentences)
+    idf = {word: math.log(n / count) for word, count in df.items()}
+    return [
+        sum(idf[word] for word in words) / max(estimate_tokens(sentence), 1)
+        for sentence, words in zip(sentences, vocabularies)
+    ]
+
+
+def compress_transcript(text: str, target_tokens: int) -> CompressionResult:
+    """Keep the most informative sentences of ``text`` within ``target_tokens``.
+
+    With metrics enabled, records a "compress" span with the token counts
+    and ratio.
+    """
+    if target_tokens < 1:
+        raise ValueError("target_tokens must be at least 1")
+    with metrics.span("compress") as timing:
+        result = _compress(text, target_tokens)
+        timing.set(
+            tokens_in=result.original_tokens,
+            tokens_out=result.tokens,
+            ratio=round(result.ratio, 3),
+        )
+    return result
+
+
+def _compress(text: str, target_tokens: int) -> CompressionResult:
+    start = time.perf_counter()
+    original_tokens = estimate_tokens(text)
+    if original_tokens <= target_tokens:
+        return CompressionResult(text, original_tokens, original_tokens, 0.0)
+
+    sentences = split_sentences(text)
+    scores = score_sentences(sentences)
+    selected = []
+    budget = target_tokens
+    for i in sorted(range(len(sentences)), key=scores.__getitem__, reverse=True):
+        # Each kept sentence also costs a line break.
+        cost = estimate_tokens(sentences[i]) + 1
+        if cost <= budget:
+            selected.append(i)
+            budget -= cost
+            if budget < 2:
+                break
+
+    compressed = "\n".join(sentences[i] for i in sorted(selected))
+    return CompressionResult(
+        compressed, original_tokens, estimate_tokens(compressed), time.perf_counter() - start
+    )
+
+
+class CompressingSummarizer:
+    """Summarizer wrapper that compresses transcripts to ``target_tokens`` first."""
+
+    def __init__(self, inner: Summarizer, target_tokens: int):
+        if target_tokens < 1:
+            raise ValueError("target_tokens must be at least 1")
+        self._inner = inner
+        self._target_tokens = target_tokens
+
+    @property
+    def model(self) -> str | None:
+        return getattr(self._inner, "model", None)
+
+    @property
+    def options(self) -> dict:
+        return {
+            **(getattr(self._inner, "options", None) or {}),
+            "compress_tokens": self._target_tokens,
+        }
+
+    def summarize(self, transcript: str, prompt: str) -> str:
+        text = compress_transcript(transcript, self._target_tokens).text
+        return self._inner.summarize(text, prompt)
+
+    def stream(self, transcript: str, prompt: str) -> Iterator[str]:
+        text = compress_transcript(transcript, self._target_tokens).text
+        if isinstance(self._inner, StreamingSummarizer):
+            yield from self._inner.stream(text, prompt)
+        else:
+            yield self._inner.summarize(text, prompt)
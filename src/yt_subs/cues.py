@@ -0,0 +1,254 @@
+"""Timestamped transcripts stored as parallel arrays.
+
+A ``CueTrack`` keeps cue start and end times in two ``array('d')`` and all
+cue text in one newline-joined string indexed by an ``array('q')`` of
+offsets. Ten hours of captions are then four objects rather than tens of
+thousands of per-cue objects, and slicing copies contiguous buffers.
+"""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+
+from .cleaning import DEFAULT_DEDUP_WINDOW, Deduplicator, _clean_line
+from .types import CleanedTranscript
+
+_CUE_TIME_RE = re.compile(r"(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{1,3})")
+
+
+@dataclass(frozen=True)
+class Cue:
+    start: float
+    end: float
+    text: str
+
+
+def parse_timestamp(value: str) -> float:
+    """Seconds in a VTT (``00:01:02.500``, ``01:02.500``) or SRT (``00:01:02,500``) time."""
+    match = _CUE_TIME_RE.fullmatch(value.strip())
+    if match is None:
+        raise ValueError(f"invalid timestamp: {value!r}")
+    return _seconds(match)
+
+
+def _seconds(match: re.Match[str]) -> float:
+    hours, minutes, seconds, fraction = match.groups()
+    return (
+        int(hours or 0) * 3600
+        + int(minutes) * 60
+        + int(seconds)
+        + int(fraction.ljust(3, "0")) / 1000
+    )
+
+
+def format_timestamp(seconds: float) -> str:
+    """``m:ss`` or ``h:mm:ss``, as YouTube shows times."""
+    total = int(seconds)
+    hours, rest = divmod(total, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+class CueTrack:
+    """Immutable sequence of cues ordered by start time."""
+
+    __slots__ = ("_starts", "_ends", "_buffer", "_offsets")
+
+    def __init__(self, starts: array, ends: array, buffer: str, offsets: array):
+        if not len(starts) == len(ends) == len(offsets) - 1:
+            raise ValueError("starts, ends and offsets do not describe the same cues")
+        self._starts = starts
+        self._ends = ends
+        # Every cue's text followed by "\n"; offsets[i] is where cue i starts.
+        self._buffer = buffer
+        self._offsets = offsets
+
+    @classmethod
+    def from_cues(cls, cues: Iterable[tuple[float, float, str]]) -> "CueTrack":
+        builder = _CueTrackBuilder()
+        for start, end, text in cues:
+            builder.add(start, end, text)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, index: int) -> Cue:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("cue index out of range")
+        return Cue(self._starts[index], self._ends[index], self.text_at(index))
+
+    def __iter__(self) -> Iterator[Cue]:
+        for i in range(len(self)):
+            yield Cue(self._starts[i], self._ends[i], self.text_at(i))
+
+    @property
+    def starts(self) -> array:
+        return self._starts
+
+    @property
+    def ends(self) -> array:
+        return self._ends
+
+    @property
+    def text(self) -> str:
+        """All cue text, one cue per line (the same text ``clean_subtitle`` gives)."""
+        return self._buffer[:-1]
+
+    @property
+    def duration(self) -> float:
+        return self._ends[-1] - self._starts[0] if len(self) else 0.0
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the time and offset arrays (text excluded)."""
+        arrays = (self._starts, self._ends, self._offsets)
+        return sum(a.itemsize * len(a) for a in arrays)
+
+    def text_at(self, index: int) -> str:
+        return self._buffer[self._offsets[index] : self._offsets[index + 1] - 1]
+
+    def _take(self, lo: int, hi: int) -> "CueTrack":
+        base = self._offsets[lo]
+        offsets = array("q", (offset - base for offset in self._offsets[lo : hi + 1]))
+        return CueTrack(
+            self._starts[lo:hi],
+            self._ends[lo:hi],
+            self._buffer[base : self._offsets[hi]],
+            offsets,
+        )
+
+    def between(self, start: float, end: float) -> "CueTrack":
+        """Cues overlapping the time range ``[start, end)``."""
+        lo = bisect_right(self._starts, start)
+        while lo > 0 and self._ends[lo - 1] > start:
+            lo -= 1
+        hi = bisect_left(self._starts, end, lo)
+        return self._take(lo, hi)
+
+    def segments(self, min_gap: float) -> list["CueTrack"]:
+        """Split wherever at least ``min_gap`` seconds pass between cues."""
+        gaps = [
+            i
+            for i, (start, previous_end) in enumerate(
+                zip(islice(self._starts, 1, None), self._ends), 1
+            )
+            if start - previous_end >= min_gap
+        ]
+        bounds = [0, *gaps, len(self)]
+        return [self._take(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+
+    def timestamped_text(self) -> str:
+        """One ``[m:ss] text`` line per cue, so summaries can cite times."""
+        return "\n".join(
+            f"[{format_timestamp(start)}] {self.text_at(i)}"
+            for i, start in enumerate(self._starts)
+        )
+
+    def to_transcript(self, language_code: str) -> CleanedTranscript:
+        return CleanedTranscript(language_code=language_code, text=self.text)
+
+
+class _CueTrackBuilder:
+    """Appends cues straight into the arrays, with no per-cue objects."""
+
+    def __init__(self):
+        self._starts = array("d")
+        self._ends = array("d")
+        self._offsets = array("q", [0])
+        self._parts: list[str] = []
+        self._position = 0
+
+    def add(self, start: float, end: float, text: str) -> None:
+        self._starts.append(start)
+        self._ends.append(end)
+        self._parts.append(text)
+        self._position += len(text) + 1
+        self._offsets.append(self._position)
+
+    def build(self) -> CueTrack:
+        buffer = "\n".join(self._parts) + "\n" if self._parts else ""
+        return CueTrack(self._starts, self._ends, buffer, self._offsets)
+
+
+def _cue_times(raw_line: str) -> tuple[float, float] | None:
+    """The times of a cue timing line, or None for any other line.
+
+    Both sides of "-->" must be timestamps, so caption text such as
+    "go left --> right" is kept as text.
+    """
+    first, _, rest = raw_line.partition("-->")
+    start = _CUE_TIME_RE.fullmatch(first.strip())
+    end = _CUE_TIME_RE.fullmatch((rest.split() or [""])[0])
+    if start is None or end is None:
+        return None
+    return _seconds(start), _seconds(end)
+
+
+def timed_lines(raw_lines: Iterable[str]) -> Iterator[tuple[float, float, str]]:
+    """Pair every VTT/SRT text line with the times of the cue it belongs to."""
+    start = end = 0.0
+    for raw_line in raw_lines:
+        times = _cue_times(raw_line) if "-->" in raw_line else None
+        if times is not None:
+            start, end = times
+        else:
+            yield start, end, raw_line
+
+
+def build_track(
+    timed: Iterable[tuple[float, float, str]],
+    window: int = DEFAULT_DEDUP_WINDOW,
+    deduplicate: bool = True,
+    clean: Callable[[str], str] = _clean_line,
+) -> CueTrack:
+    """Clean ``(start, end, text)`` lines into a ``CueTrack``.
+
+    ``clean`` returns a line's transcript text, or "" to drop it. With
+    ``deduplicate``, text is deduplicated exactly as by ``clean_lines``
+    and a line that rolling or "karaoke" captions repeat across several
+    cues keeps the start of its first cue and the end of the last one it
+    appeared in. Formats without repetition skip that work.
+    """
+    builder = _CueTrackBuilder()
+    if not deduplicate:
+        for start, end, raw_line in timed:
+            line = clean(raw_line)
+            if line:
+                builder.add(start, end, line)
+        return builder.build()
+
+    dedup = Deduplicator(window)
+    pending: list[float] | None = None
+    for start, end, raw_line in timed:
+        line = clean(raw_line)
+        if not line:
+            continue
+        ready = dedup.push(line)
+        if ready is not None:
+            builder.add(pending[0], pending[1], ready)
+            pending = [start, end]
+        elif pending is None:
+            pending = [start, end]
+        else:
+            pending[1] = max(pending[1], end)
+
+    ready = dedup.flush()
+    if ready is not None:
+        builder.add(pending[0], pending[1], ready)
+    return builder.build()
+
+
+def parse_cues(raw_lines: Iterable[str], window: int = DEFAULT_DEDUP_WINDOW) -> CueTrack:
+    """Parse VTT/SRT lines into a ``CueTrack``, removing caption repetition.
+
+    Other formats are parsed by ``yt_subs.formats.parse_track``.
+    """
+    return build_track(timed_lines(raw_lines), window)
@@ -0,0 +1,232 @@
+"""Parsers for every subtitle format YouTube serves, and choosing between them.
+
+VTT and SRT are line formats; YouTube's auto-captions in VTT repeat each
+line across rolling cues and carry inline word timing, so they need
+deduplication. ``srv1``, ``srv2``, ``srv3`` and ``json3`` hold each caption
+line once as structured data and skip deduplication entirely. Every parser
+yields ``(start, end, text)`` for each line of caption text.
+
+Parsers are looked up by extension in a registry; ``register_parser`` adds
+or replaces one. ``select_format`` fetches the available format with the
+lowest ``cost``. The built-in ranks follow ``benchmarks/suite.py``: for an
+hour of auto-captions srv1 and srv2 are about 105 KB and parse in 10-12 ms,
+TTML 125 KB, VTT 510 KB, srv3 380 KB but twice as slow to parse as VTT, and
+json3 670 KB.
+"""
+
+import html
+import json
+import re
+import xml.etree.ElementTree as ET
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+
+from .cleaning import DEFAULT_DEDUP_WINDOW, clean_lines, dedup_lines
+from .cues import CueTrack, build_track, parse_timestamp, timed_lines
+from .types import SubtitleDownloadError, SubtitleFormat, SubtitleLanguage
+
+TimedLines = Iterator[tuple[float, float, str]]
+
+_TAG_RE = re.compile(r"<[^>]*>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class SubtitleParser:
+    ext: str
+    parse: Callable[[Iterable[str]], TimedLines]
+    # Download-and-parse rank; the lowest available format is fetched.
+    cost: int
+    # Whether caption text may repeat across cues and must be deduplicated.
+    deduplicate: bool = False
+
+
+# Cleaned line by line with ``clean_lines``, without parsing cue times.
+_LINE_FORMATS = ("vtt", "srt")
+
+
+_PARSERS: dict[str, SubtitleParser] = {}
+
+
+def register_parser(parser: SubtitleParser) -> None:
+    """Add a parser, replacing any registered for the same extension."""
+    _PARSERS[parser.ext] = parser
+
+
+def get_parser(ext: str) -> SubtitleParser | None:
+    return _PARSERS.get(ext)
+
+
+def is_line_format(ext: str) -> bool:
+    """Whether ``ext`` is cleaned line by line as it streams, like VTT and SRT.
+
+    Unknown formats are treated as VTT/SRT text.
+    """
+    return ext in _LINE_FORMATS or ext not in _PARSERS
+
+
+def supported_formats() -> list[str]:
+    """Registered extensions, cheapest first."""
+    return [p.ext for p in sorted(_PARSERS.values(), key=lambda p: p.cost)]
+
+
+def select_format(
+    language: SubtitleLanguage, preferred_ext: str | None = None
+) -> SubtitleFormat:
+    """Pick ``preferred_ext`` if available, else the cheapest supported format.
+
+    A language offering only unsupported formats gets its first one, which
+    is then cleaned as VTT/SRT text.
+    """
+    if not language.formats:
+        raise SubtitleDownloadError(f"No formats available for language '{language.code}'")
+    if preferred_ext is not None:
+        for fmt in language.formats:
+            if fmt.ext == preferred_ext:
+                return fmt
+    supported = [fmt for fmt in language.formats if fmt.ext in _PARSERS]
+    if not supported:
+        return language.formats[0]
+    return min(supported, key=lambda fmt: _PARSERS[fmt.ext].cost)
+
+
+def _clean_text(text: str) -> str:
+    """Text of a structured caption line: entities decoded, markup removed."""
+    if "&" in text:
+        text = html.unescape(text)
+    if "<" in text:
+        text = _TAG_RE.sub("", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def _split(start: float, end: float, text: str) -> TimedLines:
+    for line in text.splitlines():
+        yield start, end, line
+
+
+def parse_json3(raw_lines: Iterable[str]) -> TimedLines:
+    """``{"events": [{"tStartMs", "dDurationMs", "segs": [{"utf8"}]}]}``."""
+    document = json.loads("\n".join(raw_lines))
+    for event in document.get("events", ()):
+        segs = event.get("segs")
+        if not segs:
+            continue
+        start = event.get("tStartMs", 0) / 1000
+        end = start + event.get("dDurationMs", 0) / 1000
+        yield from _split(start, end, "".join(seg.get("utf8", "") for seg in segs))
+
+
+def _local(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+def _iter_elements(raw_lines: Iterable[str], tag: str) -> Iterator[ET.Element]:
+    """Complete ``tag`` elements (any namespace) as the XML is read."""
+    parser = ET.XMLPullParser(("end",))
+    for line in raw_lines:
+        parser.feed(line + "\n")
+        for _, element in parser.read_events():
+            if _local(element.tag) == tag:
+                yield element
+                element.clear()
+    parser.close()
+    for _, element in parser.read_events():
+        if _local(element.tag) == tag:
+            yield element
+
+
+def _element_text(element: ET.Element) -> str:
+    """Text of ``element`` and its children, with ``<br/>`` as a line break."""
+    parts = [element.text or ""]
+    for child in element:
+        parts.append("\n" if _local(child.tag) == "br" else "".join(child.itertext()))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def parse_srv1(raw_lines: Iterable[str]) -> TimedLines:
+    """``<transcript><text start="1.5" dur="2.0">...</text>`` (seconds)."""
+    for element in _iter_elements(raw_lines, "text"):
+        start = float(element.get("start", 0))
+        end = start + float(element.get("dur", 0))
+        yield from _split(start, end, _element_text(element))
+
+
+def parse_srv2(raw_lines: Iterable[str]) -> TimedLines:
+    """``<timedtext><text t="1500" d="2000">...</text>`` (milliseconds)."""
+    for element in _iter_elements(raw_lines, "text"):
+        start = int(element.get("t", 0)) / 1000
+        end = start + int(element.get("d", 0)) / 1000
+        yield from _split(start, end, _element_text(element))
+
+
+def parse_srv3(raw_lines: Iterable[str]) -> TimedLines:
+    """``<timedtext format="3"><body><p t="1500" d="2000">`` with word ``<s>`` spans."""
+    for element in _iter_elements(raw_lines, "p"):
+        start = int(element.get("t", 0)) / 1000
+        end = start + int(element.get("d", 0)) / 1000
+        yield from _split(start, end, _element_text(element))
+
+
+def _ttml_time(value: str) -> float:
+    """TTML clock time (``00:00:01.500``) or offset time (``1.5s``, ``1500ms``)."""
+    if value.endswith("ms"):
+        return float(value[:-2]) / 1000
+    if value.endswith("s"):
+        return float(value[:-1])
+    return parse_timestamp(value)
+
+
+def parse_ttml(raw_lines: Iterable[str]) -> TimedLines:
+    """``<tt><body><div><p begin="..." end="...">...<br/>...</p>``."""
+    for element in _iter_elements(raw_lines, "p"):
+        start = _ttml_time(element.get("begin", "0s"))
+        end = _ttml_time(element.get("end", "0s"))
+        yield from _split(start, end, _element_text(element))
+
+
+for _parser in (
+    SubtitleParser("srv1", parse_srv1, cost=0),
+    SubtitleParser("srv2", parse_srv2, cost=1),
+    # A TTML paragraph may show the whole caption window, not just new text.
+    SubtitleParser("ttml", parse_ttml, cost=2, deduplicate=True),
+    SubtitleParser("vtt", timed_lines, cost=3, deduplicate=True),
+    SubtitleParser("srt", timed_lines, cost=4, deduplicate=True),
+    SubtitleParser("srv3", parse_srv3, cost=5),
+    SubtitleParser("json3", parse_json3, cost=6),
+):
+    register_parser(_parser)
+
+
+def _parse(ext: str, timed: TimedLines) -> TimedLines:
+    try:
+        yield from timed
+    except (ValueError, ET.ParseError) as exc:
+        raise SubtitleDownloadError(f"Malformed {ext} subtitles: {exc}") from exc
+
+
+def transcript_lines(
+    raw_lines: Iterable[str], ext: str = "vtt", window: int = DEFAULT_DEDUP_WINDOW
+) -> Iterator[str]:
+    """Lazily turn raw subtitle lines in format ``ext`` into transcript lines.
+
+    VTT, SRT and unknown formats go through ``clean_lines``; structured
+    formats are parsed and deduplicated only if their parser asks for it.
+    """
+    if is_line_format(ext):
+        return clean_lines(raw_lines, window)
+    parser = _PARSERS[ext]
+    cleaned = (_clean_text(text) for _, _, text in _parse(ext, parser.parse(raw_lines)))
+    lines = (line for line in cleaned if line)
+    return dedup_lines(lines, window) if parser.deduplicate else lines
+
+
+def parse_track(
+    raw_lines: Iterable[str], ext: str = "vtt", window: int = DEFAULT_DEDUP_WINDOW
+) -> CueTrack:
+    """``parse_cues`` for any registered format."""
+    if is_line_format(ext):
+        return build_track(_parse(ext, timed_lines(raw_lines)), window)
+    parser = _PARSERS[ext]
+    timed = _parse(ext, parser.parse(raw_lines))
+    return build_track(timed, window, parser.deduplicate, clean=_clean_text)
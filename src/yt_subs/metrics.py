@@ -0,0 +1,193 @@
+"""Per-stage timing spans, emitted as JSON lines or Prometheus text.
+
+Instrumented code wraps each stage in ``span(name, **attrs)``. While no
+recorder is enabled, ``span`` returns a shared no-op object, so disabled
+instrumentation costs one global lookup per stage and nothing per line.
+"""
+
+import json
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any, Protocol, TextIO
+
+# Fields of Ollama's final /api/generate object; durations are nanoseconds.
+OLLAMA_STAT_FIELDS = (
+    "total_duration",
+    "load_duration",
+    "prompt_eval_count",
+    "prompt_eval_duration",
+    "eval_count",
+    "eval_duration",
+)
+
+
+class MetricsRecorder(Protocol):
+    def record(self, stage: str, seconds: float, attrs: dict[str, Any]) -> None: ...
+
+
+class _NoopSpan:
+    recording = False
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def add(self, name: str, amount: float) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """Times one stage from ``__enter__`` to ``__exit__`` and records it."""
+
+    recording = True
+
+    def __init__(self, recorder: MetricsRecorder, stage: str, attrs: dict[str, Any]):
+        self._recorder = recorder
+        self._stage = stage
+        self._attrs = attrs
+        self._start = 0.0
+
+    def __enter__(self) -> "Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        seconds = time.perf_counter() - self._start
+        if exc_type is not None:
+            self._attrs["error"] = exc_type.__name__
+        self._recorder.record(self._stage, seconds, self._attrs)
+
+    def set(self, **attrs: Any) -> None:
+        self._attrs.update(attrs)
+
+    def add(self, name: str, amount: float) -> None:
+        self._attrs[name] = self._attrs.get(name, 0) + amount
+
+
+_recorder: MetricsRecorder | None = None
+
+
+def enable(recorder: MetricsRecorder) -> None:
+    global _recorder
+    _recorder = recorder
+
+
+def disable() -> None:
+    global _recorder
+    _recorder = None
+
+
+def active_recorder() -> MetricsRecorder | None:
+    return _recorder
+
+
+def span(stage: str, **attrs: Any) -> "Span | _NoopSpan":
+    """Return a context manager timing ``stage``; a no-op while disabled."""
+    recorder = _recorder
+    if recorder is None:
+        return _NOOP_SPAN
+    return Span(recorder, stage, attrs)
+
+
+def timed_chunks(chunks: Iterable[bytes], current: "Span | _NoopSpan") -> Iterator[bytes]:
+    """Pass chunks through, adding bytes and time spent waiting for them to a span.
+
+    Separates network time from the consumer's processing time when a
+    download is cleaned while it streams.
+    """
+    if not current.recording:
+        yield from chunks
+        return
+    iterator = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        chunk = next(iterator, None)
+        current.add("read_seconds", time.perf_counter() - start)
+        if chunk is None:
+            return
+        current.add("bytes", len(chunk))
+        yield chunk
+
+
+def ollama_stats(body: dict) -> dict[str, int]:
+    """Pick Ollama's generation statistics out of a response object."""
+    return {field: body[field] for field in OLLAMA_STAT_FIELDS if field in body}
+
+
+class JSONLinesRecorder:
+    """Writes one JSON object per finished span to a text stream."""
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float, attrs: dict[str, Any]) -> None:
+        line = json.dumps(
+            {"stage": stage, "seconds": round(seconds, 6), **attrs}, ensure_ascii=False
+        )
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+
+def _format(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class PrometheusRecorder:
+    """Aggregates spans into counters rendered in Prometheus text format.
+
+    Each stage gets a duration sum and count plus an error count; numeric
+    attributes are summed per stage. String attributes (URLs, models) are
+    left out to keep label cardinality bounded.
+    """
+
+    def __init__(self, prefix: str = "yt_subs"):
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self._seconds: dict[str, float] = {}
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        self._totals: dict[tuple[str, str], float] = {}
+
+    def record(self, stage: str, seconds: float, attrs: dict[str, Any]) -> None:
+        with self._lock:
+            self._seconds[stage] = self._seconds.get(stage, 0.0) + seconds
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+            if "error" in attrs:
+                self._errors[stage] = self._errors.get(stage, 0) + 1
+            for name, value in attrs.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    key = (name, stage)
+                    self._totals[key] = self._totals.get(key, 0) + value
+
+    def render(self) -> str:
+        p = self._prefix
+        with self._lock:
+            lines = [f"# TYPE {p}_stage_seconds summary"]
+            for stage in sorted(self._counts):
+                label = f'{{stage="{stage}"}}'
+                lines.append(f"{p}_stage_seconds_sum{label} {self._seconds[stage]:.6f}")
+                lines.append(f"{p}_stage_seconds_count{label} {self._counts[stage]}")
+            lines.append(f"# TYPE {p}_stage_errors_total counter")
+            for stage in sorted(self._counts):
+                lines.append(
+                    f'{p}_stage_errors_total{{stage="{stage}"}} {self._errors.get(stage, 0)}'
+                )
+            for name in sorted({name for name, _ in self._totals}):
+                lines.append(f"# TYPE {p}_{name}_total counter")
+                for (attr, stage), value in sorted(self._totals.items()):
+                    if attr == name:
+                        lines.append(f'{p}_{name}_total{{stage="{stage}"}} {_format(value)}')
+        return "\n".join(lines) + "\n"
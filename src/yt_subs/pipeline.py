@@ -0,0 +1,301 @@
+"""Pipelined processing of many video URLs.
+
+Metadata extraction and subtitle downloads run on an I/O thread pool, while
+summarization runs on a separately sized pool so a slow model never stalls
+downloads. Results are yielded as soon as each video finishes.
+"""
+
+import queue
+import warnings
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+from . import metrics
+from .cache import MetadataCache
+from .formats import parse_track, select_format, transcript_lines
+from .store import TranscriptStore
+from .subtitles import extract_video_id, find_language, list_languages, stream_subtitle_lines
+from .summarizer import Summarizer
+from .transport import HTTPSession
+from .types import (
+    DEFAULT_PREFERRED_LANGS,
+    DEFAULT_SUMMARIZATION_PROMPT,
+    BatchResult,
+    CleanedTranscript,
+    NoSubtitlesAvailableError,
+    SubtitleContent,
+    SubtitleLanguage,
+    SubtitleSource,
+)
+
+DEFAULT_IO_WORKERS = 8
+DEFAULT_SUMMARY_WORKERS = 2
+
+
+def select_language(
+    languages: list[SubtitleLanguage],
+    lang: str | None = None,
+    preferred: tuple[str, ...] = DEFAULT_PREFERRED_LANGS,
+) -> SubtitleLanguage:
+    """Pick a language non-interactively.
+
+    Uses ``lang`` when given, otherwise the first available preferred language.
+    """
+    if lang:
+        selected = find_language(languages, lang)
+        if selected is None:
+            raise NoSubtitlesAvailableError(
+                f"no subtitles found for language '{lang}'"
+            )
+        return selected
+
+    for code in preferred:
+        selected = find_language(languages, code)
+        if selected is not None:
+            return selected
+    raise NoSubtitlesAvailableError("no subtitles available for this video")
+
+
+def stored_transcript(
+    store: TranscriptStore,
+    video_id: str,
+    language_code: str,
+    source: SubtitleSource | None = None,
+    timestamps: bool = False,
+) -> CleanedTranscript | None:
+    """A transcript from ``store``, or None if it is not there.
+
+    With ``timestamps`` the transcript is rebuilt from the stored raw
+    subtitles, so it is None if they were not kept. A store that cannot be
+    read is treated as empty, with a warning.
+    """
+    import sqlite3
+
+    try:
+        if not timestamps:
+            return store.get(video_id, language_code, source)
+        content = store.get_subtitles(video_id, language_code, source)
+    except (sqlite3.Error, OSError) as exc:
+        warnings.warn(f"failed to read stored transcript of {video_id}: {exc}", stacklevel=2)
+        return None
+    if content is None:
+        return None
+    track = parse_track(content.raw_text.splitlines(), content.ext)
+    return CleanedTranscript(language_code=language_code, text=track.timestamped_text())
+
+
+def download_transcript(
+    language: SubtitleLanguage,
+    preferred_ext: str | None = None,
+    session: HTTPSession | None = None,
+    timestamps: bool = False,
+    store: TranscriptStore | None = None,
+    video_id: str | None = None,
+    refresh: bool = False,
+) -> CleanedTranscript:
+    """Download and clean subtitles in one streaming pass.
+
+    VTT/SRT lines are cleaned as they arrive and the raw file is never
+    materialized unless it is being stored. The format is ``preferred_ext``
+    when the language has it, otherwise the cheapest one available. With
+    ``timestamps``, each line is prefixed with its cue's ``[m:ss]`` start
+    time.
+
+    With a ``store`` and ``video_id``, a stored transcript is returned
+    without any download (unless ``refresh``), and a downloaded one is
+    stored with its raw subtitles; if storing fails, a warning is issued
+    and the transcript is returned all the same. With metrics enabled, the "transcript"
+    span encloses a "download" span whose ``read_seconds`` is the part
+    spent waiting on the network.
+    """
+    keep = store is not None and video_id is not None
+    with metrics.span("transcript", lang=language.code) as timing:
+        if keep and not refresh:
+            stored = stored_transcript(store, video_id, language.code, language.source, timestamps)
+            if stored is not None:
+                timing.set(stored=True, chars=len(stored.text))
+                return stored
+
+        ext = select_format(language, preferred_ext).ext
+        raw_lines = stream_subtitle_lines(language, ext, session)
+        kept: list[str] = []
+        if keep:
+            raw_lines = _tee(raw_lines, kept)
+        if timestamps:
+            track = parse_track(raw_lines, ext)
+            line_count = len(track)
+            plain = track.text
+            text = track.timestamped_text()
+        else:
+            lines = list(transcript_lines(raw_lines, ext))
+            line_count = len(lines)
+            plain = text = "\n".join(lines)
+        timing.set(lines=line_count, chars=len(text))
+
+    if keep:
+        import sqlite3
+
+        raw = SubtitleContent(language=language, raw_text="\n".join(kept), ext=ext)
+        try:
+            store.put(video_id, language, CleanedTranscript(language.code, plain), raw)
+        except (sqlite3.Error, OSError) as exc:
+            # A transcript that cannot be stored is still worth summarizing.
+            warnings.warn(f"failed to store transcript of {video_id}: {exc}", stacklevel=2)
+    return CleanedTranscript(language_code=language.code, text=text)
+
+
+def _tee(lines: Iterable[str], kept: list[str]) -> Iterator[str]:
+    for line in lines:
+        kept.append(line)
+        yield line
+
+
+def fetch_transcript(
+    url: str,
+    lang: str | None = None,
+    metadata_cache: MetadataCache | None = None,
+    refresh: bool = False,
+    timestamps: bool = False,
+    store: TranscriptStore | None = None,
+) -> CleanedTranscript:
+    """Extract metadata, download and clean the subtitles for one video.
+
+    With a ``store`` and an explicit ``lang``, a stored transcript is used
+    without contacting YouTube at all (unless ``refresh``).
+    """
+    video_id = extract_video_id(url) if store is not None else None
+    if video_id and lang and not refresh:
+        stored = stored_transcript(store, video_id, lang, timestamps=timestamps)
+        if stored is not None:
+            return stored
+    languages = list_languages(url, cache=metadata_cache, refresh=refresh)
+    selected = select_language(languages, lang)
+    return download_transcript(
+        selected, timestamps=timestamps, store=store, video_id=video_id, refresh=refresh
+    )
+
+
+def summarize_languages(
+    url: str,
+    languages: Sequence[SubtitleLanguage],
+    summarizer: Summarizer,
+    *,
+    prompt: str = DEFAULT_SUMMARIZATION_PROMPT,
+    io_workers: int = DEFAULT_IO_WORKERS,
+    summary_workers: int = DEFAULT_SUMMARY_WORKERS,
+    timestamps: bool = False,
+    store: TranscriptStore | None = None,
+    refresh: bool = False,
+) -> Iterator[BatchResult]:
+    """Download and summarize several languages of one video concurrently.
+
+    ``languages`` come from a single ``list_languages`` call, so metadata is
+    extracted once. Each language is summarized as soon as its download
+    finishes; results are yielded in completion order. Transcripts are read
+    from and saved to ``store`` as in ``download_transcript``.
+    """
+    if not languages:
+        return
+    video_id = extract_video_id(url) if store is not None else None
+    with (
+        ThreadPoolExecutor(
+            min(io_workers, len(languages)), thread_name_prefix="yt-subs-io"
+        ) as io_pool,
+        ThreadPoolExecutor(summary_workers, thread_name_prefix="yt-subs-llm") as llm_pool,
+    ):
+        downloads = {
+            io_pool.submit(
+                download_transcript,
+                lang,
+                timestamps=timestamps,
+                store=store,
+                video_id=video_id,
+                refresh=refresh,
+            ): lang
+            for lang in languages
+        }
+        summaries: dict[Future[str], str] = {}
+        for future in as_completed(downloads):
+            code = downloads[future].code
+            try:
+                transcript = future.result()
+            except Exception as exc:
+                yield BatchResult(url=url, language_code=code, error=str(exc))
+                continue
+            summaries[llm_pool.submit(summarizer.summarize, transcript.text, prompt)] = code
+        for future in as_completed(summaries):
+            code = summaries[future]
+            try:
+                result = BatchResult(url=url, language_code=code, summary=future.result())
+            except Exception as exc:
+                result = BatchResult(url=url, language_code=code, error=str(exc))
+            yield result
+
+
+def run_batch(
+    urls: Iterable[str],
+    summarizer: Summarizer,
+    *,
+    lang: str | None = None,
+    prompt: str = DEFAULT_SUMMARIZATION_PROMPT,
+    io_workers: int = DEFAULT_IO_WORKERS,
+    summary_workers: int = DEFAULT_SUMMARY_WORKERS,
+    metadata_cache: MetadataCache | None = None,
+    refresh: bool = False,
+    timestamps: bool = False,
+    store: TranscriptStore | None = None,
+) -> Iterator[BatchResult]:
+    """Process many URLs concurrently, yielding results in completion order.
+
+    URLs are consumed lazily; at most a bounded number of videos are in
+    flight at once, so arbitrarily long inputs (e.g. stdin) are fine.
+    """
+    results: queue.Queue[BatchResult] = queue.Queue()
+    io_pool = ThreadPoolExecutor(io_workers, thread_name_prefix="yt-subs-io")
+    llm_pool = ThreadPoolExecutor(summary_workers, thread_name_prefix="yt-subs-llm")
+
+    def summarize(url: str, transcript: CleanedTranscript) -> None:
+        try:
+            summary = summarizer.summarize(transcript.text, prompt)
+        except Exception as exc:
+            results.put(
+                BatchResult(url=url, language_code=transcript.language_code, error=str(exc))
+            )
+        else:
+            results.put(
+                BatchResult(url=url, language_code=transcript.language_code, summary=summary)
+            )
+
+    def fetch(url: str) -> None:
+        try:
+            transcript = fetch_transcript(
+                url, lang, metadata_cache, refresh, timestamps, store
+            )
+            llm_pool.submit(summarize, url, transcript)
+        except Exception as exc:
+            permanent = isinstance(exc, NoSubtitlesAvailableError)
+            results.put(BatchResult(url=url, error=str(exc), permanent=permanent))
+
+    max_pending = 4 * (io_workers + summary_workers)
+    pending = 0
+    try:
+        for url in urls:
+            io_pool.submit(fetch, url)
+            pending += 1
+            while pending >= max_pending:
+                yield results.get()
+                pending -= 1
+            while pending:
+                try:
+                    result = results.get_nowait()
+                except queue.Empty:
+                    break
+                pending -= 1
+                yield result
+
+        while pending:
+            yield results.get()
+            pending -= 1
+    finally:
+        io_pool.shutdown(wait=False, cancel_futures=True)
+        llm_pool.shutdown(wait=False, cancel_futures=True)
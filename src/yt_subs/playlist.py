@@ -0,0 +1,208 @@
+"""Playlist and channel expansion with an incremental "only new videos" state.
+
+Entries are enumerated with yt-dlp flat extraction (``extract_flat`` with an
+unprocessed, lazily paged result), so listing a channel never resolves the
+individual videos and stops fetching pages as soon as the caller stops
+iterating.
+"""
+
+import json
+import threading
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from .cache import atomic_write_text, default_cache_dir
+from .subtitles import extract_video_id
+from .types import YtSubsError
+
+DEFAULT_KNOWN_STREAK = 50
+_MAX_NESTING = 3
+_STATE_VERSION = 2
+
+
+def _entry_video_id(entry: dict) -> str | None:
+    video_id = extract_video_id(entry.get("url") or "")
+    if video_id is None and entry.get("ie_key") == "Youtube":
+        video_id = extract_video_id(entry.get("id") or "")
+    return video_id
+
+
+def _iter_entry_ids(
+    ydl, info: dict, depth: int, listing: str, skipped: set[str]
+) -> Iterator[tuple[str, str]]:
+    kind = info.get("_type", "video")
+    if kind in ("playlist", "multi_video"):
+        entries = iter(info.get("entries") or ())
+        # Checked before each entry is pulled, so a skipped listing fetches
+        # no further pages.
+        while listing not in skipped:
+            try:
+                entry = next(entries)
+            except StopIteration:
+                return
+            if entry:
+                yield from _iter_entry_ids(ydl, entry, depth, listing, skipped)
+        return
+
+    if kind in ("url", "url_transparent"):
+        video_id = _entry_video_id(info)
+        if video_id:
+            yield listing, video_id
+        elif depth > 0 and info.get("url"):
+            # A channel root lists its tabs (videos, shorts, live) as
+            # nested playlists; expand them the same lazy way.
+            nested = ydl.extract_info(info["url"], download=False, process=False)
+            yield from _iter_entry_ids(ydl, nested, depth - 1, info["url"], skipped)
+        return
+
+    video_id = extract_video_id(info.get("id") or "")
+    if video_id:
+        yield listing, video_id
+
+
+def _iter_listed_video_ids(url: str, skipped: set[str]) -> Iterator[tuple[str, str]]:
+    """Yield ``(listing, video_id)`` for a playlist or channel in listing order.
+
+    ``listing`` is the URL of the playlist or channel tab the video was
+    listed in; adding it to ``skipped`` stops that listing early.
+    """
+    video_id = extract_video_id(url)
+    if video_id and "list=" not in url:
+        yield url, video_id
+        return
+
+    import yt_dlp
+
+    ydl_opts = {
+        "skip_download": True,
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": "in_playlist",
+        "lazy_playlist": True,
+    }
+    seen: set[str] = set()
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        try:
+            info = ydl.extract_info(url, download=False, process=False)
+            for listing, video_id in _iter_entry_ids(ydl, info, _MAX_NESTING, url, skipped):
+                if video_id not in seen:
+                    seen.add(video_id)
+                    yield listing, video_id
+        except yt_dlp.utils.DownloadError as exc:
+            raise YtSubsError(f"failed to list videos in {url}: {exc}") from exc
+
+
+def iter_playlist_video_ids(url: str) -> Iterator[str]:
+    """Yield the video IDs of a playlist or channel in listing order.
+
+    A single video URL yields just its own ID without calling yt-dlp.
+    Pages are requested only as the iterator is consumed.
+    """
+    for _, video_id in _iter_listed_video_ids(url, set()):
+        yield video_id
+
+
+def default_state_path() -> Path:
+    return default_cache_dir() / "sync-state.json"
+
+
+class SyncState:
+    """Already-processed video IDs persisted to a JSON file.
+
+    Videos that failed permanently (no subtitles) are kept in a separate
+    set; both count as known, so neither is extracted again. The file is
+    rewritten atomically by ``save``; a missing or unreadable file starts
+    an empty state.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self._path = path or default_state_path()
+        self._lock = threading.Lock()
+        self._processed: set[str] = set()
+        self._failed: set[str] = set()
+        self._dirty = False
+        try:
+            record = json.loads(self._path.read_text(encoding="utf-8"))
+            if record.get("version") in (1, _STATE_VERSION):
+                self._processed = set(record["processed"])
+                self._failed = set(record.get("failed", ()))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def failed(self) -> frozenset[str]:
+        return frozenset(self._failed)
+
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self._processed or video_id in self._failed
+
+    def __len__(self) -> int:
+        """Number of processed videos, not counting failures."""
+        return len(self._processed)
+
+    def mark(self, video_id: str) -> None:
+        with self._lock:
+            if video_id not in self._processed:
+                self._processed.add(video_id)
+                self._failed.discard(video_id)
+                self._dirty = True
+
+    def mark_failed(self, video_id: str) -> None:
+        """Record a video that cannot be summarized, so that it is not retried."""
+        with self._lock:
+            if video_id not in self._processed and video_id not in self._failed:
+                self._failed.add(video_id)
+                self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            record = {
+                "version": _STATE_VERSION,
+                "processed": sorted(self._processed),
+                "failed": sorted(self._failed),
+            }
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self._path, json.dumps(record))
+            self._dirty = False
+
+
+def is_playlist_url(url: str) -> bool:
+    return "list=" in url
+
+
+def iter_new_video_ids(
+    urls: Iterable[str],
+    state: SyncState,
+    known_streak: int | None = DEFAULT_KNOWN_STREAK,
+) -> Iterator[str]:
+    """Yield IDs from the playlists/channels in ``urls`` not yet in ``state``.
+
+    Channels list their newest uploads first, so after ``known_streak``
+    consecutive already-known entries the rest of a channel tab is skipped
+    without fetching its remaining pages. ``None`` scans every
+    entry. Playlists are usually oldest first, with new videos appended at
+    the end, so they are always scanned in full; the flat listing costs one
+    request per page of entries.
+    """
+    seen: set[str] = set()
+    for url in urls:
+        limit = None if is_playlist_url(url) else known_streak
+        # Each tab (videos, shorts, live) has its own newest-first order.
+        streaks: dict[str, int] = {}
+        skipped: set[str] = set()
+        for listing, video_id in _iter_listed_video_ids(url, skipped):
+            if video_id in state:
+                streaks[listing] = streaks.get(listing, 0) + 1
+                if limit is not None and streaks[listing] >= limit:
+                    skipped.add(listing)
+                continue
+            streaks[listing] = 0
+            if video_id not in seen:
+                seen.add(video_id)
+                yield video_id
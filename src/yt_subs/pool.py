@@ -0,0 +1,278 @@
+"""Load balancing across several summarizer backends (e.g. Ollama hosts).
+
+``PooledSummarizer`` sends each request to the backend with the fewest
+outstanding requests relative to its weight, or in smooth weighted
+round-robin order. A per-backend circuit breaker takes a host out of
+rotation after repeated failures; after a cooldown it is health-checked
+(when the backend supports ``ping``) and given one trial request before
+rejoining. A failed request is retried on another backend.
+"""
+
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+
+from .summarizer import StreamingSummarizer, Summarizer
+from .types import SummarizationError
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOLDOWN = 30.0
+
+LEAST_OUTSTANDING = "least-outstanding"
+ROUND_ROBIN = "round-robin"
+STRATEGIES = (LEAST_OUTSTANDING, ROUND_ROBIN)
+
+
+class CircuitBreaker:
+    """Closed until ``threshold`` consecutive failures, then open for ``cooldown``.
+
+    Once the cooldown has passed the breaker is half-open: it admits a
+    single trial request, which closes it on success or reopens it on
+    failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown: float = DEFAULT_COOLDOWN,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if threshold < 1:
+            raise ValueError("threshold must be at least 1")
+        self._threshold = threshold
+        self._cooldown = cooldown
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at < self._cooldown:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def available(self) -> bool:
+        state = self.state
+        return state == self.CLOSED or (state == self.HALF_OPEN and not self._trial_running)
+
+    def begin(self) -> None:
+        """Note that a request is being sent; claims the trial slot when half-open."""
+        if self.state == self.HALF_OPEN:
+            self._trial_running = True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_running = False
+        if self._opened_at is not None or self._failures >= self._threshold:
+            self._opened_at = self._clock()
+
+
+class _Backend:
+    def __init__(self, summarizer: Summarizer, weight: float, breaker: CircuitBreaker):
+        self.summarizer = summarizer
+        self.weight = weight
+        self.breaker = breaker
+        self.outstanding = 0
+        self.current_weight = 0.0
+        self.served = 0
+        self.failures = 0
+
+    @property
+    def name(self) -> str:
+        return getattr(self.summarizer, "base_url", None) or repr(self.summarizer)
+
+
+class PooledSummarizer:
+    """Summarizer spreading requests across ``backends``.
+
+    ``strategy`` is ``"least-outstanding"`` (default) or ``"round-robin"``
+    (smooth weighted round-robin); ``weights`` default to 1 per backend.
+    Each request is tried on up to ``max_attempts`` distinct backends
+    (default: all of them).
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[Summarizer],
+        *,
+        weights: Sequence[float] | None = None,
+        strategy: str = LEAST_OUTSTANDING,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown: float = DEFAULT_COOLDOWN,
+        max_attempts: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not backends:
+            raise ValueError("at least one backend is required")
+        if weights is None:
+            weights = [1.0] * len(backends)
+        if len(weights) != len(backends) or any(w <= 0 for w in weights):
+            raise ValueError("weights must be positive, one per backend")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {', '.join(STRATEGIES)}")
+        self._backends = [
+            _Backend(summarizer, float(weight), CircuitBreaker(failure_threshold, cooldown, clock))
+            for summarizer, weight in zip(backends, weights)
+        ]
+        self._strategy = strategy
+        self._max_attempts = max_attempts or len(self._backends)
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> str | None:
+        return getattr(self._backends[0].summarizer, "model", None)
+
+    @property
+    def options(self) -> dict | None:
+        return getattr(self._backends[0].summarizer, "options", None)
+
+    def stats(self) -> list[dict]:
+        """Per-backend request counts and breaker state."""
+        with self._lock:
+            return [
+                {
+                    "backend": b.name,
+                    "served": b.served,
+                    "failures": b.failures,
+                    "outstanding": b.outstanding,
+                    "state": b.breaker.state,
+                }
+                for b in self._backends
+            ]
+
+    def _probe(self, backend: _Backend) -> bool:
+        """Health-check a half-open backend before trusting it with a request."""
+        ping = getattr(backend.summarizer, "ping", None)
+        if ping is None:
+            return True
+        healthy = bool(ping())
+        if not healthy:
+            with self._lock:
+                backend.breaker.record_failure()
+        return healthy
+
+    def _choose(self, tried: set[int]) -> _Backend | None:
+        candidates = [
+            (i, b)
+            for i, b in enumerate(self._backends)
+            if i not in tried and b.breaker.available()
+        ]
+        if not candidates:
+            return None
+        if self._strategy == LEAST_OUTSTANDING:
+            _, chosen = min(candidates, key=lambda c: ((c[1].outstanding + 1) / c[1].weight, c[0]))
+        else:
+            total = sum(b.weight for _, b in candidates)
+            for _, b in candidates:
+                b.current_weight += b.weight
+            _, chosen = max(candidates, key=lambda c: c[1].current_weight)
+            chosen.current_weight -= total
+        tried.add(self._backends.index(chosen))
+        return chosen
+
+    def _acquire(self, tried: set[int]) -> _Backend | None:
+        while True:
+            with self._lock:
+                backend = self._choose(tried)
+                if backend is None:
+                    return None
+                half_open = backend.breaker.state == CircuitBreaker.HALF_OPEN
+                backend.breaker.begin()
+                backend.outstanding += 1
+            if not half_open or self._probe(backend):
+                return backend
+            with self._lock:
+                backend.outstanding -= 1
+
+    def _release(self, backend: _Backend, ok: bool) -> None:
+        with self._lock:
+            backend.outstanding -= 1
+            if ok:
+                backend.served += 1
+                backend.breaker.record_success()
+            else:
+                backend.failures += 1
+                backend.breaker.record_failure()
+
+    def _attempts(self) -> Iterator[_Backend]:
+        tried: set[int] = set()
+        for _ in range(self._max_attempts):
+            backend = self._acquire(tried)
+            if backend is None:
+                return
+            yield backend
+
+    def summarize(self, transcript: str, prompt: str) -> str:
+        errors = []
+        for backend in self._attempts():
+            try:
+                summary = backend.summarizer.summarize(transcript, prompt)
+            except Exception as exc:
+                self._release(backend, ok=False)
+                errors.append(f"{backend.name}: {exc}")
+                continue
+            self._release(backend, ok=True)
+            return summary
+        raise _exhausted(errors)
+
+    def stream(self, transcript: str, prompt: str) -> Iterator[str]:
+        """Stream from one backend; fail over only if no token was produced yet."""
+        errors = []
+        for backend in self._attempts():
+            started = False
+            try:
+                if isinstance(backend.summarizer, StreamingSummarizer):
+                    for token in backend.summarizer.stream(transcript, prompt):
+                        started = True
+                        yield token
+                else:
+                    summary = backend.summarizer.summarize(transcript, prompt)
+                    started = True
+                    yield summary
+            except Exception as exc:
+                self._release(backend, ok=False)
+                if started:
+                    raise
+                errors.append(f"{backend.name}: {exc}")
+                continue
+            except BaseException:
+                # GeneratorExit when the consumer stops early is not a failure.
+                self._release(backend, ok=True)
+                raise
+            self._release(backend, ok=True)
+            return
+        raise _exhausted(errors)
+
+    def check_health(self) -> dict[str, bool]:
+        """Ping every backend that supports it, opening or closing breakers."""
+        results = {}
+        for backend in self._backends:
+            ping = getattr(backend.summarizer, "ping", None)
+            if ping is None:
+                continue
+            healthy = bool(ping())
+            with self._lock:
+                if healthy:
+                    backend.breaker.record_success()
+                else:
+                    backend.breaker.record_failure()
+            results[backend.name] = healthy
+        return results
+
+
+def _exhausted(errors: list[str]) -> SummarizationError:
+    if not errors:
+        return SummarizationError("no summarization backend is available")
+    return SummarizationError("all backends failed: " + "; ".join(errors))
@@ -0,0 +1,292 @@
+"""Long-lived local HTTP/JSON service keeping yt-dlp and Ollama clients warm.
+
+``yt-subs serve`` pays Python startup, the yt-dlp import and extractor
+initialization once. Requests are queued behind a fixed number of worker
+slots, and identical in-flight requests for the same video share one
+computation instead of repeating it.
+
+Endpoints (JSON bodies, JSON responses):
+
+- ``GET /health`` -> ``{"ok": true}``
+- ``GET /metrics`` -> Prometheus text, when started with ``--metrics prometheus``
+- ``POST /languages`` ``{"url", "refresh"?}`` -> ``{"languages": [...]}``
+- ``POST /transcript`` ``{"url", "lang"?}`` -> ``{"language", "text"}``
+- ``POST /summarize`` ``{"url", "lang"?, "prompt"?}`` -> ``{"language", "summary"}``
+
+Errors are ``{"error": message}`` with status 400 (bad request), 404 (no
+subtitles, marked ``"reason": "no-subtitles"``, or an unknown endpoint) or
+502 (download or summarization failure).
+"""
+
+import json
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, TypeVar
+
+from . import metrics
+from .cache import MetadataCache, encode_languages
+from .pipeline import download_transcript, select_language
+from .subtitles import extract_video_id, list_languages, new_youtube_dl
+from .summarizer import Summarizer
+from .types import (
+    DEFAULT_SUMMARIZATION_PROMPT,
+    NO_SUBTITLES_REASON,
+    CleanedTranscript,
+    NoSubtitlesAvailableError,
+    SubtitleLanguage,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_SERVER_WORKERS = 4
+_MAX_BODY = 64 * 1024
+
+T = TypeVar("T")
+
+
+class InflightGroup:
+    """Run a callable once per key while callers with the same key wait.
+
+    The result (or exception) of the first caller is shared by everyone
+    who asked for the same key before it finished.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Any, Future] = {}
+        self.shared = 0
+
+    def do(self, key: Any, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.shared += 1
+
+        if leader:
+            try:
+                future.set_result(fn())
+            except BaseException as exc:
+                future.set_exception(exc)
+            finally:
+                with self._lock:
+                    del self._calls[key]
+        return future.result()
+
+
+class YoutubeDLPool:
+    """Reusable YoutubeDL instances, created on first use.
+
+    An instance is used by one thread at a time; keeping it across requests
+    keeps its extractors initialized.
+    """
+
+    def __init__(self, factory: Callable[[], Any] = new_youtube_dl):
+        self._factory = factory
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+
+    def run(self, fn: Callable[[Any], T]) -> T:
+        try:
+            ydl = self._idle.get_nowait()
+        except queue.Empty:
+            ydl = self._factory()
+        try:
+            return fn(ydl)
+        finally:
+            self._idle.put(ydl)
+
+    def close(self) -> None:
+        while True:
+            try:
+                ydl = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            ydl.close()
+
+
+class _BadRequest(Exception):
+    pass
+
+
+class SubtitleService:
+    """The operations behind the HTTP endpoints, independent of transport."""
+
+    def __init__(
+        self,
+        summarizer: Summarizer,
+        workers: int = DEFAULT_SERVER_WORKERS,
+        metadata_cache: MetadataCache | None = None,
+    ):
+        self._summarizer = summarizer
+        self._metadata_cache = metadata_cache
+        self._slots = threading.BoundedSemaphore(workers)
+        self._inflight = InflightGroup()
+        self._ydl_pool = YoutubeDLPool()
+
+    @property
+    def inflight(self) -> InflightGroup:
+        return self._inflight
+
+    def _key(self, op: str, url: str, *rest: Any) -> tuple:
+        return (op, extract_video_id(url) or url, *rest)
+
+    def _languages(self, url: str, refresh: bool = False) -> list[SubtitleLanguage]:
+        def extract() -> list[SubtitleLanguage]:
+            with self._slots:
+                return self._ydl_pool.run(
+                    lambda ydl: list_languages(
+                        url, cache=self._metadata_cache, refresh=refresh, ydl=ydl
+                    )
+                )
+
+        return self._inflight.do(self._key("languages", url, refresh), extract)
+
+    def _transcript(self, url: str, lang: str | None) -> CleanedTranscript:
+        def fetch() -> CleanedTranscript:
+            selected = select_language(self._languages(url), lang)
+            with self._slots:
+                return download_transcript(selected)
+
+        return self._inflight.do(self._key("transcript", url, lang), fetch)
+
+    def languages(self, request: dict) -> dict:
+        url = _require_url(request)
+        languages = self._languages(url, bool(request.get("refresh", False)))
+        return {"languages": encode_languages(languages)}
+
+    def transcript(self, request: dict) -> dict:
+        transcript = self._transcript(_require_url(request), _optional_str(request, "lang"))
+        return {"language": transcript.language_code, "text": transcript.text}
+
+    def summarize(self, request: dict) -> dict:
+        url = _require_url(request)
+        lang = _optional_str(request, "lang")
+        prompt = _optional_str(request, "prompt") or DEFAULT_SUMMARIZATION_PROMPT
+
+        def run() -> dict:
+            transcript = self._transcript(url, lang)
+            with self._slots:
+                summary = self._summarizer.summarize(transcript.text, prompt)
+            return {"language": transcript.language_code, "summary": summary}
+
+        return self._inflight.do(self._key("summarize", url, lang, prompt), run)
+
+    def close(self) -> None:
+        self._ydl_pool.close()
+
+
+def _require_url(request: dict) -> str:
+    url = request.get("url")
+    if not isinstance(url, str) or not url:
+        raise _BadRequest("'url' is required")
+    return url
+
+
+def _optional_str(request: dict, name: str) -> str | None:
+    value = request.get(name)
+    if value is not None and not isinstance(value, str):
+        raise _BadRequest(f"'{name}' must be a string")
+    return value or None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "SubtitleServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, "application/json", body)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"ok": True})
+        elif self.path == "/metrics":
+            recorder = metrics.active_recorder()
+            if isinstance(recorder, metrics.PrometheusRecorder):
+                body = recorder.render().encode("utf-8")
+                self._send(200, "text/plain; version=0.0.4", body)
+            else:
+                self._send_json(404, {"error": "start the server with --metrics prometheus"})
+        else:
+            self._send_json(404, {"error": f"unknown endpoint {self.path}"})
+
+    def do_POST(self) -> None:
+        service = self.server.service
+        routes = {
+            "/languages": service.languages,
+            "/transcript": service.transcript,
+            "/summarize": service.summarize,
+        }
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > _MAX_BODY:
+            self.close_connection = True
+            self._send_json(413, {"error": "request body too large"})
+            return
+        raw = self.rfile.read(length)
+
+        route = routes.get(self.path)
+        if route is None:
+            self._send_json(404, {"error": f"unknown endpoint {self.path}"})
+            return
+        try:
+            request = json.loads(raw or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": "request body is not valid JSON"})
+            return
+        if not isinstance(request, dict):
+            self._send_json(400, {"error": "request body must be a JSON object"})
+            return
+
+        try:
+            self._send_json(200, route(request))
+        except _BadRequest as exc:
+            self._send_json(400, {"error": str(exc)})
+        except NoSubtitlesAvailableError as exc:
+            self._send_json(404, {"error": str(exc), "reason": NO_SUBTITLES_REASON})
+        except Exception as exc:
+            self._send_json(502, {"error": str(exc)})
+
+
+class SubtitleServer(ThreadingHTTPServer):
+    """HTTP front end for a ``SubtitleService``.
+
+    Each connection gets a thread; work beyond the service's worker slots
+    waits in line.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        service: SubtitleService,
+        verbose: bool = False,
+    ):
+        super().__init__(address, _Handler)
+        self.service = service
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.service.close()
@@ -0,0 +1,219 @@
+"""Persistent transcript store with a full-text index.
+
+Every downloaded transcript is kept in one SQLite file, keyed by video ID,
+language code and source (manual or auto), together with the raw subtitle
+file it was cleaned from. Both are zlib-compressed, typically 3-5x. An FTS5
+index over the cleaned text answers searches across tens of thousands of
+transcripts in milliseconds. The index is contentless (it stores no copy of
+the text), so snippets are cut from the decompressed matches.
+"""
+
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from .cache import default_cache_dir
+from .types import CleanedTranscript, SubtitleContent, SubtitleLanguage, SubtitleSource
+
+DEFAULT_SEARCH_LIMIT = 20
+SNIPPET_CHARS = 160
+
+_COMPRESSION_LEVEL = 6
+_TERM_RE = re.compile(r"\w+")
+_OPERATORS = frozenset({"AND", "OR", "NOT", "NEAR"})
+# Manual subtitles are preferred when a lookup does not name the source.
+_SOURCE_ORDER = "CASE source WHEN 'manual' THEN 0 ELSE 1 END"
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    video_id: str
+    language_code: str
+    source: SubtitleSource
+    snippet: str
+    # bm25 relevance; lower is a better match.
+    score: float
+
+
+def _compress(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), _COMPRESSION_LEVEL)
+
+
+def _decompress(blob: bytes) -> str:
+    return zlib.decompress(blob).decode("utf-8")
+
+
+def _snippet(text: str, query: str, width: int = SNIPPET_CHARS) -> str:
+    """About ``width`` characters of ``text`` around the first query term."""
+    lower = text.lower()
+    terms = [t.lower() for t in _TERM_RE.findall(query) if t not in _OPERATORS]
+    positions = [p for term in terms if (p := lower.find(term)) >= 0]
+    start = max(0, min(positions) - width // 3) if positions else 0
+    snippet = text[start : start + width].replace("\n", " ")
+    if start:
+        snippet = "…" + snippet
+    if start + width < len(text):
+        snippet += "…"
+    return snippet
+
+
+class TranscriptStore:
+    """Compressed transcripts and raw subtitles with a full-text index.
+
+    Safe to share between threads; WAL mode lets several processes read
+    while one writes. Defaults to ``transcripts.sqlite3`` in the cache
+    directory.
+    """
+
+    def __init__(self, path: Path | str | None = None):
+        self._path = Path(path) if path else default_cache_dir() / "transcripts.sqlite3"
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        import sqlite3
+
+        self._errors = sqlite3.Error
+        self._conn = sqlite3.connect(self._path, timeout=30, check_same_thread=False)
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS transcripts ("
+                    " id INTEGER PRIMARY KEY,"
+                    " video_id TEXT NOT NULL,"
+                    " language TEXT NOT NULL,"
+                    " source TEXT NOT NULL,"
+                    " text BLOB NOT NULL,"
+                    " ext TEXT,"
+                    " raw BLOB,"
+                    " created REAL NOT NULL,"
+                    " UNIQUE (video_id, language, source))"
+                )
+                self._conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts USING fts5("
+                    " text, content='', tokenize='unicode61 remove_diacritics 2')"
+                )
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM transcripts").fetchone()[0]
+
+    def put(
+        self,
+        video_id: str,
+        language: SubtitleLanguage,
+        transcript: CleanedTranscript,
+        raw: SubtitleContent | None = None,
+    ) -> None:
+        """Store (or replace) the transcript of one video language and source."""
+        key = (video_id, language.code, language.source.value)
+        text = _compress(transcript.text)
+        ext, raw_blob = (raw.ext, _compress(raw.raw_text)) if raw is not None else (None, None)
+        with self._lock, self._conn:
+            old = self._conn.execute(
+                "SELECT id, text FROM transcripts"
+                " WHERE video_id = ? AND language = ? AND source = ?",
+                key,
+            ).fetchone()
+            if old is not None:
+                # A contentless index can only unindex the exact old text.
+                self._conn.execute(
+                    "INSERT INTO transcripts_fts (transcripts_fts, rowid, text)"
+                    " VALUES ('delete', ?, ?)",
+                    (old[0], _decompress(old[1])),
+                )
+                self._conn.execute("DELETE FROM transcripts WHERE id = ?", (old[0],))
+            rowid = self._conn.execute(
+                "INSERT INTO transcripts"
+                " (video_id, language, source, text, ext, raw, created)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, text, ext, raw_blob, time.time()),
+            ).lastrowid
+            self._conn.execute(
+                "INSERT INTO transcripts_fts (rowid, text) VALUES (?, ?)",
+                (rowid, transcript.text),
+            )
+
+    def _row(
+        self, columns: str, video_id: str, language_code: str, source: SubtitleSource | None
+    ) -> tuple | None:
+        query = f"SELECT {columns} FROM transcripts WHERE video_id = ? AND language = ?"
+        params: tuple = (video_id, language_code)
+        if source is not None:
+            query += " AND source = ?"
+            params += (source.value,)
+        query += f" ORDER BY {_SOURCE_ORDER} LIMIT 1"
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()
+
+    def get(
+        self, video_id: str, language_code: str, source: SubtitleSource | None = None
+    ) -> CleanedTranscript | None:
+        """The stored transcript, preferring manual subtitles unless ``source`` is given."""
+        row = self._row("text", video_id, language_code, source)
+        if row is None:
+            return None
+        return CleanedTranscript(language_code=language_code, text=_decompress(row[0]))
+
+    def get_subtitles(
+        self, video_id: str, language_code: str, source: SubtitleSource | None = None
+    ) -> SubtitleContent | None:
+        """The raw subtitle file a stored transcript was cleaned from, if it was kept."""
+        row = self._row("source, ext, raw", video_id, language_code, source)
+        if row is None or row[2] is None:
+            return None
+        language = SubtitleLanguage(
+            code=language_code, name=language_code, source=SubtitleSource(row[0]), formats=()
+        )
+        return SubtitleContent(language=language, raw_text=_decompress(row[2]), ext=row[1])
+
+    def search(
+        self,
+        query: str,
+        language_code: str | None = None,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+    ) -> list[SearchHit]:
+        """Transcripts matching an FTS5 ``query``, best match first.
+
+        Plain words must all occur; FTS5 syntax (``"exact phrase"``,
+        ``OR``, ``NOT``, ``prefix*``) is supported. Raises ``ValueError``
+        for a malformed query.
+        """
+        sql = (
+            "SELECT t.video_id, t.language, t.source, t.text, bm25(transcripts_fts) AS score"
+            " FROM transcripts_fts JOIN transcripts t ON t.id = transcripts_fts.rowid"
+            " WHERE transcripts_fts MATCH ?"
+        )
+        params: tuple = (query,)
+        if language_code is not None:
+            sql += " AND t.language = ?"
+            params += (language_code,)
+        sql += " ORDER BY score LIMIT ?"
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params + (limit,)).fetchall()
+        except self._errors as exc:
+            raise ValueError(f"invalid search query {query!r}: {exc}") from exc
+        return [
+            SearchHit(
+                video_id=video_id,
+                language_code=language,
+                source=SubtitleSource(source),
+                snippet=_snippet(_decompress(text), query),
+                score=score,
+            )
+            for video_id, language, source, text, score in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,7 +1,13 @@
-import urllib.request
-
-import yt_dlp
-
+import codecs
+import re
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlparse
+
+from . import metrics
+from .cache import MetadataCache
+from .formats import select_format
+from .transport import HTTPSession, default_session
 from .types import (
     NoSubtitlesAvailableError,
     SubtitleContent,
@@ -11,6 +17,43 @@ from .types import (
     SubtitleSource,
 )
 
+if TYPE_CHECKING:
+    import yt_dlp
+
+
+_VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_PATH_ID_PREFIXES = ("shorts", "embed", "live", "v", "e")
+
+
+def extract_video_id(url: str) -> str | None:
+    """Return the canonical 11-character video ID for any YouTube URL form.
+
+    Accepts watch, youtu.be, shorts, embed and live URLs as well as a bare ID.
+    Returns None when no ID can be recognized.
+    """
+    url = url.strip()
+    if _VIDEO_ID_RE.match(url):
+        return url
+
+    parsed = urlparse(url if "//" in url else f"https://{url}")
+    host = (parsed.hostname or "").lower()
+    for prefix in ("www.", "m.", "music."):
+        host = host.removeprefix(prefix)
+
+    candidate = None
+    if host == "youtu.be":
+        candidate = parsed.path.strip("/").split("/")[0]
+    elif host in ("youtube.com", "youtube-nocookie.com"):
+        parts = parsed.path.strip("/").split("/")
+        if parts[0] == "watch":
+            candidate = parse_qs(parsed.query).get("v", [None])[0]
+        elif len(parts) >= 2 and parts[0] in _PATH_ID_PREFIXES:
+            candidate = parts[1]
+
+    if candidate and _VIDEO_ID_RE.match(candidate):
+        return candidate
+    return None
+
 
 def _parse_formats(raw_formats: list[dict]) -> tuple[SubtitleFormat, ...]:
     return tuple(
@@ -38,17 +81,7 @@ def _parse_subtitle_entries(
     return languages
 
 
-def list_languages(url: str) -> list[SubtitleLanguage]:
-    """List all available subtitle languages for a YouTube video.
-
-    Uses yt-dlp to extract subtitle metadata without downloading.
-    Returns both manual and auto-generated subtitle languages.
-    """
-    ydl_opts = {"skip_download": True, "quiet": True, "no_warnings": True}
-
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(url, download=False)
-
+def _parse_info_languages(info: dict) -> list[SubtitleLanguage]:
     languages = []
     languages.extend(
         _parse_subtitle_entries(info.get("subtitles", {}), SubtitleSource.MANUAL)
@@ -61,6 +94,54 @@ def list_languages(url: str) -> list[SubtitleLanguage]:
     return languages
 
 
+def new_youtube_dl() -> "yt_dlp.YoutubeDL":
+    """Create a quiet YoutubeDL for metadata extraction.
+
+    Long-lived callers can keep one and pass it to ``list_languages`` so
+    extractors are initialized once rather than per video.
+    """
+    # Imported here: yt-dlp takes hundreds of milliseconds to import and
+    # most entry points (--help, cleaning, the daemon client) never need it.
+    import yt_dlp
+
+    return yt_dlp.YoutubeDL({"skip_download": True, "quiet": True, "no_warnings": True})
+
+
+def list_languages(
+    url: str,
+    cache: MetadataCache | None = None,
+    refresh: bool = False,
+    ydl: "yt_dlp.YoutubeDL | None" = None,
+) -> list[SubtitleLanguage]:
+    """List all available subtitle languages for a YouTube video.
+
+    Uses yt-dlp to extract subtitle metadata without downloading.
+    Returns both manual and auto-generated subtitle languages.
+
+    With a ``cache``, results are looked up by video ID first; ``refresh``
+    skips the lookup but still stores the freshly extracted result.
+    """
+    with metrics.span("list_languages", url=url) as timing:
+        video_id = extract_video_id(url) if cache is not None else None
+        if video_id and not refresh:
+            cached = cache.get(video_id)
+            if cached is not None:
+                timing.set(cached=True, languages=len(cached))
+                return cached
+
+        if ydl is None:
+            with new_youtube_dl() as ydl:
+                info = ydl.extract_info(url, download=False)
+        else:
+            info = ydl.extract_info(url, download=False)
+        languages = _parse_info_languages(info)
+        timing.set(cached=False, languages=len(languages))
+
+    if video_id:
+        cache.put(video_id, languages)
+    return languages
+
+
 def filter_preferred(
     languages: list[SubtitleLanguage],
     preferred: tuple[str, ...],
@@ -70,28 +151,102 @@ def filter_preferred(
     return [lang for lang in languages if lang.code in preferred_set]
 
 
+def find_language(
+    languages: list[SubtitleLanguage], code: str
+) -> SubtitleLanguage | None:
+    """Find first matching language by code, preferring manual over auto."""
+    for source in (SubtitleSource.MANUAL, SubtitleSource.AUTO):
+        for lang in languages:
+            if lang.code == code and lang.source == source:
+                return lang
+    return None
+
+
 def fetch_subtitle_content(
-    language: SubtitleLanguage, preferred_ext: str = "vtt"
+    language: SubtitleLanguage,
+    preferred_ext: str | None = None,
+    session: HTTPSession | None = None,
 ) -> SubtitleContent:
     """Fetch the raw subtitle text for a given language.
 
-    Prefers the format matching preferred_ext, falls back to the first available.
+    Prefers the format matching preferred_ext, otherwise the cheapest
+    supported one (see ``yt_subs.formats.select_format``).
     """
-    fmt = next(
-        (f for f in language.formats if f.ext == preferred_ext),
-        language.formats[0] if language.formats else None,
-    )
-    if fmt is None:
-        raise SubtitleDownloadError(
-            f"No formats available for language '{language.code}'"
-        )
+    fmt = select_format(language, preferred_ext)
 
+    session = session or default_session()
     try:
-        with urllib.request.urlopen(fmt.url) as resp:
-            raw_text = resp.read().decode("utf-8")
+        with metrics.span("download", lang=language.code, format=fmt.ext) as timing:
+            with session.request("GET", fmt.url) as resp:
+                raw = resp.read()
+            timing.set(bytes=len(raw))
+        raw_text = raw.decode("utf-8")
     except Exception as exc:
         raise SubtitleDownloadError(
             f"Failed to download subtitles for '{language.code}': {exc}"
         ) from exc
 
-    return SubtitleContent(language=language, raw_text=raw_text)
+    return SubtitleContent(language=language, raw_text=raw_text, ext=fmt.ext)
+
+
+class LineSplitter:
+    """Incrementally decode byte chunks into complete lines.
+
+    Splits exactly like ``str.splitlines()`` on the whole text would, while
+    only ever holding one partial line in memory.
+    """
+
+    def __init__(self, encoding: str = "utf-8"):
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._pending = ""
+
+    def feed(self, chunk: bytes) -> list[str]:
+        """Add a chunk and return the lines it completed."""
+        self._pending += self._decoder.decode(chunk)
+        lines = self._pending.splitlines(keepends=True)
+        if not lines:
+            return []
+        last = lines[-1]
+        # A trailing line is incomplete if it has no terminator yet, or ends
+        # in "\r" that may be the first half of "\r\n".
+        if last.endswith("\r") or last.splitlines() == [last]:
+            self._pending = lines.pop()
+        else:
+            self._pending = ""
+        return [line.splitlines()[0] for line in lines]
+
+    def finish(self) -> list[str]:
+        """Flush the decoder and return the remaining lines."""
+        self._pending += self._decoder.decode(b"", final=True)
+        lines, self._pending = self._pending.splitlines(), ""
+        return lines
+
+
+def iter_text_lines(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """Incrementally decode byte chunks into lines (see ``LineSplitter``)."""
+    splitter = LineSplitter(encoding)
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+    yield from splitter.finish()
+
+
+def stream_subtitle_lines(
+    language: SubtitleLanguage,
+    preferred_ext: str | None = None,
+    session: HTTPSession | None = None,
+) -> Iterator[str]:
+    """Download subtitles and yield raw lines as the response arrives.
+
+    Peak memory is bounded by the network chunk size, not the file size.
+    """
+    fmt = select_format(language, preferred_ext)
+
+    session = session or default_session()
+    try:
+        with metrics.span("download", lang=language.code, format=fmt.ext) as timing:
+            with session.request("GET", fmt.url) as resp:
+                yield from iter_text_lines(metrics.timed_chunks(resp.iter_chunks(), timing))
+    except Exception as exc:
+        raise SubtitleDownloadError(
+            f"Failed to download subtitles for '{language.code}': {exc}"
+        ) from exc
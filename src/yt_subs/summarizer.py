@@ -1,46 +1,312 @@
+import hashlib
 import json
-import urllib.request
-from typing import Protocol
+import threading
+from collections.abc import Iterator
+from typing import Protocol, runtime_checkable
 
-from .types import DEFAULT_MODEL, SummarizationError
+from . import metrics
+from .cache import SummaryStore
+from .tokens import DEFAULT_RESPONSE_TOKENS, estimate_tokens, request_context
+from .transport import HTTPSession, Response, default_session
+from .types import DEFAULT_MODEL, DEFAULT_OLLAMA_URL, SummarizationError
 
 
 class Summarizer(Protocol):
     def summarize(self, transcript: str, prompt: str) -> str: ...
 
 
+@runtime_checkable
+class StreamingSummarizer(Summarizer, Protocol):
+    def stream(self, transcript: str, prompt: str) -> Iterator[str]:
+        """Yield the summary incrementally as the model generates it."""
+        ...
+
+
+DEFAULT_OLLAMA_TIMEOUT = 600.0
+DEFAULT_PING_TIMEOUT = 2.0
+
+
+def encode_generate_request(
+    model: str,
+    transcript: str,
+    prompt: str,
+    stream: bool,
+    options: dict | None = None,
+    keep_alive: str | float | None = None,
+) -> bytes:
+    """Build the JSON body of an Ollama ``/api/generate`` request.
+
+    The instruction comes first and the transcript last, so requests for
+    different videos share a token prefix that Ollama can reuse from its KV
+    cache. No ``context`` is sent: every video starts a fresh conversation.
+    """
+    full_prompt = f"{prompt}\n\n{transcript}"
+    body: dict = {
+        "model": model,
+        "prompt": full_prompt,
+        "stream": stream,
+    }
+    if options:
+        body["options"] = options
+    if keep_alive is not None:
+        body["keep_alive"] = keep_alive
+    return json.dumps(body).encode("utf-8")
+
+
+def decode_stream_line(line: bytes) -> str:
+    """Return the token carried by one NDJSON line of a streamed response."""
+    if not line.strip():
+        return ""
+    chunk = json.loads(line)
+    if "error" in chunk:
+        raise SummarizationError(chunk["error"])
+    return chunk.get("response") or ""
+
+
 class OllamaSummarizer:
+    """Summarizer backed by Ollama's ``/api/generate``.
+
+    ``options`` are Ollama generation options (``num_ctx``, ``num_predict``,
+    ``temperature``, ...); ``keep_alive`` is how long the server keeps the
+    model loaded after a request (``"30m"``, or ``-1`` for ever).
+
+    Unless ``options`` fixes ``num_ctx``, setting ``max_context`` sizes
+    ``num_ctx`` per request to the prompt plus the expected response, so a
+    short transcript does not reserve a huge KV cache.
+    """
+
     def __init__(
         self,
         model: str = DEFAULT_MODEL,
-        base_url: str = "http://localhost:11434",
+        base_url: str = DEFAULT_OLLAMA_URL,
+        session: HTTPSession | None = None,
+        timeout: float = DEFAULT_OLLAMA_TIMEOUT,
+        options: dict | None = None,
+        keep_alive: str | float | None = None,
+        max_context: int | None = None,
     ):
         self._model = model
         self._base_url = base_url
+        self._session = session
+        self._timeout = timeout
+        self._options = dict(options or {})
+        self._keep_alive = keep_alive
+        self._max_context = max_context
 
     @property
     def model(self) -> str:
         return self._model
 
-    def summarize(self, transcript: str, prompt: str) -> str:
-        full_prompt = f"{prompt}\n\n{transcript}"
-        payload = json.dumps({
-            "model": self._model,
-            "prompt": full_prompt,
-            "stream": False,
-        }).encode("utf-8")
-
-        req = urllib.request.Request(
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+
+    @property
+    def options(self) -> dict:
+        return dict(self._options)
+
+    @property
+    def keep_alive(self) -> str | float | None:
+        return self._keep_alive
+
+    def request_options(self, prompt_tokens: int) -> dict:
+        """Generation options for a request whose prompt has ``prompt_tokens`` tokens."""
+        if self._max_context is None or "num_ctx" in self._options:
+            return self._options
+        response_tokens = self._options.get("num_predict", DEFAULT_RESPONSE_TOKENS)
+        if response_tokens < 0:
+            response_tokens = DEFAULT_RESPONSE_TOKENS
+        num_ctx = request_context(prompt_tokens, response_tokens, self._max_context)
+        return {**self._options, "num_ctx": num_ctx}
+
+    def ping(self, timeout: float = DEFAULT_PING_TIMEOUT) -> bool:
+        """Return whether the server answers ``GET /api/tags`` successfully."""
+        session = self._session or default_session()
+        try:
+            with session.request("GET", f"{self._base_url}/api/tags", timeout=timeout) as resp:
+                resp.read()
+        except Exception:
+            return False
+        return True
+
+    def warm_up(self, prompt: str | None = None, transcript_tokens: int = 0) -> None:
+        """Load the model and, given ``prompt``, evaluate the instruction prefix.
+
+        Sends the ``num_ctx`` a request with a transcript of
+        ``transcript_tokens`` would use (a different context size makes
+        Ollama reload the model) but generates a single token. Without
+        ``prompt`` the model is only loaded.
+        """
+        if prompt is None:
+            payload: dict = {"model": self._model}
+            if self._keep_alive is not None:
+                payload["keep_alive"] = self._keep_alive
+            body = json.dumps(payload).encode("utf-8")
+        else:
+            prompt_tokens = estimate_tokens(prompt) + transcript_tokens
+            options = {**self.request_options(prompt_tokens), "num_predict": 1}
+            body = encode_generate_request(
+                self._model, "", prompt, False, options, self._keep_alive
+            )
+        try:
+            with metrics.span("warm_up", model=self._model) as timing:
+                with self._generate(body) as resp:
+                    timing.set(**metrics.ollama_stats(json.loads(resp.read() or b"{}")))
+        except Exception as exc:
+            raise SummarizationError(f"Ollama warm-up failed: {exc}") from exc
+
+    def _generate(self, body: bytes) -> Response:
+        session = self._session or default_session()
+        return session.request(
+            "POST",
             f"{self._base_url}/api/generate",
-            data=payload,
+            body=body,
             headers={"Content-Type": "application/json"},
+            timeout=self._timeout,
+        )
+
+    def _post(self, transcript: str, prompt: str, stream: bool, options: dict) -> Response:
+        payload = encode_generate_request(
+            self._model, transcript, prompt, stream, options, self._keep_alive
         )
+        return self._generate(payload)
 
+    def _options_for(self, transcript: str, prompt: str) -> dict:
+        if self._max_context is None or "num_ctx" in self._options:
+            return self._options
+        return self.request_options(estimate_tokens(prompt) + estimate_tokens(transcript))
+
+    def summarize(self, transcript: str, prompt: str) -> str:
         try:
-            with urllib.request.urlopen(req) as resp:
-                body = json.loads(resp.read().decode("utf-8"))
+            options = self._options_for(transcript, prompt)
+            with metrics.span("summarize", model=self._model) as timing:
+                if "num_ctx" in options:
+                    timing.set(num_ctx=options["num_ctx"])
+                with self._post(transcript, prompt, False, options) as resp:
+                    body = json.loads(resp.read().decode("utf-8"))
+                timing.set(chars=len(body["response"]), **metrics.ollama_stats(body))
                 return body["response"]
         except Exception as exc:
             raise SummarizationError(
                 f"Ollama summarization failed: {exc}"
             ) from exc
+
+    def stream(self, transcript: str, prompt: str) -> Iterator[str]:
+        """Consume Ollama's NDJSON stream, yielding tokens as they arrive."""
+        try:
+            options = self._options_for(transcript, prompt)
+            with metrics.span("summarize", model=self._model) as timing:
+                if "num_ctx" in options:
+                    timing.set(num_ctx=options["num_ctx"])
+                with self._post(transcript, prompt, True, options) as resp:
+                    for line in resp.iter_lines():
+                        token = decode_stream_line(line)
+                        if token:
+                            yield token
+                        elif timing.recording and line.strip():
+                            # The closing object carries Ollama's timings.
+                            timing.set(**metrics.ollama_stats(json.loads(line)))
+        except Exception as exc:
+            raise SummarizationError(
+                f"Ollama summarization failed: {exc}"
+            ) from exc
+
+
+def summary_cache_key(
+    transcript: str,
+    prompt: str,
+    model: str | None,
+    options: dict | None = None,
+) -> str:
+    """Hash everything that determines a summary into a stable cache key."""
+    material = json.dumps(
+        {
+            "transcript": hashlib.sha256(transcript.encode("utf-8")).hexdigest(),
+            "model": model,
+            "prompt": prompt,
+            "options": options or {},
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class CachingSummarizer:
+    """Summarizer wrapper that reuses summaries from a ``SummaryStore``.
+
+    The key covers the transcript, prompt, and the wrapped summarizer's
+    ``model`` and ``options`` attributes (when it has them), except for
+    num_ctx, which differs between runs that produce the same summary.
+    """
+
+    def __init__(self, inner: Summarizer, store: SummaryStore, refresh: bool = False):
+        self._inner = inner
+        self._store = store
+        self._refresh = refresh
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def model(self) -> str | None:
+        return getattr(self._inner, "model", None)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def cache_key(self, transcript: str, prompt: str) -> str:
+        options = dict(getattr(self._inner, "options", None) or {})
+        # Chunks are sized to fit num_ctx, so it never changes a summary.
+        options.pop("num_ctx", None)
+        return summary_cache_key(transcript, prompt, self.model, options)
+
+    def close(self) -> None:
+        """Close the store, when it has anything to close."""
+        close = getattr(self._store, "close", None)
+        if close is not None:
+            close()
+
+    def summarize(self, transcript: str, prompt: str) -> str:
+        key = self.cache_key(transcript, prompt)
+        if not self._refresh:
+            cached = self._store.get(key)
+            if cached is not None:
+                with self._lock:
+                    self._hits += 1
+                return cached
+
+        with self._lock:
+            self._misses += 1
+        summary = self._inner.summarize(transcript, prompt)
+        self._store.put(key, summary)
+        return summary
+
+    def stream(self, transcript: str, prompt: str) -> Iterator[str]:
+        """Stream from the wrapped summarizer, or yield a cached summary whole."""
+        key = self.cache_key(transcript, prompt)
+        if not self._refresh:
+            cached = self._store.get(key)
+            if cached is not None:
+                with self._lock:
+                    self._hits += 1
+                yield cached
+                return
+
+        with self._lock:
+            self._misses += 1
+        if not isinstance(self._inner, StreamingSummarizer):
+            summary = self._inner.summarize(transcript, prompt)
+            self._store.put(key, summary)
+            yield summary
+            return
+
+        parts = []
+        for token in self._inner.stream(transcript, prompt):
+            parts.append(token)
+            yield token
+        self._store.put(key, "".join(parts))
@@ -0,0 +1,80 @@
+"""Token counting and context sizing.
+
+Counts default to a heuristic of about four characters per token, which is
+close for English with Llama-family tokenizers and costs one ``len``. An
+exact tokenizer can be plugged in process-wide with ``use_tokenizer``.
+"""
+
+from collections.abc import Callable
+from enum import Enum
+
+from .types import CleanedTranscript
+
+# Generation reserved in the context when no num_predict is set.
+DEFAULT_RESPONSE_TOKENS = 1024
+# Allowance for the model's chat template around the prompt.
+TEMPLATE_TOKENS = 64
+DEFAULT_MAX_CONTEXT = 8192
+# num_ctx is rounded up to a multiple of this so that similar requests
+# share a size; Ollama reloads the model whenever num_ctx changes.
+CONTEXT_STEP = 2048
+
+
+def _heuristic(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+_count: Callable[[str], int] = _heuristic
+
+
+def use_tokenizer(count: Callable[[str], int] | None) -> None:
+    """Count tokens with ``count(text)`` from now on; ``None`` restores the heuristic."""
+    global _count
+    _count = count or _heuristic
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count of ``text`` using the active tokenizer."""
+    return _count(text)
+
+
+def count_tokens(transcript: CleanedTranscript | str) -> int:
+    if isinstance(transcript, CleanedTranscript):
+        transcript = transcript.text
+    return _count(transcript)
+
+
+def context_window(tokens: int, limit: int = DEFAULT_MAX_CONTEXT) -> int:
+    """Smallest ``CONTEXT_STEP`` multiple holding ``tokens``, capped at ``limit``."""
+    steps = max(1, -(-tokens // CONTEXT_STEP))
+    return min(steps * CONTEXT_STEP, limit)
+
+
+def request_context(
+    prompt_tokens: int,
+    response_tokens: int = DEFAULT_RESPONSE_TOKENS,
+    limit: int = DEFAULT_MAX_CONTEXT,
+) -> int:
+    """num_ctx for a request of ``prompt_tokens`` expecting ``response_tokens`` back."""
+    return context_window(prompt_tokens + TEMPLATE_TOKENS + response_tokens, limit)
+
+
+class Strategy(Enum):
+    SINGLE = "single"
+    COMPRESSED = "compressed"
+    CHUNKED = "chunked"
+
+
+def choose_strategy(
+    tokens: int, single_tokens: int, compress_tokens: int | None = None
+) -> Strategy:
+    """Pick how to summarize a transcript of ``tokens`` tokens.
+
+    Transcripts within ``single_tokens`` go in one request. Longer ones are
+    compressed when a compression budget is given, otherwise map-reduced.
+    """
+    if tokens <= single_tokens:
+        return Strategy.SINGLE
+    if compress_tokens is not None:
+        return Strategy.COMPRESSED
+    return Strategy.CHUNKED
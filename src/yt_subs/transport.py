@@ -0,0 +1,290 @@
+"""Shared HTTP client with per-host keep-alive connection pools.
+
+Subtitle downloads and Ollama requests go through one thread-safe
+``HTTPSession`` so that repeated requests to the same host reuse TCP (and
+TLS) connections instead of paying a new handshake every time.
+"""
+
+import http.client
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from urllib.parse import urlsplit
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+DEFAULT_POOL_SIZE = 8
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Only these are retried: repeating a POST (an Ollama generation) could do
+# the work twice.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+_STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+CHUNK_SIZE = 64 * 1024
+
+_PoolKey = tuple[str, str, int]
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, status: int, reason: str, url: str, body: bytes = b""):
+        super().__init__(f"HTTP {status} {reason} for {url}")
+        self.status = status
+        self.reason = reason
+        self.url = url
+        self.body = body
+
+
+class ContentDecoder:
+    """Incremental gzip/deflate decoder for a response body."""
+
+    def __init__(self, encoding: str):
+        self._encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        else:
+            self._obj = zlib.decompressobj(zlib.MAX_WBITS)
+        self._started = False
+
+    def decompress(self, data: bytes) -> bytes:
+        if not self._started and data:
+            self._started = True
+            if self._encoding == "deflate":
+                try:
+                    return self._obj.decompress(data)
+                except zlib.error:
+                    # Some servers send raw deflate without the zlib header.
+                    self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class Response:
+    """A response whose connection returns to the pool once fully read."""
+
+    def __init__(
+        self,
+        session: "HTTPSession",
+        key: _PoolKey,
+        conn: http.client.HTTPConnection,
+        raw: http.client.HTTPResponse,
+    ):
+        self._session = session
+        self._key = key
+        self._conn: http.client.HTTPConnection | None = conn
+        self._raw = raw
+        encoding = (raw.getheader("Content-Encoding") or "").strip().lower()
+        self._decoder = ContentDecoder(encoding) if encoding in ("gzip", "deflate") else None
+        self._complete = False
+
+    @property
+    def status(self) -> int:
+        return self._raw.status
+
+    @property
+    def reason(self) -> str:
+        return self._raw.reason
+
+    def getheader(self, name: str, default: str | None = None) -> str | None:
+        return self._raw.getheader(name, default)
+
+    def iter_chunks(self, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the decoded body incrementally."""
+        try:
+            while True:
+                data = self._raw.read1(size)
+                if not data:
+                    self._complete = True
+                    break
+                if self._decoder is not None:
+                    data = self._decoder.decompress(data)
+                if data:
+                    yield data
+            if self._decoder is not None:
+                tail = self._decoder.flush()
+                if tail:
+                    yield tail
+        finally:
+            self.close()
+
+    def iter_lines(self) -> Iterator[bytes]:
+        """Yield the decoded body line by line, without line terminators."""
+        pending = b""
+        for chunk in self.iter_chunks():
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                yield line.removesuffix(b"\r")
+        if pending:
+            yield pending
+
+    def read(self) -> bytes:
+        return b"".join(self.iter_chunks())
+
+    def close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        self._raw.close()
+        if self._complete and not self._raw.will_close:
+            self._session._release(self._key, conn)
+        else:
+            conn.close()
+
+    def __enter__(self) -> "Response":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class HTTPSession:
+    """Thread-safe HTTP/1.1 client with keep-alive, retries and metrics.
+
+    Idle connections are kept per (scheme, host, port), at most
+    ``pool_size`` each. For idempotent methods, connection failures and
+    retryable statuses (429/5xx) are retried ``retries`` times with
+    exponential backoff.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ):
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff = backoff
+        self._pool_size = pool_size
+        self._pools: dict[_PoolKey, list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._reused = 0
+
+    @property
+    def connections_opened(self) -> int:
+        return self._opened
+
+    @property
+    def connections_reused(self) -> int:
+        return self._reused
+
+    def _acquire(
+        self, key: _PoolKey, timeout: float | None
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool:
+                self._reused += 1
+                conn = pool.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+            self._opened += 1
+
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout), False
+        return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+    def _release(self, key: _PoolKey, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            pool = self._pools.setdefault(key, [])
+            if len(pool) < self._pool_size:
+                pool.append(conn)
+                return
+        conn.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> Response:
+        """Send a request and return the response with its body unread.
+
+        Raises ``HTTPStatusError`` for 4xx/5xx responses left after retries,
+        and ``OSError``/``http.client.HTTPException`` for transport failures.
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+
+        request_headers = {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        request_headers.update(headers or {})
+        if timeout is None:
+            timeout = self._timeout
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        retries = self._retries if idempotent else 0
+
+        attempt = 0
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            sent = False
+            try:
+                conn.request(method, target, body=body, headers=request_headers)
+                sent = True
+                raw = conn.getresponse()
+            except (OSError, http.client.HTTPException) as exc:
+                conn.close()
+                if reused and isinstance(exc, _STALE_ERRORS) and (idempotent or not sent):
+                    # The server closed an idle keep-alive connection; this
+                    # is not a real failure, so it does not use up a retry.
+                    # A POST it may already have received is not resent.
+                    continue
+                if attempt >= retries:
+                    raise
+                time.sleep(self._backoff * 2**attempt)
+                attempt += 1
+                continue
+
+            response = Response(self, key, conn, raw)
+            if raw.status in RETRY_STATUSES and attempt < retries:
+                response.read()
+                time.sleep(self._backoff * 2**attempt)
+                attempt += 1
+                continue
+            if raw.status >= 400:
+                raise HTTPStatusError(raw.status, raw.reason, url, response.read())
+            return response
+
+    def close(self) -> None:
+        """Close all idle pooled connections."""
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            for conn in pool:
+                conn.close()
+
+
+_default_session: HTTPSession | None = None
+_default_lock = threading.Lock()
+
+
+def default_session() -> HTTPSession:
+    """Return the process-wide shared session, creating it on first use."""
+    global _default_session
+    if _default_session is None:
+        with _default_lock:
+            if _default_session is None:
+                _default_session = HTTPSession()
+    return _default_session
@@ -25,6 +25,7 @@ class SubtitleLanguage:
 class SubtitleContent:
     language: SubtitleLanguage
     raw_text: str
+    ext: str = "vtt"
 
 
 @dataclass(frozen=True)
@@ -33,6 +34,20 @@ class CleanedTranscript:
     text: str
 
 
+@dataclass(frozen=True)
+class BatchResult:
+    url: str
+    language_code: str | None = None
+    summary: str | None = None
+    error: str | None = None
+    # The failure would recur on a retry (e.g. the video has no subtitles).
+    permanent: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class YtSubsError(Exception):
     pass
 
@@ -49,11 +64,41 @@ class SummarizationError(YtSubsError):
     pass
 
 
+class ServerError(YtSubsError):
+    pass
+
+
+class ServerUnavailableError(ServerError):
+    pass
+
+
+# The "reason" a daemon's 404 carries when a video has no such subtitles.
+NO_SUBTITLES_REASON = "no-subtitles"
+
+
 DEFAULT_MODEL = "llama3"
 
+DEFAULT_OLLAMA_URL = "http://localhost:11434"
+
 DEFAULT_PREFERRED_LANGS = ("en", "fa", "fr", "nl", "es")
 
 DEFAULT_SUMMARIZATION_PROMPT = (
     "Summarize the following video transcript concisely. "
     "Include the key points and main takeaways:"
 )
+
+DEFAULT_TIMESTAMPED_PROMPT = (
+    "Summarize the following video transcript concisely. Each line starts "
+    "with its [m:ss] time. Include the key points and main takeaways, "
+    "citing the time where each is discussed:"
+)
+
+DEFAULT_CHUNK_PROMPT = (
+    "The following is one part of a longer video transcript. "
+    "Summarize this part concisely, keeping every key point:"
+)
+
+DEFAULT_REDUCE_PROMPT = (
+    "The following are summaries of consecutive parts of one video. "
+    "Merge them into a single concise summary, keeping every key point:"
+)
@@ -7,6 +7,14 @@ from yt_subs.types import SubtitleFormat, SubtitleLanguage, SubtitleSource
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep on-disk caches out of the user's home directory."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("YT_SUBS_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
 @pytest.fixture
 def sample_vtt_text() -> str:
     return (FIXTURES_DIR / "sample.vtt").read_text()
@@ -0,0 +1,27 @@
+Feature: Async pipeline
+  As a developer embedding yt-subs in an asyncio service
+  I want non-blocking counterparts of the pipeline
+  So that many videos run concurrently without a thread per request
+
+  Scenario: Fetch subtitles asynchronously over keep-alive connections
+    Given a local server hosting subtitles and an Ollama API
+    When I fetch the subtitle content asynchronously 3 times
+    Then the content should match the hosted subtitles
+    And the async session should have opened 1 connection
+
+  Scenario: Stream a summary asynchronously
+    Given a local server hosting subtitles and an Ollama API
+    When I stream a summary with the async Ollama summarizer
+    Then the tokens should join to the hosted summary
+
+  Scenario: Run many videos under a concurrency limit
+    Given a local server hosting subtitles and an Ollama API
+    When I run an async batch of 20 videos with concurrency 4
+    Then all 20 videos should be summarized
+    And no more than 4 summaries should have run at once
+
+  Scenario: Stopping early cancels the videos in flight
+    Given a local server hosting subtitles and an Ollama API
+    When I take 5 results from an async batch of endless videos with concurrency 4
+    Then at most 9 video URLs should have been read
+    And every video still in flight should have been cancelled before the batch closed
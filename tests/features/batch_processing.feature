@@ -0,0 +1,24 @@
+Feature: Batch processing
+  As a user with many videos to process
+  I want URLs processed concurrently
+  So that large batches finish quickly
+
+  Scenario: Summarize several videos concurrently
+    Given 5 videos with English subtitles
+    When I run the batch with 3 I/O workers and 2 summary workers
+    Then I should get 5 successful results
+    And every video should be summarized exactly once
+
+  Scenario: A failing video does not stop the batch
+    Given 3 videos with English subtitles
+    And a video whose metadata extraction fails
+    When I run the batch with 2 I/O workers and 1 summary workers
+    Then I should get 3 successful results
+    And the failing video should be reported with an error
+
+  Scenario: Batch mode reads URLs from a file
+    Given 3 videos with English subtitles
+    And a file listing the video URLs
+    When I run the CLI with "-l en" and the URL file
+    Then the exit code should be 0
+    And the output should contain one JSON line per video
@@ -0,0 +1,47 @@
+Feature: Cleaning subtitle archives on a process pool
+  As a user cleaning thousands of archived subtitle files
+  I want the work spread over every CPU
+  So that cleaning is not bound to a single core
+
+  Scenario: Paths and contents come back cleaned in input order
+    Given 10 sample subtitles, alternating files and in-memory contents
+    When I clean them all on 2 processes in chunks of 3
+    Then each transcript should match cleaning that input alone, in order
+
+  Scenario: Inputs are sent to the workers in chunks
+    Given 10 sample subtitles, alternating files and in-memory contents
+    When I clean them all in chunks of 4 on a recording pool
+    Then the pool should have received chunks of 4, 4 and 2
+
+  Scenario: Files are read through a memory map
+    Given an empty subtitle file and one starting with a byte order mark
+    When I clean them all on 2 processes in chunks of 1
+    Then the empty file should give an empty transcript
+    And the byte order mark should not reach the transcript
+
+  Scenario: The first input that fails raises its error
+    Given 10 sample subtitles, alternating files and in-memory contents
+    And a malformed json3 file among them
+    Then cleaning them all on 2 processes should raise "Malformed json3 subtitles"
+
+  Scenario: The clean subcommand prints one JSON line per file in order
+    Given 10 sample subtitles, alternating files and in-memory contents
+    When I run "clean -j 2" on their directory
+    Then the exit code should be 0
+    And the output should list every file in sorted order with its transcript
+
+  Scenario: The clean subcommand writes transcripts to a directory
+    Given 10 sample subtitles, alternating files and in-memory contents
+    When I run "clean -j 2 -o" on their directory
+    Then the exit code should be 0
+    And the output directory should hold one transcript per file
+
+  Scenario: Files sharing a name in different directories keep their paths
+    Given "a/talk.en.vtt" and "b/talk.en.vtt" in the archive
+    When I run "clean -j 1 -o" on their directory
+    Then the exit code should be 0
+    And the output directory should hold "a/talk.en.txt" and "b/talk.en.txt"
+
+  Scenario: Files that would be written to the same name are rejected
+    Given "talk.en.vtt" and "talk.en.srt" in the archive
+    Then running "clean -o" on their directory should fail with "would both be written to"
@@ -0,0 +1,22 @@
+Feature: Chunked summarization
+  As a user summarizing multi-hour videos
+  I want long transcripts summarized in parallel chunks and merged
+  So that they fit the model context and finish quickly
+
+  Scenario: Chunks respect the token budget and overlap
+    Given a transcript of 200 caption lines
+    When I split it into chunks of 100 tokens with 20 tokens of overlap
+    Then every chunk should fit in 100 tokens
+    And consecutive chunks should share at least one line
+    And every caption line should appear in some chunk
+
+  Scenario: A short transcript is summarized in one request
+    Given a transcript of 3 caption lines
+    When I summarize it with a chunk budget of 100 tokens
+    Then the backends should have received 1 request
+
+  Scenario: A long transcript is map-reduced across backends
+    Given a transcript of 200 caption lines
+    When I summarize it with a chunk budget of 100 tokens across 2 backends
+    Then both backends should have received chunk requests
+    And the final request should use the original prompt
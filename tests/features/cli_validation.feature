@@ -13,6 +13,7 @@ Feature: CLI argument validation
     When I run the CLI with "-l en" and a URL
     Then the exit code should be 0
     And the summarizer should use model "llama3"
+    And the output should contain "A brief welcome and test video."
 
   Scenario: Custom model via environment variable
     Given a video with available subtitles
@@ -30,3 +31,16 @@ Feature: CLI argument validation
     When I run the CLI with no -l flag and a URL
     Then the exit code should be 1
     And the error output should contain "no subtitles available"
+
+  Scenario: Ollama generation options from the command line
+    Given a video with available subtitles
+    When I run the CLI on a URL with "--keep-alive -1 --num-ctx 4096 --option temperature=0.2"
+    Then the exit code should be 0
+    And the summarization request should keep the model loaded for ever
+    And the summarization request should carry options num_ctx=4096 and temperature=0.2
+
+  Scenario: Timestamped transcripts from the command line
+    Given a video with available subtitles
+    When I run the CLI on a URL with "--timestamps"
+    Then the exit code should be 0
+    And the summarization request should send "[0:03] This is a test" with the timestamped prompt
@@ -0,0 +1,23 @@
+Feature: Extractive compression
+  As a user summarizing long videos on a small GPU
+  I want transcripts cut down to their most informative sentences first
+  So that the model processes a fraction of the input tokens
+
+  Scenario: A long transcript is cut to the token budget
+    Given a transcript of 400 filler lines with 5 informative lines
+    When I compress it to 100 tokens
+    Then the result should fit in 100 tokens
+    And the informative lines should be kept in their original order
+    And the compression ratio should be at least 3
+
+  Scenario: A transcript within the budget is left alone
+    Given a transcript of 3 filler lines with 1 informative lines
+    When I compress it to 1000 tokens
+    Then the result should be the original transcript
+
+  Scenario: The compressing summarizer sends the shortened transcript
+    Given a transcript of 400 filler lines with 5 informative lines
+    And metrics recorded as JSON lines
+    When I summarize it through a compressing summarizer with a budget of 100 tokens
+    Then the backend should receive at most 100 tokens
+    And a "compress" span should report the token counts
@@ -0,0 +1,50 @@
+Feature: HTTP transport
+  As a user running large batches
+  I want HTTP connections pooled and reused
+  So that handshakes do not dominate small requests
+
+  Scenario: Keep-alive connections are reused
+    Given a local HTTP server
+    When I make 5 sequential requests with one session
+    Then the session should have opened 1 connection
+    And the session should have reused 4 connections
+
+  Scenario: Gzip responses are decoded transparently
+    Given a local HTTP server
+    When I request a gzip-encoded resource
+    Then I should get the decoded body
+
+  Scenario: Transient server errors are retried
+    Given a local HTTP server
+    When I request a resource that fails once with 503
+    Then I should get the body after 2 attempts
+
+  Scenario: A POST that fails with 503 is not retried
+    Given a local HTTP server
+    When I post to a resource that fails once with 503
+    Then an HTTPStatusError with status 503 should be raised
+    And the server should have seen 1 request
+
+  Scenario: An async POST that fails with 503 is not retried
+    Given a local HTTP server
+    When I post asynchronously to a resource that fails once with 503
+    Then an HTTPStatusError with status 503 should be raised
+    And the server should have seen 1 request
+
+  Scenario: A POST dropped before its response is not resent
+    Given a local HTTP server
+    When I post on a kept-alive connection to a resource that drops it
+    Then the request should fail with a connection error
+    And the server should have seen 1 request to "/drop"
+
+  Scenario: An async POST dropped before its response is not resent
+    Given a local HTTP server
+    When I post asynchronously on a kept-alive connection to a resource that drops it
+    Then the request should fail with a connection error
+    And the server should have seen 1 request to "/drop"
+
+  Scenario: Client errors are raised without retrying
+    Given a local HTTP server
+    When I request a missing resource
+    Then an HTTPStatusError with status 404 should be raised
+    And the server should have seen 1 request
@@ -0,0 +1,39 @@
+Feature: Metadata cache
+  As a user processing videos repeatedly
+  I want subtitle metadata cached on disk by video ID
+  So that yt-dlp extraction only runs when needed
+
+  Scenario Outline: Recognize the video ID in any URL form
+    When I extract the video ID from "<url>"
+    Then the video ID should be "<video_id>"
+
+    Examples:
+      | url                                                  | video_id    |
+      | https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42     | dQw4w9WgXcQ |
+      | https://youtu.be/dQw4w9WgXcQ?si=abc                  | dQw4w9WgXcQ |
+      | https://youtube.com/shorts/dQw4w9WgXcQ               | dQw4w9WgXcQ |
+      | https://m.youtube.com/embed/dQw4w9WgXcQ              | dQw4w9WgXcQ |
+      | dQw4w9WgXcQ                                          | dQw4w9WgXcQ |
+
+  Scenario: Repeated lookups are served from the cache
+    Given a metadata cache
+    When I list languages for the same video twice via different URLs
+    Then yt-dlp should have been called 1 time
+    And both results should be identical
+
+  Scenario: Refresh bypasses the cache
+    Given a metadata cache
+    When I list languages twice, refreshing the second time
+    Then yt-dlp should have been called 2 times
+
+  Scenario: Expired signed subtitle URLs trigger re-extraction
+    Given a metadata cache
+    And a video whose subtitle URLs have already expired
+    When I list languages for the same video twice via different URLs
+    Then yt-dlp should have been called 2 times
+
+  Scenario: The cache is bounded with LRU eviction
+    Given a metadata cache holding at most 2 entries
+    When I cache languages for 3 videos after reading back the first one
+    Then the cache should hold 2 entries
+    And the second video should have been evicted
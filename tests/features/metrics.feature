@@ -0,0 +1,28 @@
+Feature: Stage metrics
+  As a user tuning the pipeline
+  I want per-stage timings and sizes
+  So that I can see whether extraction, download, cleaning or the model is slow
+
+  Scenario: Instrumentation is a no-op while metrics are disabled
+    When I open spans without enabling metrics
+    Then every span should be the shared no-op span
+
+  Scenario: JSON lines report every stage with Ollama's timings
+    Given a video with English subtitles and an Ollama server reporting eval statistics
+    When I run the CLI with "--metrics jsonl"
+    Then the exit code should be 0
+    And the metrics should include the stages "list_languages, download, transcript, summarize"
+    And the download stage should report the format and bytes downloaded
+    And the transcript stage should report line and character counts
+    And the summarize stage should report Ollama's eval statistics
+
+  Scenario: Prometheus output aggregates stages at exit
+    Given a video with English subtitles and an Ollama server reporting eval statistics
+    When I run the CLI with "--metrics prometheus"
+    Then the exit code should be 0
+    And the metrics text should count 1 "summarize" stage
+    And the metrics text should total 42 "eval_count" for "summarize"
+
+  Scenario: A metrics file that cannot be opened is a usage error
+    When I run the CLI with "--metrics jsonl" writing metrics into a directory
+    Then the command should fail with "cannot open --metrics-file"
@@ -0,0 +1,35 @@
+Feature: Several languages in one run
+  As a user following videos in several languages
+  I want one run to summarize every language I ask for
+  So that metadata is extracted once and downloads run side by side
+
+  Scenario: A comma-separated list summarizes each language
+    Given a video with subtitles in several languages
+    When I run the CLI with "-l en,fr" on the video
+    Then the exit code should be 0
+    And the output should have summaries for "en" and "fr"
+    And the video metadata should have been extracted once
+    And the "en" and "fr" subtitles should have been downloaded
+
+  Scenario: Every preferred language is written to its own file
+    Given a video with subtitles in several languages
+    When I run the CLI with "--all-preferred" and an output directory
+    Then the exit code should be 0
+    And the output directory should hold a summary for each of "en, fa, fr, nl, es"
+
+  Scenario: An output directory without -l asks for the language
+    Given a video with subtitles in several languages
+    When I choose language 2 from the menu and run the CLI with an output directory
+    Then the exit code should be 0
+    And the output directory should hold a summary for each of "fr"
+
+  Scenario: A missing language is reported without stopping the others
+    Given a video with subtitles in several languages
+    When I run the CLI with "-l en,xx" on the video
+    Then the exit code should be 1
+    And the output should have a summary for "en"
+    And the error output should mention "no subtitles found for language 'xx'"
+
+  Scenario: Several languages need a single video
+    When I run the CLI with "-l en,fr" on two videos
+    Then the command should fail with "need a single video URL"
@@ -0,0 +1,59 @@
+Feature: Playlist and channel sync
+  As a user tracking whole channels and playlists
+  I want only newly uploaded videos processed on each run
+  So that re-syncing an unchanged channel is cheap
+
+  Scenario: A channel is expanded with flat extraction
+    Given a channel with 3 videos on its videos tab and 2 on its shorts tab
+    When I list the channel's video IDs
+    Then I should get all 5 video IDs in listing order
+    And no video should have been resolved individually
+
+  Scenario: Sync processes only videos not seen before
+    Given a channel with 4 videos on its videos tab and 0 on its shorts tab
+    And a sync state in which the 2 oldest videos are already processed
+    When I run "sync -l en" on the channel
+    Then the exit code should be 0
+    And only the 2 newest videos should be summarized
+    And the sync state should list all 4 videos
+
+  Scenario: An unchanged large channel stops listing early
+    Given a channel with 5000 videos on its videos tab and 0 on its shorts tab
+    And a sync state in which every video is already processed
+    When I look for new videos in the channel
+    Then no new videos should be found
+    And only the first 50 entries should have been listed
+
+  Scenario: A new short is found after a long run of known videos
+    Given a channel with 60 videos on its videos tab and 2 on its shorts tab
+    And a sync state in which every video on the videos tab is already processed
+    When I look for new videos in the channel
+    Then the 2 shorts should be found
+    And only the first 52 entries should have been listed
+
+  Scenario: Videos appended to a playlist are found past a long run of known ones
+    Given a playlist of 120 videos
+    And a sync state in which the first 100 playlist videos are processed
+    When I look for new videos in the playlist
+    Then the last 20 playlist videos should be found
+    And only the first 120 entries should have been listed
+
+  Scenario: A video without subtitles is recorded and not extracted again
+    Given a channel with 3 videos on its videos tab and 0 on its shorts tab
+    And video 1 of the channel has no subtitles
+    And an empty sync state
+    When I run "sync -l en" on the channel
+    Then the exit code should be 1
+    And video 1 should be recorded as failed in the sync state
+    When I run "sync -l en" on the channel again
+    Then the exit code should be 0
+    And no video should have been extracted
+
+  Scenario: A sync state that cannot be written does not stop the sync
+    Given a channel with 2 videos on its videos tab and 0 on its shorts tab
+    And a sync state in a directory that cannot be created
+    When I run "sync -l en" on the channel, saving after every video
+    Then the exit code should be 1
+    And every video should have been summarized
+    And the error output should mention "failed to write sync state"
+    And the error output should not mention "failed to read URLs"
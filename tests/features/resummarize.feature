@@ -0,0 +1,46 @@
+Feature: Re-summarizing saved subtitle files
+  As a user with an archive of downloaded subtitle files
+  I want to clean and summarize them again in bulk
+  So that a new model or prompt does not mean downloading everything again
+
+  Scenario: A directory is cleaned on several processes in order
+    Given an archive with VTT and SRT subtitle files and a note
+    When I clean the archive on 2 processes
+    Then every subtitle file should be cleaned, in sorted order
+    And the note should have been skipped
+
+  Scenario: The language comes from the file name unless given
+    Given an archive with VTT and SRT subtitle files and a note
+    When I clean the archive on 2 processes
+    Then "talk.en.vtt" should be cleaned as "en" and "intro.srt" as "und"
+    And cleaning "talk.en.vtt" with language "fr" should give "fr"
+
+  Scenario: A malformed file is reported without stopping the others
+    Given an archive with VTT and SRT subtitle files and a note
+    And a malformed "broken.en.json3" file in the archive
+    When I re-summarize the archive
+    Then "broken.en.json3" should fail with "Malformed json3 subtitles"
+    And every other subtitle file should have been summarized
+
+  Scenario: Summaries are requested concurrently
+    Given an archive of 6 VTT subtitle files
+    When I re-summarize the archive with 3 summary workers
+    Then 3 summaries should have been requested at once
+
+  Scenario: The CLI re-summarizes an archive without contacting YouTube
+    Given an archive with VTT and SRT subtitle files and a note
+    When I run "resummarize" on the archive
+    Then the exit code should be 0
+    And there should be one JSON line per subtitle file
+    And neither yt-dlp nor the subtitle host should have been contacted
+
+  Scenario: The CLI writes one summary file per subtitle file
+    Given an archive with VTT and SRT subtitle files and a note
+    When I run "resummarize" on the archive with "-o" a summaries directory
+    Then the exit code should be 0
+    And the summaries directory should hold "talk.en.txt" and "intro.txt"
+
+  Scenario: Summary files that would share a name are rejected
+    Given an archive with VTT and SRT subtitle files and a note
+    And "talk.en.srt" next to "talk.en.vtt" in the archive
+    Then running "resummarize -o" on the archive should fail with "would both be written to"
@@ -0,0 +1,48 @@
+Feature: Daemon mode
+  As a user running yt-subs many times a day
+  I want a warm background process to do the work
+  So that each invocation skips startup and extractor initialization
+
+  Scenario: The daemon summarizes a video
+    Given a running yt-subs daemon
+    When a client asks the daemon to summarize a video in "en"
+    Then the client should receive the summary
+    And the daemon should have extracted metadata once
+
+  Scenario: Identical concurrent requests share one computation
+    Given a running yt-subs daemon with a slow summarizer
+    When 5 clients ask for the same video at once
+    Then every client should receive the summary
+    And the summarizer should have run once
+
+  Scenario: A missing language is reported as no subtitles
+    Given a running yt-subs daemon
+    When a client asks the daemon to summarize a video in "xx"
+    Then the client should get a NoSubtitlesAvailableError
+
+  Scenario: The CLI talks to a running daemon
+    Given a running yt-subs daemon
+    When I run the CLI with "-l en" and the daemon's URL
+    Then the exit code should be 0
+    And the CLI should print the daemon's summary
+
+  Scenario: The CLI falls back when the daemon is not running
+    Given a video with English subtitles and no daemon
+    When I run the CLI with "-l en" and the daemon's URL
+    Then the exit code should be 0
+    And the error output should mention that the server is not reachable
+    And the CLI should print the local summary
+
+  Scenario: The CLI reports a daemon that drops the connection
+    Given a daemon that drops every connection without answering
+    When I run the CLI with "-l en" and the daemon's URL
+    Then the exit code should be 1
+    And the error output should mention "yt-subs server at"
+    And the CLI should not have processed the video locally
+
+  Scenario: A 404 that is not about subtitles is reported as a server error
+    Given a server that is not a yt-subs daemon
+    When I run the CLI with "-l en" and the daemon's URL
+    Then the exit code should be 1
+    And the error output should mention "HTTP 404"
+    And the CLI should not have processed the video locally
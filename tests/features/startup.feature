@@ -0,0 +1,22 @@
+Feature: Startup cost
+  As a user running yt-subs from scripts and other services
+  I want heavy dependencies loaded only when they are used
+  So that --help and library imports start quickly
+
+  Scenario Outline: Importing an entry point skips heavy dependencies
+    When I import "<module>" in a fresh interpreter
+    Then yt_dlp, asyncio, sqlite3 and http.server should not be loaded
+
+    Examples:
+      | module           |
+      | yt_subs          |
+      | yt_subs.cleaning |
+      | yt_subs.cli      |
+
+  Scenario: The package still exports its public API
+    When I import "yt_subs" in a fresh interpreter
+    Then every name in __all__ should resolve
+
+  Scenario: CLI import time stays within budget
+    When I measure the import time of "yt_subs.cli"
+    Then it should be under the startup budget
@@ -45,3 +45,33 @@ Feature: Subtitle cleaning
     And the result should contain "Today we will talk about Nix"
     And the result should contain "Nix is a powerful package manager"
     And the result should contain "It provides reproducible builds"
+
+  Scenario: VTT output matches the reference transcript exactly
+    Given a VTT subtitle file
+    When I clean the subtitle content
+    Then the result should equal the fixture "sample_vtt.clean.txt"
+
+  Scenario: SRT output matches the reference transcript exactly
+    Given an SRT subtitle file
+    When I clean the subtitle content
+    Then the result should equal the fixture "sample_srt.clean.txt"
+
+  Scenario: Merge karaoke growth and rolling overlap
+    Given a roll-up VTT subtitle file
+    When I clean the subtitle content
+    Then the result should equal "welcome back to the channel today we|look at flakes|and how they pin inputs"
+
+  Scenario: Keep a line repeated far apart
+    Given subtitle lines where "la la la" repeats after 20 other lines
+    When I clean the lines with a dedup window of 16
+    Then "la la la" should appear exactly 2 time
+
+  Scenario: Drop a line repeated within the window
+    Given subtitle lines where "la la la" repeats after 3 other lines
+    When I clean the lines with a dedup window of 16
+    Then "la la la" should appear exactly 1 time
+
+  Scenario: A line starting with part of the previous word is not karaoke growth
+    Given the subtitle lines "No|Nobody came to the party"
+    When I clean the lines with a dedup window of 16
+    Then the result should equal "No|Nobody came to the party"
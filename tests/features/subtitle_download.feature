@@ -18,3 +18,8 @@ Feature: Subtitle download
     Given a language with a VTT format URL
     When I fetch the subtitle content
     Then I should get the raw VTT text
+
+  Scenario: Stream and clean subtitles without holding the whole file
+    Given a language with a VTT format URL
+    When I download and clean the subtitles in 7-byte chunks
+    Then the transcript should match cleaning the whole file at once
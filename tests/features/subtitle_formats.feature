@@ -0,0 +1,41 @@
+Feature: Subtitle formats
+  As a user summarizing videos in bulk
+  I want every YouTube caption format understood and the cheapest one fetched
+  So that transcripts are right whatever the video offers, with the least work
+
+  Scenario Outline: Every structured format gives the same transcript as VTT
+    Given the sample captions as <ext>
+    When I clean them
+    Then the transcript should match the cleaned sample VTT
+
+    Examples:
+      | ext   |
+      | json3 |
+      | srv1  |
+      | srv2  |
+      | srv3  |
+      | ttml  |
+
+  Scenario: Structured formats keep cue times
+    Given the sample captions as srv3
+    When I parse their cues
+    Then the cue "Nix is a powerful package manager" should start at 9.0 seconds
+
+  Scenario: TTML line breaks and doubly escaped entities
+    Given a TTML paragraph "Fish &amp; chips<br/>it&amp;#39;s <span>good</span>"
+    When I clean them
+    Then the transcript should be "Fish & chips" and "it's good"
+
+  Scenario: The cheapest offered format is fetched
+    Given a language offering json3, vtt, srv3 and srv1
+    Then the selected format should be "srv1"
+    And with "vtt" preferred the selected format should be "vtt"
+
+  Scenario: Unknown formats fall back to the first one offered
+    Given a language offering rtt and sbv
+    Then the selected format should be "rtt"
+
+  Scenario: A malformed document is a download error
+    Given a json3 document cut off halfway
+    When I try to clean it
+    Then it should fail with a subtitle download error mentioning "json3"
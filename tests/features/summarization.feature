@@ -18,3 +18,24 @@ Feature: Summarization
     Given a transcript and a failing Ollama server
     When I attempt to summarize the transcript
     Then a SummarizationError should be raised
+
+  Scenario: Stream the summary as tokens arrive
+    Given a transcript and the default model
+    When I stream the summary of the transcript
+    Then the summarization request should ask for a stream
+    And the tokens should arrive in order and join to the summary text
+
+  Scenario: Send generation options and keep_alive with every request
+    Given a transcript and a model kept loaded for "30m" with a 8192-token context
+    When I summarize the transcript
+    Then the summarization request should keep the model loaded for "30m"
+    And the summarization request should set option "num_ctx" to 8192
+    And the summarization request should start with the instruction prompt
+
+  Scenario: Warm up the model and the instruction prefix
+    Given a transcript and a model kept loaded for "30m" with a 8192-token context
+    When I warm up the summarizer
+    Then the summarization request should keep the model loaded for "30m"
+    And the summarization request should set option "num_ctx" to 8192
+    And the summarization request should set option "num_predict" to 1
+    And the summarization request should start with the instruction prompt
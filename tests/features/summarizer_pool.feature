@@ -0,0 +1,44 @@
+Feature: Load-balanced summarizer pool
+  As a user running several Ollama hosts
+  I want summaries spread across them with failing hosts skipped
+  So that throughput grows with each host and one outage does not fail a batch
+
+  Scenario: Concurrent requests are spread over the least busy backends
+    Given a pool of 4 backends that each take 50 ms per request
+    When 8 summaries are requested concurrently
+    Then every backend should have served 2 requests
+
+  Scenario: Weighted round-robin follows the weights
+    Given a round-robin pool of backends weighted 3 and 1
+    When 8 summaries are requested one after another
+    Then the backends should have served 6 and 2 requests
+
+  Scenario: A failing backend is retried elsewhere and taken out of rotation
+    Given a pool where the first of 2 backends always fails
+    When 6 summaries are requested one after another
+    Then all 6 summaries should succeed
+    And the failing backend should have been tried 3 times
+    And the failing backend's circuit should be open
+
+  Scenario: A tripped backend rejoins once its health check passes
+    Given a pool where the first of 2 backends always fails
+    And 6 summaries have been requested
+    When the failing backend recovers and the cooldown passes
+    And 2 summaries are requested one after another
+    Then the recovered backend should have served a request
+    And the failing backend's circuit should be closed
+
+  Scenario: Streaming fails over before the first token
+    Given a pool where the first of 2 backends always fails
+    When a summary is streamed
+    Then the stream should come from the second backend
+
+  Scenario: Every backend failing is reported as a summarization error
+    Given a pool where all 2 backends fail
+    When a summary is requested
+    Then a summarization error naming both backends should be raised
+
+  Scenario: Throughput scales with the number of backends
+    Given 8 concurrent summaries on 1 backend taking 50 ms each
+    When the same summaries run on 4 such backends
+    Then they should finish at least 3 times faster
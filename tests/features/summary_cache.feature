@@ -0,0 +1,44 @@
+Feature: Summary cache
+  As a user re-running summaries over processed videos
+  I want summaries cached by transcript, model and prompt
+  So that repeated runs skip LLM generation
+
+  Scenario: A repeated summary is served from the cache
+    Given a caching summarizer backed by SQLite
+    When I summarize the same transcript twice
+    Then the model should have been called 1 time
+    And the cache should report 1 hit and 1 miss
+
+  Scenario: A different prompt is a cache miss
+    Given a caching summarizer backed by SQLite
+    When I summarize the same transcript with two different prompts
+    Then the model should have been called 2 times
+    And the cache should report 0 hits and 2 misses
+
+  Scenario: Cached summaries survive a restart
+    Given a caching summarizer backed by SQLite
+    When I summarize a transcript and reopen the cache
+    And I summarize the same transcript again
+    Then the model should have been called 1 time
+
+  Scenario: A summary store that fails is skipped
+    Given a caching summarizer backed by SQLite
+    And the SQLite store has failed
+    When I summarize the same transcript twice
+    Then the model should have been called 2 times
+    And a warning should mention "failed to cache summary"
+
+  Scenario: The CLI runs without a summary cache it cannot open
+    Given a cache directory that is a file
+    When the CLI builds its summarizer
+    Then the summarizer should not cache summaries
+    And the error output should mention "summary cache unavailable"
+
+  Scenario: A single-video run opens one summary cache and closes it
+    When I run the CLI on a single video counting summary caches
+    Then the CLI should have opened 1 summary cache
+    And every summary cache the CLI opened should have been closed
+
+  Scenario: A single video and a batch share cached summaries
+    When the CLI builds its summarizers for a batch and for a short single video
+    Then both summarizers should use the same cache key
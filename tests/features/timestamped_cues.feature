@@ -0,0 +1,38 @@
+Feature: Timestamped cues
+  As a user summarizing long videos
+  I want cue start and end times kept alongside the cleaned text
+  So that summaries can cite timestamps and transcripts can be cut by time
+
+  Scenario: Cue text matches the cleaned transcript
+    Given the sample VTT subtitle
+    When I parse its cues
+    Then the cue text should equal the cleaned transcript
+    And the first cue should run from 0.0 to 3.0 seconds
+
+  Scenario: A caption repeated by rolling cues keeps its whole time span
+    Given the sample VTT subtitle
+    When I parse its cues
+    Then the cue "Today we will talk about Nix" should run from 3.0 to 9.0 seconds
+
+  Scenario: Caption text containing an arrow is not a cue timing line
+    Given a VTT subtitle whose caption text contains "go left --> right"
+    When I parse its cues
+    Then the cue text should equal the cleaned transcript
+    And the timestamped text should start with "[0:01] then stop"
+    And parsing it as a "vtt" track should give the same timestamped text
+
+  Scenario: Cues overlapping a time range
+    Given the sample VTT subtitle
+    When I parse its cues
+    And I take the cues between 4.0 and 10.0 seconds
+    Then the slice should hold "Today we will talk about Nix" and "Nix is a powerful package manager"
+
+  Scenario: Cues are split into segments at long pauses
+    Given cues at 0, 2, 4, 30, 32 and 90 seconds lasting 2 seconds each
+    When I split them at gaps of 10 seconds
+    Then there should be 3 segments of 3, 2 and 1 cues
+
+  Scenario: Timestamped text cites each cue's start time
+    Given cues at 0, 2, 4, 30, 32 and 90 seconds lasting 2 seconds each
+    Then the timestamped text should start with "[0:00] cue 0"
+    And the timestamped text should end with "[1:30] cue 5"
@@ -0,0 +1,47 @@
+Feature: Token budgets
+  As a user summarizing videos of any length
+  I want transcripts measured before anything is sent to the model
+  So that nothing is silently truncated and short videos stay cheap
+
+  Scenario: A cleaned transcript is counted with the default estimate
+    Given a cleaned transcript of 400 characters
+    When I count its tokens
+    Then the count should be 100
+
+  Scenario: A plugged-in tokenizer replaces the estimate
+    Given a cleaned transcript of 400 characters
+    And a tokenizer counting one token per word
+    When I count its tokens
+    Then the count should be the number of words
+
+  Scenario Outline: Each request sets num_ctx to fit its prompt
+    Given a summarizer allowed a context of at most 8192 tokens
+    When I summarize a transcript of <tokens> tokens
+    Then the request should set num_ctx to <num_ctx>
+
+    Examples:
+      | tokens | num_ctx |
+      | 100    | 2048    |
+      | 4000   | 6144    |
+      | 20000  | 8192    |
+
+  Scenario Outline: The strategy is chosen from the token count
+    Given a chunked summarizer with a 1000-token chunk budget and <compress> compression
+    When I plan a transcript of <tokens> tokens
+    Then the strategy should be "<strategy>"
+
+    Examples:
+      | tokens | compress | strategy   |
+      | 800    | no       | single     |
+      | 5000   | no       | chunked    |
+      | 5000   | 500-token | compressed |
+
+  Scenario: Every request of a chunked run shares one num_ctx
+    Given the summarizer the CLI builds for a run
+    When I warm it up and summarize a transcript of 20000 tokens
+    Then every request should set num_ctx to 6144
+
+  Scenario: A single video that fits one request is sized for it
+    Given the summarizer the CLI builds for a single video of 100 tokens
+    When I summarize a transcript of 100 tokens
+    Then the request should set num_ctx to 2048
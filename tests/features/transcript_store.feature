@@ -0,0 +1,87 @@
+Feature: Transcript store
+  As a user with a growing archive of summarized videos
+  I want every transcript kept compressed and indexed on disk
+  So that I can search them and re-summarize without downloading again
+
+  Scenario: A stored transcript comes back with its raw subtitles
+    Given an empty transcript store
+    When I store the sample transcript of "vid00000001" in "en"
+    Then the store should return the same transcript for "vid00000001" in "en"
+    And the store should return the raw VTT subtitles for "vid00000001" in "en"
+
+  Scenario: Manual subtitles are preferred over auto captions
+    Given an empty transcript store
+    When I store "auto words" as auto captions of "vid00000001" in "en"
+    And I store "manual words" as manual subtitles of "vid00000001" in "en"
+    Then the store should return "manual words" for "vid00000001" in "en"
+
+  Scenario: Searching ranks matches and cuts snippets
+    Given a transcript store with three talks
+    When I search for "reproducible builds"
+    Then the first hit should be "nix00000001"
+    And its snippet should contain "reproducible builds"
+    And "rust0000001" should not be among the hits
+
+  Scenario: A replaced transcript is re-indexed
+    Given a transcript store with three talks
+    When I store "a talk about gardening" as manual subtitles of "nix00000001" in "en"
+    And I search for "reproducible"
+    Then "nix00000001" should not be among the hits
+
+  Scenario: Searching one language
+    Given a transcript store with three talks
+    When I search for "nix" in "fr"
+    Then the only hit should be "nixfr000001"
+
+  Scenario: A malformed query is rejected
+    Given an empty transcript store
+    Then searching for '"unbalanced' should raise a ValueError
+
+  Scenario: The CLI re-summarizes a stored transcript without contacting YouTube
+    Given a video whose transcript the CLI has stored
+    When I run the CLI on it again with "-l en --timestamps"
+    Then the exit code should be 0
+    And neither yt-dlp nor the subtitle host should have been contacted
+    And the stored subtitles should have been summarized with their cue times
+
+  Scenario: Searching from the command line
+    Given a video whose transcript the CLI has stored
+    When I run "search welcome"
+    Then the exit code should be 0
+    And the output should show the video URL and a snippet with "welcome"
+
+  Scenario: A transcript that cannot be stored is still returned
+    Given a transcript store that fails to write
+    When I download the sample transcript of "dQw4w9WgXcQ" in "en" into it
+    Then a warning should mention "failed to store transcript of dQw4w9WgXcQ"
+    And the downloaded transcript should be the cleaned sample
+
+  Scenario: A store that cannot be read is treated as empty
+    Given an empty transcript store
+    And the transcript store has failed
+    When I look up the stored transcript of "dQw4w9WgXcQ" in "en"
+    Then no stored transcript should be found
+    And a warning should mention "failed to read stored transcript of dQw4w9WgXcQ"
+
+  Scenario: The CLI runs without a transcript store it cannot open
+    Given a cache directory that is a file
+    When I run the CLI on it again with "-l en"
+    Then the exit code should be 0
+    And the error output should mention "transcript store unavailable"
+
+  Scenario: Searching reports a transcript store it cannot open
+    Given a cache directory that is a file
+    When I run "search welcome"
+    Then the exit code should be 1
+    And the error output should mention "cannot open the transcript store"
+
+  Scenario Outline: The CLI closes the transcript store it opens
+    When I run the CLI with "<flags>" counting transcript stores
+    Then the exit code should be 0
+    And every transcript store the CLI opened should have been closed
+
+    Examples:
+      | flags                                                                 |
+      | -l en https://youtube.com/watch?v=dQw4w9WgXcQ                         |
+      | -l en,fr https://youtube.com/watch?v=dQw4w9WgXcQ                      |
+      | -l en https://youtube.com/watch?v=dQw4w9WgXcQ https://youtu.be/x1y2z3 |
@@ -0,0 +1,97 @@
+"""In-memory stand-in for ``yt_subs.transport.HTTPSession``."""
+
+import json
+from collections.abc import Callable, Iterator
+from xml.sax.saxutils import escape
+
+from yt_subs.transport import HTTPStatusError
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, status: int = 200, chunk_size: int = 64 * 1024):
+        self._body = body
+        self.status = status
+        self._chunk_size = chunk_size
+
+    def read(self) -> bytes:
+        return self._body
+
+    def iter_chunks(self, size: int | None = None) -> Iterator[bytes]:
+        size = size or self._chunk_size
+        for i in range(0, len(self._body), size):
+            yield self._body[i : i + size]
+
+    def iter_lines(self) -> Iterator[bytes]:
+        yield from self._body.split(b"\n")
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "FakeResponse":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+class FakeSession:
+    """Records requests and answers them with ``handler(method, url, body)``.
+
+    The handler returns the response body as bytes, an int HTTP status to
+    simulate an error response, or raises to simulate a transport failure.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str, str, bytes | None], bytes],
+        chunk_size: int = 64 * 1024,
+    ):
+        self._handler = handler
+        self._chunk_size = chunk_size
+        self.requests: list[dict] = []
+
+    def request(self, method, url, body=None, headers=None, timeout=None):
+        self.requests.append({"method": method, "url": url, "body": body})
+        result = self._handler(method, url, body)
+        if isinstance(result, int):
+            raise HTTPStatusError(result, "Error", url)
+        return FakeResponse(result, chunk_size=self._chunk_size)
+
+    def json_bodies(self) -> list[dict]:
+        return [json.loads(r["body"]) for r in self.requests if r["body"]]
+
+
+def ollama_body(summary: str, stream: bool, stats: dict | None = None) -> bytes:
+    """Encode an Ollama /api/generate response, streamed as NDJSON or whole.
+
+    ``stats`` (eval_count, eval_duration, ...) go into the final object.
+    """
+    if not stream:
+        return json.dumps({"response": summary, "done": True, **(stats or {})}).encode("utf-8")
+    words = summary.split(" ")
+    lines = [
+        json.dumps({"response": w if i == 0 else f" {w}", "done": False})
+        for i, w in enumerate(words)
+    ]
+    lines.append(json.dumps({"response": "", "done": True, **(stats or {})}))
+    return "\n".join(lines).encode("utf-8")
+
+
+def subtitle_body(vtt_text: str, url: str) -> bytes:
+    """Serve ``vtt_text`` as the format a caption URL names: TTML or VTT."""
+    if not url.endswith(".ttml"):
+        return vtt_text.encode("utf-8")
+    paragraphs = []
+    timing = None
+    for line in vtt_text.splitlines():
+        if "-->" in line:
+            begin, _, end = line.partition("-->")
+            timing = (begin.strip(), end.split()[0])
+        elif line.strip() and timing is not None:
+            paragraphs.append(f'<p begin="{timing[0]}" end="{timing[1]}">{escape(line)}</p>')
+    return (
+        '<?xml version="1.0" encoding="utf-8" ?>\n'
+        '<tt xmlns="http://www.w3.org/ns/ttml"><body><div>\n'
+        + "\n".join(paragraphs)
+        + "\n</div></body></tt>\n"
+    ).encode("utf-8")
@@ -0,0 +1,228 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs.aio import (
+    AsyncHTTPSession,
+    AsyncOllamaSummarizer,
+    afetch_subtitle_content,
+    arun_batch,
+)
+from yt_subs.types import SubtitleFormat, SubtitleLanguage, SubtitleSource
+
+from .fixtures.fake_http import ollama_body
+from .fixtures.http_server import LocalServer
+
+scenarios("features/async_pipeline.feature")
+
+SAMPLE_SUMMARY = "Nix builds are reproducible."
+
+
+def _language(base_url: str) -> SubtitleLanguage:
+    return SubtitleLanguage(
+        code="en",
+        name="English",
+        source=SubtitleSource.MANUAL,
+        formats=(SubtitleFormat(ext="vtt", url=f"{base_url}/subs/en.vtt"),),
+    )
+
+
+class ConcurrencyTrackingSummarizer:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def summarize(self, transcript: str, prompt: str) -> str:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        self.calls += 1
+        return f"summary of {len(transcript)} chars"
+
+
+class StallingSummarizer(ConcurrencyTrackingSummarizer):
+    """Summarizes the first ``fast`` transcripts, then never finishes one."""
+
+    def __init__(self, fast: int):
+        super().__init__()
+        self._fast = fast
+        self.started = 0
+
+    async def summarize(self, transcript: str, prompt: str) -> str:
+        self.started += 1
+        if self.started <= self._fast:
+            return await super().summarize(transcript, prompt)
+        self.active += 1
+        try:
+            await asyncio.Event().wait()
+        finally:
+            self.active -= 1
+
+
+@given("a local server hosting subtitles and an Ollama API", target_fixture="server")
+def local_server(sample_vtt_text):
+    def ollama(path, body):
+        stream = json.loads(body)["stream"]
+        return 200, {"Content-Type": "application/x-ndjson"}, ollama_body(SAMPLE_SUMMARY, stream)
+
+    routes = {
+        "/subs/en.vtt": lambda path, body: (200, {}, sample_vtt_text.encode("utf-8")),
+        "/api/generate": ollama,
+    }
+    with LocalServer(routes) as server:
+        yield server
+
+
+@when(
+    parsers.parse("I fetch the subtitle content asynchronously {count:d} times"),
+    target_fixture="async_fetch",
+)
+def fetch_async(server, count):
+    async def run():
+        session = AsyncHTTPSession()
+        try:
+            contents = [
+                await afetch_subtitle_content(_language(server.url), session)
+                for _ in range(count)
+            ]
+        finally:
+            await session.aclose()
+        return {"contents": contents, "session": session}
+
+    return asyncio.run(run())
+
+
+@when("I stream a summary with the async Ollama summarizer", target_fixture="tokens")
+def stream_async(server):
+    async def run():
+        session = AsyncHTTPSession()
+        summarizer = AsyncOllamaSummarizer(base_url=server.url, session=session)
+        try:
+            return [token async for token in summarizer.stream("transcript", "Summarize")]
+        finally:
+            await session.aclose()
+
+    return asyncio.run(run())
+
+
+@when(
+    parsers.parse("I run an async batch of {count:d} videos with concurrency {limit:d}"),
+    target_fixture="async_batch",
+)
+def run_async_batch(server, count, limit):
+    summarizer = ConcurrencyTrackingSummarizer()
+    urls = [f"https://youtube.com/watch?v=video{i}" for i in range(count)]
+
+    async def run():
+        return [
+            result
+            async for result in arun_batch(
+                urls, summarizer, lang="en", concurrency=limit
+            )
+        ]
+
+    with patch("yt_subs.aio.list_languages", return_value=[_language(server.url)]):
+        results = asyncio.run(run())
+    return {"results": results, "summarizer": summarizer}
+
+
+@when(
+    parsers.parse(
+        "I take {taken:d} results from an async batch of endless videos with concurrency {limit:d}"
+    ),
+    target_fixture="async_batch",
+)
+def take_from_endless_batch(server, taken, limit):
+    summarizer = StallingSummarizer(fast=taken)
+    read = []
+
+    def urls():
+        while True:
+            read.append(f"https://youtube.com/watch?v=video{len(read)}")
+            yield read[-1]
+
+    async def run():
+        results = []
+        batch = arun_batch(urls(), summarizer, lang="en", concurrency=limit)
+        try:
+            async for result in batch:
+                results.append(result)
+                if len(results) == taken:
+                    # Let a stalled video reach the summarizer before stopping.
+                    for _ in range(500):
+                        if summarizer.active:
+                            break
+                        await asyncio.sleep(0.01)
+                    break
+        finally:
+            await batch.aclose()
+        return results
+
+    # Videos still summarizing when the batch closes its session.
+    active_at_close = []
+    real_aclose = AsyncHTTPSession.aclose
+
+    async def aclose(session):
+        active_at_close.append(summarizer.active)
+        await real_aclose(session)
+
+    with (
+        patch("yt_subs.aio.list_languages", return_value=[_language(server.url)]),
+        patch.object(AsyncHTTPSession, "aclose", aclose),
+    ):
+        results = asyncio.run(run())
+    assert len(results) == taken
+    return {
+        "results": results,
+        "read": read,
+        "summarizer": summarizer,
+        "active_at_close": active_at_close,
+    }
+
+
+@then("the content should match the hosted subtitles")
+def check_content(async_fetch, sample_vtt_text):
+    for content in async_fetch["contents"]:
+        assert content.raw_text.splitlines() == sample_vtt_text.splitlines()
+
+
+@then(parsers.parse("the async session should have opened {count:d} connection"))
+def check_async_connections(async_fetch, count):
+    session = async_fetch["session"]
+    assert session.connections_opened == count
+    assert session.connections_reused == len(async_fetch["contents"]) - count
+
+
+@then("the tokens should join to the hosted summary")
+def check_tokens(tokens):
+    assert len(tokens) > 1
+    assert "".join(tokens) == SAMPLE_SUMMARY
+
+
+@then(parsers.parse("all {count:d} videos should be summarized"))
+def check_all_summarized(async_batch, count):
+    results = async_batch["results"]
+    assert len(results) == count
+    assert all(r.ok for r in results), [r.error for r in results if not r.ok]
+
+
+@then(parsers.parse("no more than {limit:d} summaries should have run at once"))
+def check_peak(async_batch, limit):
+    assert 1 < async_batch["summarizer"].peak <= limit
+
+
+@then(parsers.parse("at most {count:d} video URLs should have been read"))
+def check_urls_read(async_batch, count):
+    assert len(async_batch["read"]) <= count
+
+
+@then("every video still in flight should have been cancelled before the batch closed")
+def check_cancelled(async_batch):
+    assert async_batch["summarizer"].active == 0
+    assert async_batch["active_at_close"] == [0]
@@ -0,0 +1,223 @@
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs.bulk import clean_file, clean_files, find_subtitle_files, resummarize_files
+from yt_subs.cleaning import clean_subtitle
+from yt_subs.cli import main
+from yt_subs.types import SubtitleContent, SubtitleLanguage, SubtitleSource
+
+from .fixtures.fake_http import FakeSession, ollama_body
+
+scenarios("features/resummarize.feature")
+
+
+class RecordingSummarizer:
+    """Summarizes slowly, recording how many requests overlap."""
+
+    def __init__(self, delay: float = 0.0):
+        self._delay = delay
+        self._lock = threading.Lock()
+        self._active = 0
+        self.max_active = 0
+        self.transcripts: list[str] = []
+
+    def summarize(self, transcript: str, prompt: str) -> str:
+        with self._lock:
+            self._active += 1
+            self.max_active = max(self.max_active, self._active)
+            self.transcripts.append(transcript)
+        time.sleep(self._delay)
+        with self._lock:
+            self._active -= 1
+        return f"summary of {len(transcript)} chars"
+
+
+def _expected(path, raw_text):
+    language = SubtitleLanguage(code="x", name="x", source=SubtitleSource.MANUAL, formats=())
+    return clean_subtitle(SubtitleContent(language, raw_text, ext=path.suffix[1:])).text
+
+
+@given("an archive with VTT and SRT subtitle files and a note", target_fixture="archive")
+def archive(tmp_path, sample_vtt_text, sample_srt_text):
+    root = tmp_path / "archive"
+    (root / "2024").mkdir(parents=True)
+    (root / "talk.en.vtt").write_text(sample_vtt_text)
+    (root / "intro.srt").write_text(sample_srt_text)
+    (root / "2024" / "keynote.fa.vtt").write_text(sample_vtt_text)
+    (root / "notes.txt").write_text("not subtitles")
+    return root
+
+
+@given(parsers.parse('a malformed "{name}" file in the archive'))
+def malformed_file(archive, name):
+    (archive / name).write_text("{not json")
+
+
+@given(parsers.parse("an archive of {count:d} VTT subtitle files"), target_fixture="archive")
+def vtt_archive(tmp_path, sample_vtt_text, count):
+    root = tmp_path / "archive"
+    root.mkdir()
+    for i in range(count):
+        (root / f"video{i}.en.vtt").write_text(sample_vtt_text)
+    return root
+
+
+@when(parsers.parse("I clean the archive on {workers:d} processes"), target_fixture="cleaned")
+def clean_archive(archive, workers):
+    return list(clean_files(find_subtitle_files([archive]), workers=workers))
+
+
+@when(
+    parsers.parse("I re-summarize the archive with {workers:d} summary workers"),
+    target_fixture="summarizer",
+)
+def resummarize_concurrently(archive, workers):
+    summarizer = RecordingSummarizer(delay=0.1)
+    results = list(
+        resummarize_files(
+            sorted(archive.iterdir()), summarizer, summary_workers=workers, clean_workers=1
+        )
+    )
+    assert all(result.ok for result in results)
+    return summarizer
+
+
+@when("I re-summarize the archive", target_fixture="results")
+def resummarize(archive):
+    files = find_subtitle_files([archive])
+    return {
+        result.path.name: result
+        for result in resummarize_files(files, RecordingSummarizer(), clean_workers=2)
+    }
+
+
+def _run_cli(argv, capsys):
+    session = FakeSession(
+        lambda method, url, body: ollama_body("A summary.", stream=json.loads(body)["stream"])
+    )
+    ydl_cls = MagicMock()
+    with (
+        patch("yt_dlp.YoutubeDL", ydl_cls),
+        patch("yt_subs.summarizer.default_session", return_value=session),
+    ):
+        exit_code = main(argv)
+    captured = capsys.readouterr()
+    return {
+        "exit_code": exit_code,
+        "stdout": captured.out,
+        "stderr": captured.err,
+        "ydl": ydl_cls,
+        "session": session,
+    }
+
+
+@when('I run "resummarize" on the archive', target_fixture="cli_result")
+def run_resummarize(archive, capsys):
+    return _run_cli(["resummarize", "--clean-workers", "2", str(archive)], capsys)
+
+
+@given(parsers.parse('"{name}" next to "{other}" in the archive'))
+def same_name_file(archive, sample_srt_text, name, other):
+    (archive / name).write_text(sample_srt_text)
+
+
+@when(
+    'I run "resummarize" on the archive with "-o" a summaries directory',
+    target_fixture="cli_result",
+)
+def run_resummarize_to_dir(archive, tmp_path, capsys):
+    output = tmp_path / "summaries"
+    return _run_cli(["resummarize", "-o", str(output), str(archive)], capsys)
+
+
+@then("every subtitle file should be cleaned, in sorted order")
+def check_cleaned(cleaned, archive):
+    names = [path.relative_to(archive).as_posix() for path, _ in cleaned]
+    assert names == ["2024/keynote.fa.vtt", "intro.srt", "talk.en.vtt"]
+    for path, transcript in cleaned:
+        assert transcript.text == _expected(path, path.read_text())
+
+
+@then("the note should have been skipped")
+def check_skipped(cleaned):
+    assert all(path.suffix != ".txt" for path, _ in cleaned)
+
+
+@then(parsers.parse('"{first}" should be cleaned as "{code}" and "{second}" as "{other}"'))
+def check_languages(cleaned, first, code, second, other):
+    codes = {path.name: transcript.language_code for path, transcript in cleaned}
+    assert codes[first] == code
+    assert codes[second] == other
+
+
+@then(parsers.parse('cleaning "{name}" with language "{code}" should give "{expected}"'))
+def check_language_override(archive, name, code, expected):
+    assert clean_file(archive / name, lang=code).language_code == expected
+
+
+@then(parsers.parse('"{name}" should fail with "{message}"'))
+def check_failure(results, name, message):
+    assert not results[name].ok
+    assert message in results[name].error
+
+
+@then("every other subtitle file should have been summarized")
+def check_others(results):
+    others = [result for name, result in results.items() if name != "broken.en.json3"]
+    assert len(others) == 3
+    assert all(result.ok and result.summary.startswith("summary of") for result in others)
+
+
+@then(parsers.parse("{count:d} summaries should have been requested at once"))
+def check_concurrency(summarizer, count):
+    assert len(summarizer.transcripts) == 6
+    assert summarizer.max_active == count
+
+
+@then(parsers.parse("the exit code should be {code:d}"))
+def check_exit_code(cli_result, code):
+    assert cli_result["exit_code"] == code, cli_result["stderr"]
+
+
+@then("there should be one JSON line per subtitle file")
+def check_json_lines(cli_result):
+    records = [json.loads(line) for line in cli_result["stdout"].splitlines()]
+    assert sorted(record["path"].rsplit("/", 1)[1] for record in records) == [
+        "intro.srt",
+        "keynote.fa.vtt",
+        "talk.en.vtt",
+    ]
+    assert all(record["ok"] and record["summary"] == "A summary." for record in records)
+    assert {record["language"] for record in records} == {"en", "fa", "und"}
+
+
+@then("neither yt-dlp nor the subtitle host should have been contacted")
+def check_offline(cli_result):
+    cli_result["ydl"].assert_not_called()
+    assert all(request["body"] is not None for request in cli_result["session"].requests)
+    assert cli_result["session"].requests
+
+
+@then(parsers.parse('the summaries directory should hold "{first}" and "{second}"'))
+def check_summary_files(tmp_path, first, second):
+    output = tmp_path / "summaries"
+    assert sorted(path.name for path in output.iterdir()) == sorted(
+        [first, second, "2024"]
+    )
+    assert (output / first).read_text() == "A summary.\n"
+    assert (output / "2024" / "keynote.fa.txt").read_text() == "A summary.\n"
+
+
+@then(parsers.parse('running "resummarize -o" on the archive should fail with "{message}"'))
+def check_name_collision(archive, tmp_path, capsys, message):
+    output = tmp_path / "summaries"
+    with pytest.raises(SystemExit) as exc_info:
+        _run_cli(["resummarize", "-o", str(output), str(archive)], capsys)
+    assert exc_info.value.code == 2
+    assert message in capsys.readouterr().err
+    assert not output.exists()
@@ -0,0 +1,195 @@
+import json
+from concurrent.futures import Future
+from unittest.mock import patch
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs.bulk import clean_file, clean_many
+from yt_subs.cleaning import clean_subtitle
+from yt_subs.cli import main
+from yt_subs.types import (
+    SubtitleContent,
+    SubtitleDownloadError,
+    SubtitleLanguage,
+    SubtitleSource,
+)
+
+scenarios("features/bulk_cleaning.feature")
+
+
+class RecordingPool:
+    """Stands in for ProcessPoolExecutor, running chunks inline."""
+
+    chunks: list[int] = []
+
+    def __init__(self, workers):
+        RecordingPool.chunks = []
+
+    def submit(self, fn, items, *args):
+        RecordingPool.chunks.append(len(items))
+        future = Future()
+        future.set_result(fn(items, *args))
+        return future
+
+    def shutdown(self, cancel_futures=False):
+        pass
+
+
+def _language(code: str) -> SubtitleLanguage:
+    return SubtitleLanguage(code=code, name=code, source=SubtitleSource.MANUAL, formats=())
+
+
+def _clean_alone(item):
+    if isinstance(item, SubtitleContent):
+        return clean_subtitle(item)
+    return clean_file(item)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    root = tmp_path / "archive"
+    root.mkdir()
+    return root
+
+
+@given(
+    parsers.parse("{count:d} sample subtitles, alternating files and in-memory contents"),
+    target_fixture="inputs",
+)
+def sample_inputs(archive, sample_vtt_text, sample_srt_text, count):
+    inputs = []
+    for i in range(count):
+        # Vary the text so that an out-of-order result cannot pass.
+        vtt = sample_vtt_text.replace("Nix", f"Nix {i}")
+        srt = sample_srt_text.replace("Nix", f"Nix {i}")
+        if i % 2:
+            inputs.append(SubtitleContent(_language("fr"), srt, ext="srt"))
+            path = archive / f"video{i:02d}.fr.srt"
+            path.write_text(srt)
+        else:
+            path = archive / f"video{i:02d}.en.vtt"
+            path.write_text(vtt)
+            inputs.append(path)
+    return inputs
+
+
+@given("an empty subtitle file and one starting with a byte order mark", target_fixture="inputs")
+def mmap_inputs(archive, sample_vtt_text):
+    empty = archive / "empty.en.vtt"
+    empty.write_bytes(b"")
+    bom = archive / "bom.en.vtt"
+    bom.write_bytes(b"\xef\xbb\xbf" + sample_vtt_text.encode("utf-8"))
+    return [empty, bom]
+
+
+@given(parsers.parse('"{first}" and "{second}" in the archive'), target_fixture="inputs")
+def same_stem_inputs(archive, sample_vtt_text, sample_srt_text, first, second):
+    inputs = []
+    for name in (first, second):
+        path = archive / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(sample_srt_text if name.endswith(".srt") else f"{sample_vtt_text}\n{name}")
+        inputs.append(path)
+    return inputs
+
+
+@given("a malformed json3 file among them")
+def malformed_input(inputs, archive):
+    path = archive / "broken.en.json3"
+    path.write_text("{not json")
+    inputs.insert(3, path)
+
+
+@when(
+    parsers.parse("I clean them all on {workers:d} processes in chunks of {size:d}"),
+    target_fixture="transcripts",
+)
+def clean_all(inputs, workers, size):
+    return list(clean_many(inputs, workers=workers, chunk_size=size))
+
+
+@when(
+    parsers.parse("I clean them all in chunks of {size:d} on a recording pool"),
+    target_fixture="transcripts",
+)
+def clean_recorded(inputs, size):
+    with patch("yt_subs.bulk.ProcessPoolExecutor", RecordingPool):
+        return list(clean_many(inputs, workers=2, chunk_size=size))
+
+
+@when(parsers.parse('I run "{command}" on their directory'), target_fixture="cli_result")
+def run_clean(archive, tmp_path, capsys, command):
+    argv = command.split()
+    if argv[-1] == "-o":
+        argv.append(str(tmp_path / "transcripts"))
+    exit_code = main([*argv, str(archive)])
+    captured = capsys.readouterr()
+    return {"exit_code": exit_code, "stdout": captured.out, "stderr": captured.err}
+
+
+@then(parsers.parse('running "{command}" on their directory should fail with "{message}"'))
+def check_usage_error(archive, tmp_path, capsys, command, message):
+    with pytest.raises(SystemExit) as exc_info:
+        run_clean(archive, tmp_path, capsys, command)
+    assert exc_info.value.code == 2
+    assert message in capsys.readouterr().err
+    assert not (tmp_path / "transcripts").exists()
+
+
+@then("each transcript should match cleaning that input alone, in order")
+def check_order(inputs, transcripts):
+    assert transcripts == [_clean_alone(item) for item in inputs]
+
+
+@then(parsers.parse("the pool should have received chunks of {first:d}, {second:d} and {last:d}"))
+def check_chunks(transcripts, first, second, last):
+    assert RecordingPool.chunks == [first, second, last]
+    assert len(transcripts) == first + second + last
+
+
+@then("the empty file should give an empty transcript")
+def check_empty(transcripts):
+    assert transcripts[0].text == ""
+
+
+@then("the byte order mark should not reach the transcript")
+def check_bom(transcripts, inputs):
+    assert not transcripts[1].text.startswith("\ufeff")
+    assert transcripts[1].text == clean_file(inputs[1]).text
+    assert transcripts[1].text.startswith("Hello and welcome")
+
+
+@then(parsers.parse('cleaning them all on {workers:d} processes should raise "{message}"'))
+def check_raises(inputs, workers, message):
+    with pytest.raises(SubtitleDownloadError, match=message):
+        list(clean_many(inputs, workers=workers, chunk_size=2))
+
+
+@then(parsers.parse("the exit code should be {code:d}"))
+def check_exit_code(cli_result, code):
+    assert cli_result["exit_code"] == code, cli_result["stderr"]
+
+
+@then("the output should list every file in sorted order with its transcript")
+def check_json_lines(cli_result, archive):
+    records = [json.loads(line) for line in cli_result["stdout"].splitlines()]
+    paths = sorted(archive.iterdir())
+    assert [record["path"] for record in records] == [str(path) for path in paths]
+    assert [record["text"] for record in records] == [clean_file(p).text for p in paths]
+    assert [record["language"] for record in records[:2]] == ["en", "fr"]
+
+
+@then("the output directory should hold one transcript per file")
+def check_files(archive, tmp_path):
+    output = tmp_path / "transcripts"
+    for path in archive.iterdir():
+        written = (output / f"{path.stem}.txt").read_text()
+        assert written == clean_file(path).text + "\n"
+
+
+@then(parsers.parse('the output directory should hold "{first}" and "{second}"'))
+def check_mirrored_files(inputs, tmp_path, first, second):
+    output = tmp_path / "transcripts"
+    for source, name in zip(inputs, (first, second)):
+        assert (output / name).read_text() == clean_file(source).text + "\n"
@@ -0,0 +1,308 @@
+import json
+import os
+import time
+import warnings
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs.cache import MetadataCache, SQLiteSummaryStore
+from yt_subs.cli import _build_summarizer, build_parser, main
+from yt_subs.subtitles import extract_video_id, list_languages
+from yt_subs.summarizer import CachingSummarizer
+from yt_subs.types import SubtitleFormat, SubtitleLanguage, SubtitleSource
+
+from .fixtures.fake_http import FakeSession, ollama_body, subtitle_body
+from .fixtures.yt_dlp_info import INFO_WITH_SUBS, make_info_dict
+
+scenarios("features/metadata_cache.feature")
+
+VIDEO_URLS = (
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://youtu.be/dQw4w9WgXcQ",
+)
+
+
+def _language(code: str) -> SubtitleLanguage:
+    return SubtitleLanguage(
+        code=code,
+        name=code,
+        source=SubtitleSource.MANUAL,
+        formats=(SubtitleFormat(ext="vtt", url=f"https://example.com/{code}.vtt"),),
+    )
+
+
+@when(parsers.parse('I extract the video ID from "{url}"'), target_fixture="video_id")
+def do_extract(url):
+    return extract_video_id(url)
+
+
+@then(parsers.parse('the video ID should be "{expected}"'))
+def check_video_id(video_id, expected):
+    assert video_id == expected
+
+
+@given("a metadata cache", target_fixture="cache")
+def metadata_cache(tmp_path):
+    return MetadataCache(tmp_path / "metadata")
+
+
+@given(
+    parsers.parse("a metadata cache holding at most {count:d} entries"),
+    target_fixture="cache",
+)
+def bounded_cache(tmp_path, count):
+    return MetadataCache(tmp_path / "metadata", max_entries=count)
+
+
+@pytest.fixture
+def video_info():
+    return INFO_WITH_SUBS
+
+
+@given("a video whose subtitle URLs have already expired", target_fixture="video_info")
+def expired_video_info():
+    expire = int(time.time()) - 60
+    return make_info_dict(
+        subtitles={
+            "en": [{"ext": "vtt", "url": f"https://example.com/en.vtt?expire={expire}"}]
+        }
+    )
+
+
+@pytest.fixture
+def ydl(video_info):
+    mock_ydl = MagicMock()
+    mock_ydl.extract_info.return_value = video_info
+    with patch("yt_dlp.YoutubeDL") as mock_cls:
+        mock_cls.return_value.__enter__ = MagicMock(return_value=mock_ydl)
+        mock_cls.return_value.__exit__ = MagicMock(return_value=False)
+        yield mock_ydl
+
+
+@when(
+    "I list languages for the same video twice via different URLs",
+    target_fixture="results",
+)
+def list_twice(cache, ydl):
+    return [list_languages(url, cache=cache) for url in VIDEO_URLS]
+
+
+@when("I list languages twice, refreshing the second time", target_fixture="results")
+def list_with_refresh(cache, ydl):
+    return [
+        list_languages(VIDEO_URLS[0], cache=cache),
+        list_languages(VIDEO_URLS[0], cache=cache, refresh=True),
+    ]
+
+
+@when("I cache languages for 3 videos after reading back the first one")
+def fill_cache(cache):
+    cache.put("aaaaaaaaaaa", [_language("en")])
+    cache.put("bbbbbbbbbbb", [_language("fr")])
+    # Make the first two entries clearly older before touching the first one.
+    past = time.time() - 100
+    for name in ("aaaaaaaaaaa", "bbbbbbbbbbb"):
+        os.utime(cache.directory / f"{name}.json", (past, past))
+    assert cache.get("aaaaaaaaaaa") is not None
+    cache.put("ccccccccccc", [_language("es")])
+
+
+@then(parsers.parse("yt-dlp should have been called {count:d} time"))
+@then(parsers.parse("yt-dlp should have been called {count:d} times"))
+def check_extract_calls(ydl, count):
+    assert ydl.extract_info.call_count == count
+
+
+@then("both results should be identical")
+def check_identical(results):
+    assert results[0] == results[1]
+    assert {l.code for l in results[0]} >= {"en", "fr"}
+
+
+@then(parsers.parse("the cache should hold {count:d} entries"))
+def check_entry_count(cache, count):
+    assert len(list(cache.directory.glob("*.json"))) == count
+
+
+@then("the second video should have been evicted")
+def check_evicted(cache):
+    assert cache.get("bbbbbbbbbbb") is None
+    assert cache.get("aaaaaaaaaaa") is not None
+    assert cache.get("ccccccccccc") is not None
+
+
+# ── Summary cache feature ─────────────────────────────────────────────
+
+scenarios("features/summary_cache.feature")
+
+SAMPLE_TRANSCRIPT = "Nix is a powerful package manager."
+
+
+class CountingSummarizer:
+    model = "llama3"
+
+    def __init__(self):
+        self.calls = 0
+
+    def summarize(self, transcript: str, prompt: str) -> str:
+        self.calls += 1
+        return f"{prompt}: {transcript}"
+
+
+class CountingSummaryStore(SQLiteSummaryStore):
+    """A summary store that records which instances were closed."""
+
+    opened: list["CountingSummaryStore"] = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.closed = False
+        CountingSummaryStore.opened.append(self)
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+def _handler(method, url, body):
+    if body is not None:
+        return ollama_body("A summary.", stream=json.loads(body)["stream"])
+    return subtitle_body("WEBVTT\n\n00:00:00.000 --> 00:00:03.000\nHello\n", url)
+
+
+@given("a caching summarizer backed by SQLite", target_fixture="caching")
+def caching_summarizer(tmp_path):
+    inner = CountingSummarizer()
+    store_path = tmp_path / "summaries.sqlite3"
+    return {
+        "inner": inner,
+        "path": store_path,
+        "summarizer": CachingSummarizer(inner, SQLiteSummaryStore(store_path)),
+    }
+
+
+@given("the SQLite store has failed")
+def failed_store(caching):
+    # Every query on a closed connection raises sqlite3.ProgrammingError.
+    caching["summarizer"]._store.close()
+
+
+@given("a cache directory that is a file")
+def cache_dir_is_file(tmp_path, monkeypatch):
+    path = tmp_path / "not-a-directory"
+    path.write_text("")
+    monkeypatch.setenv("YT_SUBS_CACHE_DIR", str(path))
+
+
+@when("I summarize the same transcript twice")
+def summarize_twice(caching):
+    with warnings.catch_warnings(record=True) as warned:
+        warnings.simplefilter("always")
+        first = caching["summarizer"].summarize(SAMPLE_TRANSCRIPT, "Summarize")
+        second = caching["summarizer"].summarize(SAMPLE_TRANSCRIPT, "Summarize")
+    assert first == second
+    caching["warnings"] = [str(w.message) for w in warned]
+
+
+@when("the CLI builds its summarizer", target_fixture="built")
+def build_cli_summarizer(capsys):
+    args = build_parser().parse_args(["https://youtube.com/watch?v=dQw4w9WgXcQ"])
+    summarizer = _build_summarizer(args, "llama3")
+    return {"summarizer": summarizer, "stderr": capsys.readouterr().err}
+
+
+@when("I run the CLI on a single video counting summary caches")
+def run_counting_caches(ydl, capsys):
+    CountingSummaryStore.opened = []
+    session = FakeSession(_handler)
+    with (
+        patch("yt_subs.cli.SQLiteSummaryStore", CountingSummaryStore),
+        patch("yt_subs.subtitles.default_session", return_value=session),
+        patch("yt_subs.summarizer.default_session", return_value=session),
+    ):
+        assert main(["-l", "en", "https://youtube.com/watch?v=dQw4w9WgXcQ"]) == 0
+    assert "A summary." in capsys.readouterr().out
+
+
+@when(
+    "the CLI builds its summarizers for a batch and for a short single video",
+    target_fixture="built",
+)
+def build_batch_and_single():
+    args = build_parser().parse_args(["https://youtube.com/watch?v=dQw4w9WgXcQ"])
+    return [
+        _build_summarizer(args, "llama3"),
+        _build_summarizer(args, "llama3", SAMPLE_TRANSCRIPT),
+    ]
+
+
+@when("I summarize the same transcript with two different prompts")
+def summarize_two_prompts(caching):
+    caching["summarizer"].summarize(SAMPLE_TRANSCRIPT, "Summarize")
+    caching["summarizer"].summarize(SAMPLE_TRANSCRIPT, "List the key points")
+
+
+@when("I summarize a transcript and reopen the cache")
+def summarize_and_reopen(caching):
+    caching["summarizer"].summarize(SAMPLE_TRANSCRIPT, "Summarize")
+    caching["summarizer"] = CachingSummarizer(
+        caching["inner"], SQLiteSummaryStore(caching["path"])
+    )
+
+
+@when("I summarize the same transcript again")
+def summarize_again(caching):
+    caching["summarizer"].summarize(SAMPLE_TRANSCRIPT, "Summarize")
+
+
+@then(parsers.parse("the model should have been called {count:d} time"))
+@then(parsers.parse("the model should have been called {count:d} times"))
+def check_model_calls(caching, count):
+    assert caching["inner"].calls == count
+
+
+@then(parsers.parse("the cache should report {hits:d} hit and {misses:d} miss"))
+@then(parsers.parse("the cache should report {hits:d} hits and {misses:d} misses"))
+def check_cache_stats(caching, hits, misses):
+    assert caching["summarizer"].hits == hits
+    assert caching["summarizer"].misses == misses
+
+
+@then(parsers.parse("the CLI should have opened {count:d} summary cache"))
+def check_caches_opened(count):
+    assert len(CountingSummaryStore.opened) == count
+
+
+@then("every summary cache the CLI opened should have been closed")
+def check_caches_closed():
+    assert all(store.closed for store in CountingSummaryStore.opened)
+
+
+@then("both summarizers should use the same cache key")
+def check_same_key(built):
+    batch, single = built
+    try:
+        assert batch._inner.options != single._inner.options
+        assert batch.cache_key(SAMPLE_TRANSCRIPT, "Summarize") == single.cache_key(
+            SAMPLE_TRANSCRIPT, "Summarize"
+        )
+    finally:
+        batch.close()
+        single.close()
+
+
+@then(parsers.parse('a warning should mention "{text}"'))
+def check_warning(caching, text):
+    assert any(text in message for message in caching["warnings"])
+
+
+@then("the summarizer should not cache summaries")
+def check_uncached(built):
+    assert not isinstance(built["summarizer"], CachingSummarizer)
+
+
+@then(parsers.parse('the error output should mention "{text}"'))
+def check_stderr(built, text):
+    assert text in built["stderr"]
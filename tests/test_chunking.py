@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs.chunking import ChunkedSummarizer, estimate_tokens, split_transcript
+from yt_subs.types import DEFAULT_SUMMARIZATION_PROMPT
+
+scenarios("features/chunked_summarization.feature")
+
+
+class RecordingBackend:
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.prompts: list[str] = []
+
+    def summarize(self, transcript: str, prompt: str) -> str:
+        with self._lock:
+            self.prompts.append(prompt)
+        return f"{self.name} summary ({len(transcript)} chars)"
+
+
+@given(parsers.parse("a transcript of {count:d} caption lines"), target_fixture="transcript")
+def transcript_lines(count):
+    return "\n".join(f"Caption line number {i} says something." for i in range(count))
+
+
+@when(
+    parsers.parse(
+        "I split it into chunks of {budget:d} tokens with {overlap:d} tokens of overlap"
+    ),
+    target_fixture="chunks",
+)
+def do_split(transcript, budget, overlap):
+    return {"budget": budget, "chunks": split_transcript(transcript, budget, overlap)}
+
+
+@when(
+    parsers.parse("I summarize it with a chunk budget of {budget:d} tokens"),
+    target_fixture="backends",
+)
+def do_summarize_single(transcript, budget):
+    backend = RecordingBackend("a")
+    ChunkedSummarizer(backend, chunk_tokens=budget, overlap_tokens=10).summarize(
+        transcript, DEFAULT_SUMMARIZATION_PROMPT
+    )
+    return [backend]
+
+
+@when(
+    parsers.parse(
+        "I summarize it with a chunk budget of {budget:d} tokens across {count:d} backends"
+    ),
+    target_fixture="backends",
+)
+def do_summarize_multi(transcript, budget, count):
+    backends = [RecordingBackend(str(i)) for i in range(count)]
+    ChunkedSummarizer(
+        backends, chunk_tokens=budget, overlap_tokens=10, fan_out=4
+    ).summarize(transcript, DEFAULT_SUMMARIZATION_PROMPT)
+    return backends
+
+
+@then(parsers.parse("every chunk should fit in {budget:d} tokens"))
+def check_budget(chunks, budget):
+    assert len(chunks["chunks"]) > 1
+    assert all(estimate_tokens(c) <= budget for c in chunks["chunks"])
+
+
+@then("consecutive chunks should share at least one line")
+def check_overlap(chunks):
+    parts = chunks["chunks"]
+    for prev, nxt in zip(parts, parts[1:]):
+        assert set(prev.splitlines()) & set(nxt.splitlines())
+
+
+@then("every caption line should appear in some chunk")
+def check_coverage(chunks, transcript):
+    covered = {line for c in chunks["chunks"] for line in c.splitlines()}
+    assert covered == set(transcript.splitlines())
+
+
+@then(parsers.parse("the backends should have received {count:d} request"))
+def check_request_count(backends, count):
+    assert sum(len(b.prompts) for b in backends) == count
+
+
+@then("both backends should have received chunk requests")
+def check_spread(backends):
+    assert all(b.prompts for b in backends)
+
+
+@then("the final request should use the original prompt")
+def check_final_prompt(backends):
+    prompts = [p for b in backends for p in b.prompts]
+    assert prompts.count(DEFAULT_SUMMARIZATION_PROMPT) == 1
+    assert backends[0].prompts[-1] == DEFAULT_SUMMARIZATION_PROMPT
@@ -3,9 +3,11 @@ import re
 import pytest
 from pytest_bdd import given, parsers, scenarios, then, when
 
-from yt_subs.cleaning import clean_subtitle
+from yt_subs.cleaning import clean_lines, clean_subtitle
 from yt_subs.types import CleanedTranscript, SubtitleContent, SubtitleLanguage
 
+from .conftest import FIXTURES_DIR
+
 scenarios("features/subtitle_cleaning.feature")
 
 
@@ -19,6 +21,36 @@ def srt_content(sample_srt_text, english_manual_language):
     return SubtitleContent(language=english_manual_language, raw_text=sample_srt_text)
 
 
+@given("a roll-up VTT subtitle file", target_fixture="subtitle_content")
+def rollup_content(english_auto_language):
+    raw_text = (FIXTURES_DIR / "sample_rollup.vtt").read_text()
+    return SubtitleContent(language=english_auto_language, raw_text=raw_text)
+
+
+@given(
+    parsers.parse('subtitle lines where "{text}" repeats after {count:d} other lines'),
+    target_fixture="raw_lines",
+)
+def repeated_lines(text, count):
+    filler = [f"filler line number {i}" for i in range(count)]
+    return ["WEBVTT", "", text, *filler, text]
+
+
+@given(parsers.parse('the subtitle lines "{lines}"'), target_fixture="raw_lines")
+def given_lines(lines):
+    return ["WEBVTT", "", *lines.split("|")]
+
+
+@when(
+    parsers.parse("I clean the lines with a dedup window of {window:d}"),
+    target_fixture="cleaned",
+)
+def clean_raw_lines(raw_lines, window):
+    return CleanedTranscript(
+        language_code="en", text="\n".join(clean_lines(raw_lines, window=window))
+    )
+
+
 @when("I clean the subtitle content", target_fixture="cleaned")
 def clean_content(subtitle_content):
     return clean_subtitle(subtitle_content)
@@ -34,6 +66,11 @@ def result_should_contain(cleaned, text):
     assert text in cleaned.text
 
 
+@then(parsers.parse('the result should equal "{expected}"'))
+def result_equals(cleaned, expected):
+    assert cleaned.text.splitlines() == expected.split("|")
+
+
 @then(parsers.parse('"{text}" should appear exactly {count:d} time'))
 def text_appears_n_times(cleaned, text, count):
     actual = cleaned.text.splitlines().count(text)
@@ -44,3 +81,8 @@ def text_appears_n_times(cleaned, text, count):
 def no_bare_number_lines(cleaned):
     for line in cleaned.text.splitlines():
         assert not re.match(r"^\d+$", line.strip()), f"Found bare number line: {line!r}"
+
+
+@then(parsers.parse('the result should equal the fixture "{name}"'))
+def result_equals_fixture(cleaned, name):
+    assert cleaned.text == (FIXTURES_DIR / name).read_text()
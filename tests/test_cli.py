@@ -7,11 +7,13 @@ from pytest_bdd import given, parsers, scenarios, then, when
 
 from yt_subs.cli import main
 from yt_subs.types import (
+    DEFAULT_TIMESTAMPED_PROMPT,
     SubtitleFormat,
     SubtitleLanguage,
     SubtitleSource,
 )
 
+from .fixtures.fake_http import FakeSession, ollama_body, subtitle_body
 from .fixtures.yt_dlp_info import INFO_NO_SUBS, INFO_WITH_SUBS
 
 scenarios("features/cli_validation.feature")
@@ -41,20 +43,18 @@ def _mock_yt_dlp(info_dict):
     return mock_cls
 
 
-def _mock_urlopen_vtt(req_or_url):
-    """Mock urlopen to return sample VTT content."""
-    mock_resp = MagicMock()
-    if hasattr(req_or_url, "data"):
-        # Ollama API call
-        mock_resp.read.return_value = json.dumps(
-            {"response": SAMPLE_SUMMARY}
-        ).encode("utf-8")
-    else:
-        # Subtitle fetch
-        mock_resp.read.return_value = SAMPLE_VTT.encode("utf-8")
-    mock_resp.__enter__ = MagicMock(return_value=mock_resp)
-    mock_resp.__exit__ = MagicMock(return_value=False)
-    return mock_resp
+def _fake_session(captured_model: dict) -> FakeSession:
+    """Serve sample VTT for subtitle URLs and a summary for Ollama calls."""
+
+    def handler(method, url, body):
+        if body is not None:
+            payload = json.loads(body)
+            captured_model["model"] = payload["model"]
+            captured_model["payload"] = payload
+            return ollama_body(SAMPLE_SUMMARY, stream=payload["stream"])
+        return subtitle_body(SAMPLE_VTT, url)
+
+    return FakeSession(handler)
 
 
 # ── Steps ─────────────────────────────────────────────────────────────
@@ -84,21 +84,15 @@ def video_no_subs():
 )
 def run_with_lang(video_info, capsys):
     captured_model = {}
-
-    def mock_urlopen(req_or_url):
-        resp = _mock_urlopen_vtt(req_or_url)
-        if hasattr(req_or_url, "data"):
-            body = json.loads(req_or_url.data.decode("utf-8"))
-            captured_model["model"] = body["model"]
-        return resp
+    session = _fake_session(captured_model)
 
     env = os.environ.copy()
     env.pop("YT_SUBS_MODEL", None)
 
     with (
-        patch("yt_subs.subtitles.yt_dlp.YoutubeDL", _mock_yt_dlp(video_info)),
-        patch("yt_subs.subtitles.urllib.request.urlopen", side_effect=mock_urlopen),
-        patch("yt_subs.summarizer.urllib.request.urlopen", side_effect=mock_urlopen),
+        patch("yt_dlp.YoutubeDL", _mock_yt_dlp(video_info)),
+        patch("yt_subs.subtitles.default_session", return_value=session),
+        patch("yt_subs.summarizer.default_session", return_value=session),
         patch.dict(os.environ, env, clear=True),
     ):
         exit_code = main(["-l", "en", "https://youtube.com/watch?v=test"])
@@ -118,18 +112,12 @@ def run_with_lang(video_info, capsys):
 )
 def run_with_custom_model(video_info, model, capsys):
     captured_model = {}
-
-    def mock_urlopen(req_or_url):
-        resp = _mock_urlopen_vtt(req_or_url)
-        if hasattr(req_or_url, "data"):
-            body = json.loads(req_or_url.data.decode("utf-8"))
-            captured_model["model"] = body["model"]
-        return resp
+    session = _fake_session(captured_model)
 
     with (
-        patch("yt_subs.subtitles.yt_dlp.YoutubeDL", _mock_yt_dlp(video_info)),
-        patch("yt_subs.subtitles.urllib.request.urlopen", side_effect=mock_urlopen),
-        patch("yt_subs.summarizer.urllib.request.urlopen", side_effect=mock_urlopen),
+        patch("yt_dlp.YoutubeDL", _mock_yt_dlp(video_info)),
+        patch("yt_subs.subtitles.default_session", return_value=session),
+        patch("yt_subs.summarizer.default_session", return_value=session),
         patch.dict(os.environ, {"YT_SUBS_MODEL": model}),
     ):
         exit_code = main(["-l", "en", "https://youtube.com/watch?v=test"])
@@ -143,12 +131,36 @@ def run_with_custom_model(video_info, model, capsys):
     }
 
 
+@when(
+    parsers.parse('I run the CLI on a URL with "{flags}"'),
+    target_fixture="cli_result",
+)
+def run_with_flags(video_info, flags, capsys):
+    captured = {}
+    session = _fake_session(captured)
+
+    with (
+        patch("yt_dlp.YoutubeDL", _mock_yt_dlp(video_info)),
+        patch("yt_subs.subtitles.default_session", return_value=session),
+        patch("yt_subs.summarizer.default_session", return_value=session),
+    ):
+        exit_code = main(["-l", "en", *flags.split(), "https://youtube.com/watch?v=test"])
+
+    output = capsys.readouterr()
+    return {
+        "exit_code": exit_code,
+        "stdout": output.out,
+        "stderr": output.err,
+        "payload": captured.get("payload"),
+    }
+
+
 @when(
     parsers.parse('I run the CLI with "-l xx" and a URL'),
     target_fixture="cli_result",
 )
 def run_with_bad_lang(video_info, capsys):
-    with patch("yt_subs.subtitles.yt_dlp.YoutubeDL", _mock_yt_dlp(video_info)):
+    with patch("yt_dlp.YoutubeDL", _mock_yt_dlp(video_info)):
         exit_code = main(["-l", "xx", "https://youtube.com/watch?v=test"])
 
     captured = capsys.readouterr()
@@ -164,7 +176,7 @@ def run_with_bad_lang(video_info, capsys):
     target_fixture="cli_result",
 )
 def run_no_lang_no_subs(video_info, capsys):
-    with patch("yt_subs.subtitles.yt_dlp.YoutubeDL", _mock_yt_dlp(video_info)):
+    with patch("yt_dlp.YoutubeDL", _mock_yt_dlp(video_info)):
         exit_code = main(["https://youtube.com/watch?v=test"])
 
     captured = capsys.readouterr()
@@ -198,6 +210,30 @@ def check_error_contains(cli_result, text):
     )
 
 
+@then("the summarization request should keep the model loaded for ever")
+def check_keep_alive_forever(cli_result):
+    assert cli_result["payload"]["keep_alive"] == -1
+
+
+@then(
+    parsers.parse(
+        "the summarization request should carry options num_ctx={num_ctx:d} "
+        "and temperature={temperature:g}"
+    )
+)
+def check_cli_options(cli_result, num_ctx, temperature):
+    assert cli_result["payload"]["options"] == {"num_ctx": num_ctx, "temperature": temperature}
+
+
+@then(
+    parsers.parse('the summarization request should send "{line}" with the timestamped prompt')
+)
+def check_timestamped_request(cli_result, line):
+    prompt = cli_result["payload"]["prompt"]
+    assert prompt.startswith(DEFAULT_TIMESTAMPED_PROMPT)
+    assert line in prompt.splitlines()
+
+
 @then(parsers.parse('the summarizer should use model "{model}"'))
 def check_model_used(cli_result, model):
     assert cli_result.get("model") == model
@@ -0,0 +1,114 @@
+import io
+import json
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs import metrics
+from yt_subs.compress import CompressingSummarizer, compress_transcript
+from yt_subs.tokens import estimate_tokens
+from yt_subs.types import DEFAULT_SUMMARIZATION_PROMPT
+
+scenarios("features/compression.feature")
+
+FILLER = (
+    "so yeah we are going to talk about it",
+    "um and yeah so we are going to do that",
+    "and so you know we talk about that now",
+)
+INFORMATIVE = (
+    "Nix builds every package in an isolated sandbox.",
+    "Derivations pin compilers, libraries and patches by hash.",
+    "Binary caches substitute prebuilt outputs automatically.",
+    "Flakes lock inputs in a versioned lockfile.",
+    "Rollbacks switch generations atomically after failures.",
+)
+
+
+class RecordingBackend:
+    def __init__(self):
+        self.transcripts: list[str] = []
+
+    def summarize(self, transcript: str, prompt: str) -> str:
+        self.transcripts.append(transcript)
+        return "summary"
+
+
+@pytest.fixture
+def metrics_stream():
+    stream = io.StringIO()
+    yield stream
+    metrics.disable()
+
+
+@given(
+    parsers.parse(
+        "a transcript of {filler:d} filler lines with {informative:d} informative lines"
+    ),
+    target_fixture="transcript",
+)
+def transcript_with_filler(filler, informative):
+    lines = [FILLER[i % len(FILLER)] for i in range(filler)]
+    step = max(1, filler // informative)
+    for n, sentence in enumerate(INFORMATIVE[:informative]):
+        lines.insert(n * (step + 1), sentence)
+    return "\n".join(lines)
+
+
+@given("metrics recorded as JSON lines")
+def record_metrics(metrics_stream):
+    metrics.enable(metrics.JSONLinesRecorder(metrics_stream))
+
+
+@when(parsers.parse("I compress it to {budget:d} tokens"), target_fixture="compressed")
+def do_compress(transcript, budget):
+    return {"budget": budget, "result": compress_transcript(transcript, budget)}
+
+
+@when(
+    parsers.parse(
+        "I summarize it through a compressing summarizer with a budget of {budget:d} tokens"
+    ),
+    target_fixture="backend",
+)
+def do_summarize(transcript, budget):
+    backend = RecordingBackend()
+    CompressingSummarizer(backend, budget).summarize(transcript, DEFAULT_SUMMARIZATION_PROMPT)
+    return backend
+
+
+@then(parsers.parse("the result should fit in {budget:d} tokens"))
+def check_budget(compressed, budget):
+    assert compressed["result"].tokens <= budget
+    assert estimate_tokens(compressed["result"].text) <= budget
+
+
+@then("the informative lines should be kept in their original order")
+def check_informative(compressed):
+    kept = [line for line in compressed["result"].text.splitlines() if line in INFORMATIVE]
+    assert kept == list(INFORMATIVE)
+
+
+@then(parsers.parse("the compression ratio should be at least {ratio:d}"))
+def check_ratio(compressed, ratio):
+    assert compressed["result"].ratio >= ratio
+
+
+@then("the result should be the original transcript")
+def check_unchanged(compressed, transcript):
+    assert compressed["result"].text == transcript
+    assert compressed["result"].ratio == 1.0
+
+
+@then(parsers.parse("the backend should receive at most {budget:d} tokens"))
+def check_backend_input(backend, budget):
+    assert len(backend.transcripts) == 1
+    assert estimate_tokens(backend.transcripts[0]) <= budget
+
+
+@then('a "compress" span should report the token counts')
+def check_span(metrics_stream):
+    records = [json.loads(line) for line in metrics_stream.getvalue().splitlines()]
+    compress = next(r for r in records if r["stage"] == "compress")
+    assert compress["tokens_in"] > compress["tokens_out"]
+    assert compress["ratio"] >= 1
@@ -0,0 +1,96 @@
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs.cleaning import clean_subtitle
+from yt_subs.cues import CueTrack, parse_cues
+from yt_subs.formats import parse_track
+from yt_subs.types import SubtitleContent
+
+scenarios("features/timestamped_cues.feature")
+
+
+@given("the sample VTT subtitle", target_fixture="subtitle")
+def sample_subtitle(sample_vtt_text, english_manual_language):
+    return SubtitleContent(language=english_manual_language, raw_text=sample_vtt_text)
+
+
+@given(
+    parsers.parse('a VTT subtitle whose caption text contains "{text}"'),
+    target_fixture="subtitle",
+)
+def arrow_subtitle(english_manual_language, text):
+    raw_text = f"WEBVTT\n\n00:00:01.000 --> 00:00:02.000\n{text}\nthen stop\n"
+    return SubtitleContent(language=english_manual_language, raw_text=raw_text)
+
+
+@given(
+    parsers.parse("cues at {starts} seconds lasting {length:d} seconds each"),
+    target_fixture="track",
+)
+def cues_at(starts, length):
+    times = [float(t) for t in starts.replace(" and ", ", ").split(", ")]
+    return CueTrack.from_cues((t, t + length, f"cue {i}") for i, t in enumerate(times))
+
+
+@when("I parse its cues", target_fixture="track")
+def do_parse(subtitle):
+    return parse_cues(subtitle.raw_text.splitlines())
+
+
+@when(
+    parsers.parse("I take the cues between {start:g} and {end:g} seconds"),
+    target_fixture="track_slice",
+)
+def do_between(track, start, end):
+    return track.between(start, end)
+
+
+@when(parsers.parse("I split them at gaps of {gap:g} seconds"), target_fixture="segments")
+def do_segments(track, gap):
+    return track.segments(gap)
+
+
+@then("the cue text should equal the cleaned transcript")
+def check_text(track, subtitle):
+    assert track.text == clean_subtitle(subtitle).text
+    assert [cue.text for cue in track] == track.text.splitlines()
+
+
+@then(parsers.parse("the first cue should run from {start:g} to {end:g} seconds"))
+def check_first(track, start, end):
+    assert (track[0].start, track[0].end) == (start, end)
+
+
+@then(parsers.parse('the cue "{text}" should run from {start:g} to {end:g} seconds'))
+def check_span(track, text, start, end):
+    cue = next(cue for cue in track if cue.text == text)
+    assert (cue.start, cue.end) == (start, end)
+
+
+@then(parsers.parse('the slice should hold "{first}" and "{second}"'))
+def check_slice(track_slice, first, second):
+    assert [cue.text for cue in track_slice] == [first, second]
+    assert track_slice.text == f"{first}\n{second}"
+
+
+@then(parsers.parse("there should be {count:d} segments of {sizes} cues"))
+def check_segments(segments, count, sizes):
+    expected = [int(n) for n in sizes.replace(" and ", ", ").split(", ")]
+    assert len(segments) == count
+    assert [len(segment) for segment in segments] == expected
+    assert sum(len(s.text.splitlines()) for s in segments) == sum(expected)
+
+
+@then(parsers.parse('the timestamped text should start with "{line}"'))
+def check_first_line(track, line):
+    assert track.timestamped_text().splitlines()[0] == line
+
+
+@then(parsers.parse('the timestamped text should end with "{line}"'))
+def check_last_line(track, line):
+    assert track.timestamped_text().splitlines()[-1] == line
+
+
+@then(parsers.parse('parsing it as a "{ext}" track should give the same timestamped text'))
+def check_parse_track(track, subtitle, ext):
+    parsed = parse_track(subtitle.raw_text.splitlines(), ext)
+    assert parsed.timestamped_text() == track.timestamped_text()
@@ -0,0 +1,158 @@
+import json
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs.cleaning import clean_subtitle
+from yt_subs.formats import parse_track, select_format
+from yt_subs.types import (
+    SubtitleContent,
+    SubtitleDownloadError,
+    SubtitleFormat,
+    SubtitleLanguage,
+    SubtitleSource,
+)
+
+scenarios("features/subtitle_formats.feature")
+
+# (start ms, duration ms, text) of the captions in fixtures/sample.vtt after
+# cleaning, as a structured format holds them: once each, with no markup.
+CAPTIONS = [
+    (0, 3000, "Hello and welcome to this video"),
+    (3000, 6000, "Today we will talk about Nix"),
+    (9000, 3000, "Nix is a powerful package manager"),
+    (12000, 3000, "It provides reproducible builds"),
+]
+
+
+def _xml_escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _json3() -> str:
+    events = [{"tStartMs": 0, "dDurationMs": 15000, "id": 1}]
+    for start, duration, text in CAPTIONS:
+        first, *rest = text.split(" ")
+        segs = [{"utf8": first}] + [{"utf8": f" {word}", "tOffsetMs": 100} for word in rest]
+        events.append({"tStartMs": start, "dDurationMs": duration, "segs": segs})
+        events.append({"tStartMs": start + duration, "aAppend": 1, "segs": [{"utf8": "\n"}]})
+    return json.dumps({"wireMagic": "pb3", "events": events}, indent=2)
+
+
+def _srv1() -> str:
+    texts = "".join(
+        f'<text start="{start / 1000}" dur="{duration / 1000}">{_xml_escape(text)}</text>'
+        for start, duration, text in CAPTIONS
+    )
+    return f'<?xml version="1.0" encoding="utf-8" ?><transcript>{texts}</transcript>'
+
+
+def _srv2() -> str:
+    texts = "\n".join(
+        f'<text t="{start}" d="{duration}">{_xml_escape(text)}</text>'
+        for start, duration, text in CAPTIONS
+    )
+    return f"<timedtext>\n{texts}\n</timedtext>"
+
+
+def _srv3() -> str:
+    paragraphs = "\n".join(
+        f'<p t="{start}" d="{duration}" w="1">'
+        + "".join(f"<s>{word} </s>" for word in text.split(" "))
+        + "</p>"
+        for start, duration, text in CAPTIONS
+    )
+    return f'<timedtext format="3">\n<body>\n{paragraphs}\n</body>\n</timedtext>'
+
+
+def _ttml() -> str:
+    paragraphs = "\n".join(
+        f'<p begin="{start}ms" end="{start + duration}ms">{_xml_escape(text)}</p>'
+        for start, duration, text in CAPTIONS
+    )
+    return f'<tt xmlns="http://www.w3.org/ns/ttml"><body><div>\n{paragraphs}\n</div></body></tt>'
+
+
+DOCUMENTS = {"json3": _json3, "srv1": _srv1, "srv2": _srv2, "srv3": _srv3, "ttml": _ttml}
+
+
+def _language(*exts: str) -> SubtitleLanguage:
+    return SubtitleLanguage(
+        code="en",
+        name="English",
+        source=SubtitleSource.AUTO,
+        formats=tuple(
+            SubtitleFormat(ext=ext, url=f"https://example.com/en.{ext}") for ext in exts
+        ),
+    )
+
+
+@given(parsers.parse("the sample captions as {ext}"), target_fixture="content")
+def sample_captions(ext):
+    return SubtitleContent(language=_language(ext), raw_text=DOCUMENTS[ext](), ext=ext)
+
+
+@given(parsers.parse('a TTML paragraph "{markup}"'), target_fixture="content")
+def ttml_paragraph(markup):
+    paragraph = f'<p begin="0s" end="1s">{markup}</p>'
+    raw = f'<tt xmlns="http://www.w3.org/ns/ttml"><body><div>{paragraph}</div></body></tt>'
+    return SubtitleContent(language=_language("ttml"), raw_text=raw, ext="ttml")
+
+
+@given("a json3 document cut off halfway", target_fixture="content")
+def truncated_json3():
+    raw = _json3()
+    return SubtitleContent(language=_language("json3"), raw_text=raw[: len(raw) // 2], ext="json3")
+
+
+@given(parsers.parse("a language offering {exts}"), target_fixture="language")
+def language_offering(exts):
+    return _language(*exts.replace(" and ", ", ").split(", "))
+
+
+@when("I clean them", target_fixture="transcript")
+def do_clean(content):
+    return clean_subtitle(content)
+
+
+@when("I parse their cues", target_fixture="track")
+def do_parse_cues(content):
+    return parse_track(content.raw_text.splitlines(), content.ext)
+
+
+@when("I try to clean it", target_fixture="error")
+def try_clean(content):
+    with pytest.raises(SubtitleDownloadError) as exc_info:
+        clean_subtitle(content)
+    return exc_info.value
+
+
+@then("the transcript should match the cleaned sample VTT")
+def check_matches_vtt(transcript, sample_vtt_text, english_manual_language):
+    vtt = SubtitleContent(language=english_manual_language, raw_text=sample_vtt_text)
+    assert transcript.text == clean_subtitle(vtt).text
+
+
+@then(parsers.parse('the cue "{text}" should start at {start:g} seconds'))
+def check_cue_start(track, text, start):
+    assert next(cue for cue in track if cue.text == text).start == start
+
+
+@then(parsers.parse('the transcript should be "{first}" and "{second}"'))
+def check_lines(transcript, first, second):
+    assert transcript.text.splitlines() == [first, second]
+
+
+@then(parsers.parse('the selected format should be "{ext}"'))
+def check_selected(language, ext):
+    assert select_format(language).ext == ext
+
+
+@then(parsers.parse('with "{preferred}" preferred the selected format should be "{ext}"'))
+def check_preferred(language, preferred, ext):
+    assert select_format(language, preferred).ext == ext
+
+
+@then(parsers.parse('it should fail with a subtitle download error mentioning "{text}"'))
+def check_error(error, text):
+    assert text in str(error)
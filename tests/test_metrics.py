@@ -0,0 +1,168 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs import metrics
+from yt_subs.cli import main
+
+from .fixtures.fake_http import FakeSession, ollama_body, subtitle_body
+from .fixtures.yt_dlp_info import INFO_WITH_SUBS
+
+scenarios("features/metrics.feature")
+
+SAMPLE_VTT = """\
+WEBVTT
+
+00:00:00.000 --> 00:00:03.000
+Hello and welcome
+
+00:00:03.000 --> 00:00:06.000
+This is a test
+"""
+
+OLLAMA_STATS = {
+    "total_duration": 5_000_000_000,
+    "prompt_eval_count": 120,
+    "prompt_eval_duration": 1_000_000_000,
+    "eval_count": 42,
+    "eval_duration": 3_500_000_000,
+}
+
+
+@when("I open spans without enabling metrics", target_fixture="spans")
+def open_disabled_spans():
+    spans = []
+    for stage in ("download", "clean", "summarize"):
+        with metrics.span(stage, lang="en") as span:
+            span.set(bytes=10)
+            spans.append(span)
+    return spans
+
+
+@then("every span should be the shared no-op span")
+def check_noop(spans):
+    assert all(span is spans[0] for span in spans)
+    assert spans[0].recording is False
+
+
+@given(
+    "a video with English subtitles and an Ollama server reporting eval statistics",
+    target_fixture="session",
+)
+def session_with_stats():
+    def handler(method, url, body):
+        if body is not None:
+            stream = json.loads(body)["stream"]
+            return ollama_body("A short summary.", stream=stream, stats=OLLAMA_STATS)
+        return subtitle_body(SAMPLE_VTT, url)
+
+    return FakeSession(handler)
+
+
+@when(parsers.parse('I run the CLI with "--metrics {fmt}"'), target_fixture="cli_result")
+def run_with_metrics(session, fmt, tmp_path, capsys):
+    mock_ydl = MagicMock()
+    mock_ydl.extract_info.return_value = INFO_WITH_SUBS
+    ydl_cls = MagicMock()
+    ydl_cls.return_value.__enter__ = MagicMock(return_value=mock_ydl)
+    ydl_cls.return_value.__exit__ = MagicMock(return_value=False)
+    metrics_file = tmp_path / "metrics.out"
+
+    with (
+        patch("yt_dlp.YoutubeDL", ydl_cls),
+        patch("yt_subs.subtitles.default_session", return_value=session),
+        patch("yt_subs.summarizer.default_session", return_value=session),
+    ):
+        exit_code = main(
+            [
+                "-l", "en",
+                "--metrics", fmt,
+                "--metrics-file", str(metrics_file),
+                "https://youtube.com/watch?v=dQw4w9WgXcQ",
+            ]
+        )
+
+    captured = capsys.readouterr()
+    return {
+        "exit_code": exit_code,
+        "stderr": captured.err,
+        "metrics": metrics_file.read_text(),
+        "recorder_left_enabled": metrics.active_recorder() is not None,
+    }
+
+
+@when(
+    'I run the CLI with "--metrics jsonl" writing metrics into a directory',
+    target_fixture="cli_result",
+)
+def run_with_unwritable_metrics(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        main(
+            [
+                "--metrics", "jsonl",
+                "--metrics-file", str(tmp_path),
+                "https://youtube.com/watch?v=dQw4w9WgXcQ",
+            ]
+        )
+    return {"exit_code": exc_info.value.code, "stderr": capsys.readouterr().err}
+
+
+@then(parsers.parse('the command should fail with "{text}"'))
+def check_usage_error(cli_result, text):
+    assert cli_result["exit_code"] == 2
+    assert text in cli_result["stderr"]
+
+
+@then(parsers.parse("the exit code should be {code:d}"))
+def check_exit_code(cli_result, code):
+    assert cli_result["exit_code"] == code, cli_result["stderr"]
+    assert not cli_result["recorder_left_enabled"]
+
+
+def _records(cli_result) -> dict[str, dict]:
+    return {
+        record["stage"]: record
+        for record in map(json.loads, cli_result["metrics"].splitlines())
+    }
+
+
+@then(parsers.parse('the metrics should include the stages "{stages}"'))
+def check_stages(cli_result, stages):
+    records = _records(cli_result)
+    for stage in stages.split(", "):
+        assert stage in records
+        assert records[stage]["seconds"] >= 0
+
+
+@then("the download stage should report the format and bytes downloaded")
+def check_download(cli_result):
+    download = _records(cli_result)["download"]
+    assert download["format"] == "ttml"
+    assert download["bytes"] == len(subtitle_body(SAMPLE_VTT, "en.ttml"))
+    assert download["read_seconds"] >= 0
+
+
+@then("the transcript stage should report line and character counts")
+def check_transcript(cli_result):
+    transcript = _records(cli_result)["transcript"]
+    assert transcript["lines"] == 2
+    assert transcript["chars"] == len("Hello and welcome\nThis is a test")
+
+
+@then("the summarize stage should report Ollama's eval statistics")
+def check_summarize(cli_result):
+    summarize = _records(cli_result)["summarize"]
+    for field, value in OLLAMA_STATS.items():
+        assert summarize[field] == value
+
+
+@then(parsers.parse('the metrics text should count {count:d} "{stage}" stage'))
+def check_prometheus_count(cli_result, count, stage):
+    assert f'yt_subs_stage_seconds_count{{stage="{stage}"}} {count}' in cli_result["metrics"]
+
+
+@then(parsers.parse('the metrics text should total {value:d} "{name}" for "{stage}"'))
+def check_prometheus_total(cli_result, value, name, stage):
+    assert f'yt_subs_{name}_total{{stage="{stage}"}} {value}' in cli_result["metrics"]
@@ -0,0 +1,148 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs.cli import main
+
+from .fixtures.fake_http import FakeSession, subtitle_body
+from .fixtures.yt_dlp_info import INFO_WITH_SUBS
+
+scenarios("features/multi_language.feature")
+
+VIDEO_URL = "https://youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+class FakeYoutubeDL:
+    """Stand-in for yt_dlp.YoutubeDL that counts extractions."""
+
+    extractions = 0
+
+    def __init__(self, opts):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def extract_info(self, url, download=True):
+        FakeYoutubeDL.extractions += 1
+        return INFO_WITH_SUBS
+
+
+class EchoSummarizer:
+    """Summarizes a transcript as its first line, so each language is traceable."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def summarize(self, transcript: str, prompt: str) -> str:
+        with self._lock:
+            self.calls += 1
+        return f"Summary: {transcript.splitlines()[0]}"
+
+
+def _subtitle_for(method, url, body):
+    code = url.rsplit("/", 1)[-1].split(".")[0]
+    return subtitle_body(f"WEBVTT\n\n00:00:00.000 --> 00:00:02.000\nspoken in {code}\n", url)
+
+
+@pytest.fixture
+def session():
+    return FakeSession(_subtitle_for)
+
+
+@given("a video with subtitles in several languages")
+def video_with_languages():
+    FakeYoutubeDL.extractions = 0
+
+
+def _run(argv, session, capsys):
+    with (
+        patch("yt_dlp.YoutubeDL", FakeYoutubeDL),
+        patch("yt_subs.subtitles.default_session", return_value=session),
+    ):
+        exit_code = main(argv, summarizer=EchoSummarizer())
+    captured = capsys.readouterr()
+    return {"exit_code": exit_code, "stdout": captured.out, "stderr": captured.err}
+
+
+@when(parsers.parse('I run the CLI with "{flags}" on the video'), target_fixture="cli_result")
+def run_on_video(flags, session, capsys):
+    return _run([*flags.split(), "--no-cache", VIDEO_URL], session, capsys)
+
+
+@when(
+    parsers.parse('I run the CLI with "{flags}" and an output directory'),
+    target_fixture="cli_result",
+)
+def run_with_output_dir(flags, session, capsys, tmp_path):
+    output_dir = tmp_path / "summaries"
+    result = _run([*flags.split(), "-o", str(output_dir), VIDEO_URL], session, capsys)
+    result["output_dir"] = output_dir
+    return result
+
+
+@when(
+    parsers.parse("I choose language {choice:d} from the menu and run the CLI with an output directory"),
+    target_fixture="cli_result",
+)
+def run_with_menu_choice(choice, session, capsys, tmp_path):
+    with patch("builtins.input", return_value=str(choice)):
+        return run_with_output_dir("", session, capsys, tmp_path)
+
+
+@when(parsers.parse('I run the CLI with "{flags}" on two videos'), target_fixture="cli_result")
+def run_on_two_videos(flags, session, capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        main([*flags.split(), VIDEO_URL, VIDEO_URL], summarizer=EchoSummarizer())
+    return {"exit_code": exc_info.value.code, "stderr": capsys.readouterr().err}
+
+
+@then(parsers.parse("the exit code should be {code:d}"))
+def check_exit_code(cli_result, code):
+    assert cli_result["exit_code"] == code, cli_result["stderr"]
+
+
+@then(parsers.parse('the output should have summaries for "{first}" and "{second}"'))
+def check_two_summaries(cli_result, first, second):
+    for code in (first, second):
+        assert f"== {code} ==\nSummary: spoken in {code}" in cli_result["stdout"]
+
+
+@then(parsers.parse('the output should have a summary for "{code}"'))
+def check_summary(cli_result, code):
+    assert f"== {code} ==\nSummary: spoken in {code}" in cli_result["stdout"]
+
+
+@then("the video metadata should have been extracted once")
+def check_single_extraction():
+    assert FakeYoutubeDL.extractions == 1
+
+
+@then(parsers.parse('the "{first}" and "{second}" subtitles should have been downloaded'))
+def check_downloads(session, first, second):
+    codes = sorted(r["url"].rsplit("/", 1)[-1].split(".")[0] for r in session.requests)
+    assert codes == [first, second]
+
+
+@then(parsers.parse('the output directory should hold a summary for each of "{codes}"'))
+def check_output_files(cli_result, codes):
+    for code in codes.split(", "):
+        path = cli_result["output_dir"] / f"dQw4w9WgXcQ.{code}.txt"
+        assert path.read_text(encoding="utf-8") == f"Summary: spoken in {code}\n"
+
+
+@then(parsers.parse('the error output should mention "{text}"'))
+def check_error_output(cli_result, text):
+    assert text in cli_result["stderr"]
+
+
+@then(parsers.parse('the command should fail with "{text}"'))
+def check_usage_error(cli_result, text):
+    assert cli_result["exit_code"] == 2
+    assert text in cli_result["stderr"]
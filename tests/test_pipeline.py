@@ -0,0 +1,120 @@
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs.cli import main
+from yt_subs.pipeline import run_batch
+from yt_subs.types import SubtitleFormat, SubtitleLanguage, SubtitleSource
+
+scenarios("features/batch_processing.feature")
+
+FAILING_URL = "https://youtube.com/watch?v=broken"
+
+
+class RecordingSummarizer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: list[str] = []
+
+    def summarize(self, transcript: str, prompt: str) -> str:
+        with self._lock:
+            self.calls.append(transcript)
+        return f"summary of {transcript}"
+
+
+def _fake_list_languages(url, cache=None, refresh=False):
+    if url == FAILING_URL:
+        raise RuntimeError("extraction failed")
+    return [
+        SubtitleLanguage(
+            code="en",
+            name="English",
+            source=SubtitleSource.MANUAL,
+            formats=(SubtitleFormat(ext="vtt", url=f"{url}&fmt=vtt"),),
+        )
+    ]
+
+
+def _fake_stream(language, preferred_ext="vtt", session=None):
+    video = language.formats[0].url.split("v=")[1].split("&")[0]
+    yield from ["WEBVTT", "", f"Talk {video}"]
+
+
+@pytest.fixture
+def batch_env():
+    with (
+        patch("yt_subs.pipeline.list_languages", side_effect=_fake_list_languages),
+        patch("yt_subs.pipeline.stream_subtitle_lines", side_effect=_fake_stream),
+    ):
+        yield
+
+
+@given(parsers.parse("{count:d} videos with English subtitles"), target_fixture="urls")
+def videos(count):
+    return [f"https://youtube.com/watch?v=video{i}" for i in range(count)]
+
+
+@given("a video whose metadata extraction fails")
+def failing_video(urls):
+    urls.append(FAILING_URL)
+
+
+@given("a file listing the video URLs", target_fixture="url_file")
+def url_file(urls, tmp_path):
+    path = tmp_path / "urls.txt"
+    path.write_text("# videos\n" + "\n".join(urls) + "\n\n")
+    return path
+
+
+@when(
+    parsers.parse("I run the batch with {io:d} I/O workers and {llm:d} summary workers"),
+    target_fixture="batch",
+)
+def do_run_batch(urls, io, llm, batch_env):
+    summarizer = RecordingSummarizer()
+    results = list(
+        run_batch(urls, summarizer, lang="en", io_workers=io, summary_workers=llm)
+    )
+    return {"results": results, "summarizer": summarizer}
+
+
+@when('I run the CLI with "-l en" and the URL file', target_fixture="cli_result")
+def run_cli_with_file(url_file, batch_env, capsys):
+    exit_code = main(["-l", "en", "-i", str(url_file)], summarizer=RecordingSummarizer())
+    captured = capsys.readouterr()
+    return {"exit_code": exit_code, "stdout": captured.out, "stderr": captured.err}
+
+
+@then(parsers.parse("I should get {count:d} successful results"))
+def check_successes(batch, count):
+    assert sum(r.ok for r in batch["results"]) == count
+
+
+@then("every video should be summarized exactly once")
+def check_summarized_once(batch, urls):
+    calls = batch["summarizer"].calls
+    assert len(calls) == len(urls)
+    assert len(set(calls)) == len(urls)
+    assert {r.url for r in batch["results"]} == set(urls)
+
+
+@then("the failing video should be reported with an error")
+def check_failure_reported(batch):
+    failed = [r for r in batch["results"] if not r.ok]
+    assert [r.url for r in failed] == [FAILING_URL]
+    assert "extraction failed" in failed[0].error
+
+
+@then(parsers.parse("the exit code should be {code:d}"))
+def check_exit_code(cli_result, code):
+    assert cli_result["exit_code"] == code
+
+
+@then("the output should contain one JSON line per video")
+def check_json_lines(cli_result, urls):
+    records = [json.loads(line) for line in cli_result["stdout"].splitlines()]
+    assert sorted(r["url"] for r in records) == sorted(urls)
+    assert all(r["ok"] and r["summary"].startswith("summary of") for r in records)
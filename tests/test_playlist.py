@@ -0,0 +1,289 @@
+import json
+from unittest.mock import patch
+
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs.cli import main
+from yt_subs.playlist import SyncState, iter_new_video_ids, iter_playlist_video_ids
+from yt_subs.subtitles import extract_video_id
+
+from .fixtures.fake_http import FakeSession, ollama_body, subtitle_body
+from .fixtures.yt_dlp_info import INFO_NO_SUBS, INFO_WITH_SUBS
+
+scenarios("features/playlist_sync.feature")
+
+CHANNEL_URL = "https://www.youtube.com/@example"
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PLexample"
+SAMPLE_VTT = "WEBVTT\n\n00:00:00.000 --> 00:00:03.000\nHello and welcome\n"
+
+
+def _video_id(n: int) -> str:
+    return f"vid{n:08d}"
+
+
+class FakeChannel:
+    """Stand-in for yt_dlp.YoutubeDL serving a channel with two tabs.
+
+    Tab entries are produced lazily and counted, like yt-dlp's paged
+    ``lazy_playlist`` results.
+    """
+
+    def __init__(self, videos: int, shorts: int):
+        self.videos = [_video_id(n) for n in range(videos)]
+        self.shorts = [_video_id(videos + n) for n in range(shorts)]
+        self.listed = 0
+        self.resolved: list[str] = []
+        self.options: list[dict] = []
+        self.without_subtitles: set[str] = set()
+
+    def __call__(self, opts):
+        self.options.append(opts)
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def _entries(self, ids):
+        for video_id in ids:
+            self.listed += 1
+            yield {
+                "_type": "url",
+                "ie_key": "Youtube",
+                "id": video_id,
+                "url": f"https://www.youtube.com/watch?v={video_id}",
+            }
+
+    def extract_info(self, url, download=True, process=True):
+        if url == CHANNEL_URL:
+            tabs = [f"{CHANNEL_URL}/videos", f"{CHANNEL_URL}/shorts"]
+            entries = [{"_type": "url", "ie_key": "YoutubeTab", "url": tab} for tab in tabs]
+            return {"_type": "playlist", "id": "UCexample", "entries": entries}
+        if url in (PLAYLIST_URL, f"{CHANNEL_URL}/videos"):
+            return {"_type": "playlist", "entries": self._entries(self.videos)}
+        if url.endswith("/shorts"):
+            return {"_type": "playlist", "entries": self._entries(self.shorts)}
+        self.resolved.append(url)
+        if extract_video_id(url) in self.without_subtitles:
+            return INFO_NO_SUBS
+        return INFO_WITH_SUBS
+
+
+@given(
+    parsers.parse(
+        "a channel with {videos:d} videos on its videos tab and {shorts:d} on its shorts tab"
+    ),
+    target_fixture="channel",
+)
+def channel_fixture(videos, shorts):
+    return FakeChannel(videos, shorts)
+
+
+@given(
+    parsers.parse("a sync state in which the {count:d} oldest videos are already processed"),
+    target_fixture="state_path",
+)
+def partial_state(channel, tmp_path, count):
+    state = SyncState(tmp_path / "state.json")
+    for video_id in channel.videos[-count:]:
+        state.mark(video_id)
+    state.save()
+    return state.path
+
+
+@given(
+    parsers.parse("a playlist of {count:d} videos"),
+    target_fixture="channel",
+)
+def playlist_fixture(count):
+    return FakeChannel(count, 0)
+
+
+@given(
+    parsers.parse("a sync state in which the first {count:d} playlist videos are processed"),
+    target_fixture="state_path",
+)
+def playlist_state(channel, tmp_path, count):
+    state = SyncState(tmp_path / "state.json")
+    for video_id in channel.videos[:count]:
+        state.mark(video_id)
+    state.save()
+    return state.path
+
+
+@given("an empty sync state", target_fixture="state_path")
+def empty_state(tmp_path):
+    return tmp_path / "state.json"
+
+
+@given(parsers.parse("video {index:d} of the channel has no subtitles"))
+def without_subtitles(channel, index):
+    channel.without_subtitles.add(channel.videos[index])
+
+
+@given("a sync state in a directory that cannot be created", target_fixture="state_path")
+def unwritable_state(tmp_path):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    return blocker / "state.json"
+
+
+@given("a sync state in which every video is already processed", target_fixture="state_path")
+def full_state(channel, tmp_path):
+    state = SyncState(tmp_path / "state.json")
+    for video_id in channel.videos + channel.shorts:
+        state.mark(video_id)
+    state.save()
+    return state.path
+
+
+@given(
+    "a sync state in which every video on the videos tab is already processed",
+    target_fixture="state_path",
+)
+def videos_tab_state(channel, tmp_path):
+    state = SyncState(tmp_path / "state.json")
+    for video_id in channel.videos:
+        state.mark(video_id)
+    state.save()
+    return state.path
+
+
+@when("I list the channel's video IDs", target_fixture="video_ids")
+def list_channel(channel):
+    with patch("yt_dlp.YoutubeDL", channel):
+        return list(iter_playlist_video_ids(CHANNEL_URL))
+
+
+@when(parsers.parse('I run "sync -l en" on the channel again'), target_fixture="cli_result")
+@when(parsers.parse('I run "sync -l en" on the channel'), target_fixture="cli_result")
+def run_sync(channel, state_path, capsys):
+    channel.resolved.clear()
+    summarized = []
+
+    def handler(method, url, body):
+        if body is not None:
+            summarized.append(json.loads(body))
+            return ollama_body("A summary.", stream=False)
+        return subtitle_body(SAMPLE_VTT, url)
+
+    session = FakeSession(handler)
+    with (
+        patch("yt_dlp.YoutubeDL", channel),
+        patch("yt_subs.subtitles.default_session", return_value=session),
+        patch("yt_subs.summarizer.default_session", return_value=session),
+    ):
+        exit_code = main(
+            ["sync", "-l", "en", "--state", str(state_path), "--no-cache", CHANNEL_URL]
+        )
+
+    captured = capsys.readouterr()
+    records = [json.loads(line) for line in captured.out.splitlines()]
+    return {"exit_code": exit_code, "records": records, "stderr": captured.err}
+
+
+@when(
+    parsers.parse('I run "sync -l en" on the channel, saving after every video'),
+    target_fixture="cli_result",
+)
+def run_sync_saving_often(channel, state_path, capsys):
+    with patch("yt_subs.cli._SYNC_SAVE_EVERY", 1):
+        return run_sync(channel, state_path, capsys)
+
+
+@when("I look for new videos in the channel", target_fixture="video_ids")
+def find_new(channel, state_path):
+    with patch("yt_dlp.YoutubeDL", channel):
+        return list(iter_new_video_ids([CHANNEL_URL], SyncState(state_path)))
+
+
+@when("I look for new videos in the playlist", target_fixture="video_ids")
+def find_new_in_playlist(channel, state_path):
+    with patch("yt_dlp.YoutubeDL", channel):
+        return list(iter_new_video_ids([PLAYLIST_URL], SyncState(state_path)))
+
+
+@then(parsers.parse("I should get all {count:d} video IDs in listing order"))
+def check_all_ids(video_ids, channel, count):
+    assert video_ids == channel.videos + channel.shorts
+    assert len(video_ids) == count
+
+
+@then("no video should have been resolved individually")
+def check_flat(channel):
+    assert channel.resolved == []
+    assert channel.options[0]["extract_flat"] == "in_playlist"
+
+
+@then(parsers.parse("the exit code should be {code:d}"))
+def check_exit_code(cli_result, code):
+    assert cli_result["exit_code"] == code, cli_result["stderr"]
+
+
+@then(parsers.parse("only the {count:d} newest videos should be summarized"))
+def check_new_only(cli_result, channel, count):
+    urls = sorted(record["url"] for record in cli_result["records"])
+    expected = sorted(
+        f"https://www.youtube.com/watch?v={video_id}" for video_id in channel.videos[:count]
+    )
+    assert urls == expected
+    assert all(record["ok"] for record in cli_result["records"])
+    assert sorted(channel.resolved) == expected
+
+
+@then(parsers.parse("the sync state should list all {count:d} videos"))
+def check_state(state_path, channel, count):
+    state = SyncState(state_path)
+    assert len(state) == count
+    assert all(video_id in state for video_id in channel.videos)
+
+
+@then("no new videos should be found")
+def check_none_new(video_ids):
+    assert video_ids == []
+
+
+@then(parsers.parse("only the first {count:d} entries should have been listed"))
+def check_listed(channel, count):
+    assert channel.listed == count
+
+
+@then(parsers.parse("the {count:d} shorts should be found"))
+def check_shorts(video_ids, channel, count):
+    assert video_ids == channel.shorts
+    assert len(video_ids) == count
+
+
+@then(parsers.parse("the last {count:d} playlist videos should be found"))
+def check_appended(video_ids, channel, count):
+    assert video_ids == channel.videos[-count:]
+
+
+@then(parsers.parse("video {index:d} should be recorded as failed in the sync state"))
+def check_failed(state_path, channel, index):
+    state = SyncState(state_path)
+    assert state.failed == {channel.videos[index]}
+    assert channel.videos[index] in state
+
+
+@then("every video should have been summarized")
+def check_all_summarized(cli_result, channel):
+    assert [record["ok"] for record in cli_result["records"]] == [True] * len(channel.videos)
+
+
+@then(parsers.parse('the error output should mention "{text}"'))
+def check_error_output(cli_result, text):
+    assert text in cli_result["stderr"]
+
+
+@then(parsers.parse('the error output should not mention "{text}"'))
+def check_no_error_output(cli_result, text):
+    assert text not in cli_result["stderr"]
+
+
+@then("no video should have been extracted")
+def check_none_extracted(channel, cli_result):
+    assert channel.resolved == []
+    assert cli_result["records"] == []
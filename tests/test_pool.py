@@ -0,0 +1,219 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs.pool import ROUND_ROBIN, CircuitBreaker, PooledSummarizer
+from yt_subs.types import DEFAULT_SUMMARIZATION_PROMPT, SummarizationError
+
+scenarios("features/summarizer_pool.feature")
+
+COOLDOWN = 30.0
+
+
+class FakeBackend:
+    """One model host: serves a request at a time, like a single GPU."""
+
+    def __init__(self, name: str, delay: float = 0.0, failing: bool = False):
+        self.base_url = name
+        self.delay = delay
+        self.failing = failing
+        self.calls = 0
+        self.served = 0
+        self._busy = threading.Lock()
+
+    def _work(self) -> str:
+        self.calls += 1
+        if self.failing:
+            raise SummarizationError(f"{self.base_url} is down")
+        with self._busy:
+            time.sleep(self.delay)
+        self.served += 1
+        return f"summary from {self.base_url}"
+
+    def summarize(self, transcript: str, prompt: str) -> str:
+        return self._work()
+
+    def stream(self, transcript: str, prompt: str):
+        summary = self._work()
+        for word in summary.split(" "):
+            yield word + " "
+
+    def ping(self) -> bool:
+        return not self.failing
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _run_concurrently(pool: PooledSummarizer, count: int) -> list[str]:
+    with ThreadPoolExecutor(count) as executor:
+        futures = [
+            executor.submit(pool.summarize, "transcript", DEFAULT_SUMMARIZATION_PROMPT)
+            for _ in range(count)
+        ]
+        return [f.result() for f in futures]
+
+
+def _timed_run(backend_count: int, requests: int, delay: float) -> float:
+    backends = [FakeBackend(f"host{i}", delay=delay) for i in range(backend_count)]
+    start = time.perf_counter()
+    _run_concurrently(PooledSummarizer(backends), requests)
+    return time.perf_counter() - start
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@given(
+    parsers.parse("a pool of {count:d} backends that each take {ms:d} ms per request"),
+    target_fixture="pool",
+)
+def delayed_pool(count, ms):
+    backends = [FakeBackend(f"host{i}", delay=ms / 1000) for i in range(count)]
+    return {"backends": backends, "pool": PooledSummarizer(backends)}
+
+
+@given(
+    parsers.parse("a round-robin pool of backends weighted {first:d} and {second:d}"),
+    target_fixture="pool",
+)
+def weighted_pool(first, second):
+    backends = [FakeBackend("host0"), FakeBackend("host1")]
+    pool = PooledSummarizer(backends, weights=[first, second], strategy=ROUND_ROBIN)
+    return {"backends": backends, "pool": pool}
+
+
+@given(
+    parsers.parse("a pool where the first of {count:d} backends always fails"),
+    target_fixture="pool",
+)
+def partly_failing_pool(count, clock):
+    backends = [FakeBackend(f"host{i}", failing=i == 0) for i in range(count)]
+    pool = PooledSummarizer(backends, failure_threshold=3, cooldown=COOLDOWN, clock=clock)
+    return {"backends": backends, "pool": pool}
+
+
+@given(parsers.parse("a pool where all {count:d} backends fail"), target_fixture="pool")
+def failing_pool(count):
+    backends = [FakeBackend(f"host{i}", failing=True) for i in range(count)]
+    return {"backends": backends, "pool": PooledSummarizer(backends)}
+
+
+@given(parsers.parse("{count:d} summaries have been requested"))
+def summaries_requested(pool, count):
+    for _ in range(count):
+        pool["pool"].summarize("transcript", DEFAULT_SUMMARIZATION_PROMPT)
+
+
+@given(
+    parsers.parse(
+        "{requests:d} concurrent summaries on 1 backend taking {ms:d} ms each"
+    ),
+    target_fixture="timings",
+)
+def single_backend_timing(requests, ms):
+    return {
+        "requests": requests,
+        "delay": ms / 1000,
+        "single": _timed_run(1, requests, ms / 1000),
+    }
+
+
+@when(parsers.parse("{count:d} summaries are requested concurrently"), target_fixture="summaries")
+def request_concurrently(pool, count):
+    return _run_concurrently(pool["pool"], count)
+
+
+@when(
+    parsers.parse("{count:d} summaries are requested one after another"),
+    target_fixture="summaries",
+)
+def request_sequentially(pool, count):
+    return [
+        pool["pool"].summarize("transcript", DEFAULT_SUMMARIZATION_PROMPT)
+        for _ in range(count)
+    ]
+
+
+@when("the failing backend recovers and the cooldown passes")
+def recover(pool, clock):
+    pool["backends"][0].failing = False
+    clock.now += COOLDOWN
+
+
+@when("a summary is streamed", target_fixture="summaries")
+def request_stream(pool):
+    return ["".join(pool["pool"].stream("transcript", DEFAULT_SUMMARIZATION_PROMPT))]
+
+
+@when("a summary is requested", target_fixture="pool_error")
+def request_failing(pool):
+    with pytest.raises(SummarizationError) as exc_info:
+        pool["pool"].summarize("transcript", DEFAULT_SUMMARIZATION_PROMPT)
+    return exc_info.value
+
+
+@when(
+    parsers.parse("the same summaries run on {count:d} such backends"),
+    target_fixture="timings",
+)
+def pooled_timing(timings, count):
+    timings["pooled"] = _timed_run(count, timings["requests"], timings["delay"])
+    return timings
+
+
+@then(parsers.parse("every backend should have served {count:d} requests"))
+def check_even(pool, count):
+    assert [b.served for b in pool["backends"]] == [count] * len(pool["backends"])
+
+
+@then(parsers.parse("the backends should have served {first:d} and {second:d} requests"))
+def check_weighted(pool, first, second):
+    assert [b.served for b in pool["backends"]] == [first, second]
+
+
+@then(parsers.parse("all {count:d} summaries should succeed"))
+def check_all_succeeded(summaries, count):
+    assert summaries == ["summary from host1"] * count
+
+
+@then(parsers.parse("the failing backend should have been tried {count:d} times"))
+def check_tried(pool, count):
+    assert pool["backends"][0].calls == count
+
+
+@then(parsers.parse("the failing backend's circuit should be {state}"))
+def check_circuit(pool, state):
+    stats = pool["pool"].stats()
+    assert stats[0]["state"] == {"open": CircuitBreaker.OPEN, "closed": CircuitBreaker.CLOSED}[state]
+
+
+@then("the recovered backend should have served a request")
+def check_recovered(pool):
+    assert pool["backends"][0].served >= 1
+
+
+@then("the stream should come from the second backend")
+def check_stream(summaries):
+    assert summaries[0].strip() == "summary from host1"
+
+
+@then("a summarization error naming both backends should be raised")
+def check_error(pool_error):
+    assert "host0" in str(pool_error)
+    assert "host1" in str(pool_error)
+
+
+@then(parsers.parse("they should finish at least {factor:d} times faster"))
+def check_scaling(timings, factor):
+    assert timings["single"] / timings["pooled"] >= factor
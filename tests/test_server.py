@@ -0,0 +1,259 @@
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs.cli import main
+from yt_subs.client import ServerClient
+from yt_subs.server import SubtitleServer, SubtitleService
+from yt_subs.types import NoSubtitlesAvailableError
+
+from .fixtures.fake_http import FakeSession, subtitle_body
+from .fixtures.http_server import LocalServer
+from .fixtures.yt_dlp_info import INFO_WITH_SUBS
+
+scenarios("features/server_mode.feature")
+
+VIDEO_URL = "https://youtube.com/watch?v=dQw4w9WgXcQ"
+SAMPLE_VTT = "WEBVTT\n\n00:00:00.000 --> 00:00:03.000\nHello and welcome\n"
+DAEMON_SUMMARY = "Summary from the daemon."
+LOCAL_SUMMARY = "Summary computed locally."
+
+
+class FakeYoutubeDL:
+    """Stand-in for yt_dlp.YoutubeDL that counts extractions."""
+
+    extractions = 0
+
+    def __init__(self, opts):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def extract_info(self, url, download=True):
+        FakeYoutubeDL.extractions += 1
+        return INFO_WITH_SUBS
+
+    def close(self):
+        pass
+
+
+class RecordingSummarizer:
+    def __init__(self, summary: str, gate: threading.Event | None = None):
+        self.summary = summary
+        self.gate = gate
+        self.calls = 0
+
+    def summarize(self, transcript: str, prompt: str) -> str:
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        return self.summary
+
+
+@pytest.fixture
+def subtitle_session():
+    session = FakeSession(lambda method, url, body: subtitle_body(SAMPLE_VTT, url))
+    FakeYoutubeDL.extractions = 0
+    with (
+        patch("yt_dlp.YoutubeDL", FakeYoutubeDL),
+        patch("yt_subs.subtitles.default_session", return_value=session),
+    ):
+        yield session
+
+
+class DroppingServer:
+    """Accepts connections and closes them before answering."""
+
+    def __init__(self):
+        self._sock = socket.create_server(("127.0.0.1", 0))
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self._sock.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            conn.recv(65536)
+            conn.close()
+
+    def close(self):
+        self._sock.close()
+
+
+def _start_daemon(summarizer):
+    service = SubtitleService(summarizer, workers=2)
+    server = SubtitleServer(("127.0.0.1", 0), service)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    return server, thread
+
+
+@pytest.fixture
+def daemon_factory(subtitle_session):
+    started = []
+
+    def start(summarizer):
+        server, thread = _start_daemon(summarizer)
+        started.append((server, thread))
+        return {"server": server, "service": server.service, "summarizer": summarizer}
+
+    yield start
+    for server, thread in started:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+@given("a running yt-subs daemon", target_fixture="daemon")
+def running_daemon(daemon_factory):
+    return daemon_factory(RecordingSummarizer(DAEMON_SUMMARY))
+
+
+@given("a running yt-subs daemon with a slow summarizer", target_fixture="daemon")
+def slow_daemon(daemon_factory):
+    return daemon_factory(RecordingSummarizer(DAEMON_SUMMARY, gate=threading.Event()))
+
+
+@given("a video with English subtitles and no daemon", target_fixture="daemon")
+def no_daemon(subtitle_session):
+    return None
+
+
+@pytest.fixture
+def dropping_server():
+    server = DroppingServer()
+    yield server
+    server.close()
+
+
+@given("a daemon that drops every connection without answering", target_fixture="daemon")
+def dropping_daemon(dropping_server):
+    return {"server": dropping_server}
+
+
+@pytest.fixture
+def plain_server():
+    with LocalServer({}) as server:
+        yield server
+
+
+@given("a server that is not a yt-subs daemon", target_fixture="daemon")
+def not_a_daemon(plain_server):
+    return {"server": plain_server}
+
+
+@when(
+    parsers.parse('a client asks the daemon to summarize a video in "{lang}"'),
+    target_fixture="client_result",
+)
+def ask_daemon(daemon, lang):
+    client = ServerClient(daemon["server"].url)
+    try:
+        return {"summary": client.summarize(VIDEO_URL, lang)}
+    except Exception as exc:
+        return {"error": exc}
+
+
+@when(
+    parsers.parse("{count:d} clients ask for the same video at once"),
+    target_fixture="client_results",
+)
+def ask_concurrently(daemon, count):
+    url = daemon["server"].url
+    inflight = daemon["service"].inflight
+    with ThreadPoolExecutor(count) as pool:
+        futures = [
+            pool.submit(ServerClient(url).summarize, VIDEO_URL, "en") for _ in range(count)
+        ]
+        deadline = time.monotonic() + 5
+        while inflight.shared < count - 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        daemon["summarizer"].gate.set()
+        return [f.result() for f in futures]
+
+
+@when('I run the CLI with "-l en" and the daemon\'s URL', target_fixture="cli_result")
+def run_cli_with_server(daemon, subtitle_session, capsys):
+    server_url = daemon["server"].url if daemon else "http://127.0.0.1:1"
+    exit_code = main(
+        ["-l", "en", "--no-cache", "--server", server_url, VIDEO_URL],
+        summarizer=RecordingSummarizer(LOCAL_SUMMARY),
+    )
+    captured = capsys.readouterr()
+    return {"exit_code": exit_code, "stdout": captured.out, "stderr": captured.err}
+
+
+@then("the client should receive the summary")
+def check_summary(client_result):
+    assert client_result["summary"] == ("en", DAEMON_SUMMARY)
+
+
+@then("the daemon should have extracted metadata once")
+def check_extracted_once():
+    assert FakeYoutubeDL.extractions == 1
+
+
+@then("every client should receive the summary")
+def check_all_summaries(client_results):
+    assert client_results == [("en", DAEMON_SUMMARY)] * len(client_results)
+
+
+@then("the summarizer should have run once")
+def check_summarized_once(daemon):
+    assert daemon["summarizer"].calls == 1
+    assert FakeYoutubeDL.extractions == 1
+
+
+@then("the client should get a NoSubtitlesAvailableError")
+def check_no_subs(client_result):
+    assert isinstance(client_result["error"], NoSubtitlesAvailableError)
+
+
+@then(parsers.parse("the exit code should be {code:d}"))
+def check_exit_code(cli_result, code):
+    assert cli_result["exit_code"] == code, cli_result["stderr"]
+
+
+@then("the CLI should print the daemon's summary")
+def check_daemon_summary(cli_result):
+    assert cli_result["stdout"].strip() == DAEMON_SUMMARY
+
+
+@then("the error output should mention that the server is not reachable")
+def check_unreachable(cli_result):
+    assert "not reachable" in cli_result["stderr"]
+
+
+@then(parsers.parse('the error output should mention "{text}"'))
+def check_error_output(cli_result, text):
+    assert text in cli_result["stderr"]
+
+
+@then("the CLI should not have processed the video locally")
+def check_not_local(cli_result):
+    assert LOCAL_SUMMARY not in cli_result["stdout"]
+    assert "processing locally" not in cli_result["stderr"]
+    assert FakeYoutubeDL.extractions == 0
+
+
+@then("the CLI should print the local summary")
+def check_local_summary(cli_result):
+    assert cli_result["stdout"].strip() == LOCAL_SUMMARY
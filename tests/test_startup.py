@@ -0,0 +1,70 @@
+import json
+import subprocess
+import sys
+
+from pytest_bdd import parsers, scenarios, then, when
+
+scenarios("features/startup.feature")
+
+HEAVY_MODULES = ("yt_dlp", "asyncio", "sqlite3", "http.server")
+
+# Cumulative ``-X importtime`` of yt_subs.cli, best of three runs. Importing
+# yt-dlp alone costs more than this, so pulling it back onto the startup
+# path fails the check even on slow machines.
+STARTUP_BUDGET_MS = 200
+
+
+def _run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+@when(
+    parsers.parse('I import "{module}" in a fresh interpreter'),
+    target_fixture="fresh_import",
+)
+def fresh_import(module):
+    code = (
+        "import json, sys\n"
+        f"import {module}\n"
+        "loaded = sorted(sys.modules)\n"
+        "pkg = sys.modules['yt_subs']\n"
+        "missing = [n for n in pkg.__all__ if getattr(pkg, n, None) is None]\n"
+        "print(json.dumps({'loaded': loaded, 'missing': missing}))"
+    )
+    return json.loads(_run_python(code).stdout)
+
+
+@when(
+    parsers.parse('I measure the import time of "{module}"'),
+    target_fixture="import_ms",
+)
+def measure_import(module):
+    best = float("inf")
+    for _ in range(3):
+        stderr = _run_python(f"import {module}", "-X", "importtime").stderr
+        for line in stderr.splitlines():
+            fields = line.removeprefix("import time:").split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                best = min(best, int(fields[1]) / 1000)
+    return best
+
+
+@then("yt_dlp, asyncio, sqlite3 and http.server should not be loaded")
+def check_not_loaded(fresh_import):
+    loaded = set(fresh_import["loaded"])
+    assert not loaded.intersection(HEAVY_MODULES)
+
+
+@then("every name in __all__ should resolve")
+def check_exports(fresh_import):
+    assert fresh_import["missing"] == []
+
+
+@then("it should be under the startup budget")
+def check_budget(import_ms):
+    assert import_ms < STARTUP_BUDGET_MS
@@ -0,0 +1,301 @@
+import json
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs.cleaning import clean_subtitle
+from yt_subs.cli import main
+from yt_subs.pipeline import download_transcript, stored_transcript
+from yt_subs.store import TranscriptStore
+from yt_subs.types import (
+    CleanedTranscript,
+    SubtitleContent,
+    SubtitleFormat,
+    SubtitleLanguage,
+    SubtitleSource,
+)
+
+from .fixtures.fake_http import FakeSession, ollama_body, subtitle_body
+from .fixtures.yt_dlp_info import INFO_WITH_SUBS
+
+scenarios("features/transcript_store.feature")
+
+TALKS = [
+    ("nix00000001", "en", "Nix gives you reproducible builds.\nEvery build is reproducible."),
+    ("rust0000001", "en", "Rust has a borrow checker.\nIt makes builds slow."),
+    ("nixfr000001", "fr", "Nix rend les builds reproductibles."),
+]
+
+SAMPLE_VTT = """\
+WEBVTT
+
+00:00:00.000 --> 00:00:03.000
+Hello and welcome
+
+00:00:03.000 --> 00:00:06.000
+This is a test
+"""
+
+
+def _language(code: str, source: SubtitleSource = SubtitleSource.MANUAL) -> SubtitleLanguage:
+    return SubtitleLanguage(code=code, name=code, source=source, formats=())
+
+
+def _mock_yt_dlp():
+    ydl_cls = MagicMock()
+    ydl = ydl_cls.return_value.__enter__.return_value
+    ydl.extract_info.return_value = INFO_WITH_SUBS
+    return ydl_cls
+
+
+class CountingStore(TranscriptStore):
+    """A transcript store that records which instances were closed."""
+
+    opened: list["CountingStore"] = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.closed = False
+        CountingStore.opened.append(self)
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+def _run_cli(argv, capsys, ydl_cls=None, session=None):
+    ydl_cls = ydl_cls or _mock_yt_dlp()
+    session = session or FakeSession(_handler)
+    with (
+        patch("yt_dlp.YoutubeDL", ydl_cls),
+        patch("yt_subs.subtitles.default_session", return_value=session),
+        patch("yt_subs.summarizer.default_session", return_value=session),
+    ):
+        exit_code = main(argv)
+    captured = capsys.readouterr()
+    return {
+        "exit_code": exit_code,
+        "stdout": captured.out,
+        "stderr": captured.err,
+        "ydl": ydl_cls,
+        "session": session,
+    }
+
+
+def _handler(method, url, body):
+    if body is not None:
+        return ollama_body("A summary.", stream=json.loads(body)["stream"])
+    return subtitle_body(SAMPLE_VTT, url)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TranscriptStore(tmp_path / "transcripts.sqlite3")
+    yield store
+    store.close()
+
+
+@given("an empty transcript store")
+def empty_store(store):
+    assert len(store) == 0
+
+
+@given("a transcript store with three talks")
+def store_with_talks(store):
+    for video_id, code, text in TALKS:
+        store.put(video_id, _language(code), CleanedTranscript(code, text))
+
+
+@given("a video whose transcript the CLI has stored")
+def video_stored(capsys):
+    result = _run_cli(["-l", "en", "https://youtube.com/watch?v=dQw4w9WgXcQ"], capsys)
+    assert result["exit_code"] == 0
+
+
+@given("the transcript store has failed")
+def broken_store(store):
+    # Every query on a closed connection raises sqlite3.ProgrammingError.
+    store.close()
+
+
+@given("a cache directory that is a file")
+def cache_dir_is_file(tmp_path, monkeypatch):
+    path = tmp_path / "not-a-directory"
+    path.write_text("")
+    monkeypatch.setenv("YT_SUBS_CACHE_DIR", str(path))
+
+
+@when(
+    parsers.parse('I look up the stored transcript of "{video_id}" in "{code}"'),
+    target_fixture="downloaded",
+)
+def look_up(store, video_id, code):
+    with pytest.warns(UserWarning) as warned:
+        transcript = stored_transcript(store, video_id, code)
+    return {"transcript": transcript, "warnings": [str(w.message) for w in warned]}
+
+
+@given("a transcript store that fails to write")
+def failing_store(store):
+    store.put = MagicMock(side_effect=sqlite3.OperationalError("database is locked"))
+
+
+@when(
+    parsers.parse('I download the sample transcript of "{video_id}" in "{code}" into it'),
+    target_fixture="downloaded",
+)
+def download_into_store(store, video_id, code):
+    language = SubtitleLanguage(
+        code=code,
+        name=code,
+        source=SubtitleSource.MANUAL,
+        formats=(SubtitleFormat(ext="vtt", url=f"https://example.com/subs/{code}.vtt"),),
+    )
+    session = FakeSession(_handler)
+    with pytest.warns(UserWarning) as warned:
+        transcript = download_transcript(
+            language, session=session, store=store, video_id=video_id, refresh=True
+        )
+    return {"transcript": transcript, "warnings": [str(w.message) for w in warned]}
+
+
+@when(
+    parsers.parse('I run the CLI with "{flags}" counting transcript stores'),
+    target_fixture="cli_result",
+)
+def run_counting_stores(flags, capsys):
+    CountingStore.opened = []
+    with patch("yt_subs.cli.TranscriptStore", CountingStore):
+        return _run_cli(flags.split(), capsys)
+
+
+@when(parsers.parse('I store the sample transcript of "{video_id}" in "{code}"'))
+def store_sample(store, sample_vtt_text, video_id, code):
+    content = SubtitleContent(language=_language(code), raw_text=sample_vtt_text)
+    store.put(video_id, _language(code), clean_subtitle(content), content)
+
+
+@when(parsers.parse('I store "{text}" as {kind} of "{video_id}" in "{code}"'))
+def store_text(store, text, kind, video_id, code):
+    source = SubtitleSource.AUTO if kind == "auto captions" else SubtitleSource.MANUAL
+    store.put(video_id, _language(code, source), CleanedTranscript(code, text))
+
+
+@when(parsers.parse('I search for "{query}" in "{code}"'), target_fixture="hits")
+def search_language(store, query, code):
+    return store.search(query, language_code=code)
+
+
+@when(parsers.parse('I search for "{query}"'), target_fixture="hits")
+def search(store, query):
+    return store.search(query)
+
+
+@when(parsers.parse('I run the CLI on it again with "{flags}"'), target_fixture="cli_result")
+def run_again(flags, capsys):
+    argv = [*flags.split(), "https://youtube.com/watch?v=dQw4w9WgXcQ"]
+    return _run_cli(argv, capsys)
+
+
+@when(parsers.parse('I run "search {query}"'), target_fixture="cli_result")
+def run_search(query, capsys):
+    return _run_cli(["search", *query.split()], capsys)
+
+
+@then(parsers.parse('the store should return the same transcript for "{video_id}" in "{code}"'))
+def check_transcript(store, sample_vtt_text, video_id, code):
+    content = SubtitleContent(language=_language(code), raw_text=sample_vtt_text)
+    assert store.get(video_id, code) == clean_subtitle(content)
+
+
+@then(parsers.parse('the store should return the raw VTT subtitles for "{video_id}" in "{code}"'))
+def check_raw(store, sample_vtt_text, video_id, code):
+    raw = store.get_subtitles(video_id, code)
+    assert raw.raw_text == sample_vtt_text
+    assert raw.ext == "vtt"
+    assert raw.language.source == SubtitleSource.MANUAL
+
+
+@then(parsers.parse('the store should return "{text}" for "{video_id}" in "{code}"'))
+def check_text(store, text, video_id, code):
+    assert store.get(video_id, code).text == text
+    assert store.get(video_id, code, SubtitleSource.AUTO).text == "auto words"
+
+
+@then(parsers.parse('the first hit should be "{video_id}"'))
+def check_first_hit(hits, video_id):
+    assert hits[0].video_id == video_id
+
+
+@then(parsers.parse('its snippet should contain "{text}"'))
+def check_snippet(hits, text):
+    assert text in hits[0].snippet
+
+
+@then(parsers.parse('"{video_id}" should not be among the hits'))
+def check_not_hit(hits, video_id):
+    assert video_id not in [hit.video_id for hit in hits]
+
+
+@then(parsers.parse('the only hit should be "{video_id}"'))
+def check_only_hit(hits, video_id):
+    assert [hit.video_id for hit in hits] == [video_id]
+
+
+@then(parsers.parse("searching for '{query}' should raise a ValueError"))
+def check_bad_query(store, query):
+    with pytest.raises(ValueError, match="invalid search query"):
+        store.search(query)
+
+
+@then(parsers.parse("the exit code should be {code:d}"))
+def check_exit_code(cli_result, code):
+    assert cli_result["exit_code"] == code, cli_result["stderr"]
+
+
+@then("neither yt-dlp nor the subtitle host should have been contacted")
+def check_offline(cli_result):
+    cli_result["ydl"].assert_not_called()
+    assert all(request["body"] is not None for request in cli_result["session"].requests)
+
+
+@then("the stored subtitles should have been summarized with their cue times")
+def check_summarized(cli_result):
+    prompt = cli_result["session"].json_bodies()[0]["prompt"]
+    assert prompt.endswith("[0:00] Hello and welcome\n[0:03] This is a test")
+    assert "A summary." in cli_result["stdout"]
+
+
+@then(parsers.parse('the output should show the video URL and a snippet with "{text}"'))
+def check_search_output(cli_result, text):
+    url, snippet = cli_result["stdout"].splitlines()[:2]
+    assert url.startswith("https://www.youtube.com/watch?v=dQw4w9WgXcQ [en, manual]")
+    assert text in snippet.lower()
+
+
+@then(parsers.parse('a warning should mention "{text}"'))
+def check_warning(downloaded, text):
+    assert any(text in message for message in downloaded["warnings"])
+
+
+@then("the downloaded transcript should be the cleaned sample")
+def check_downloaded(downloaded):
+    assert downloaded["transcript"].text == "Hello and welcome\nThis is a test"
+
+
+@then("every transcript store the CLI opened should have been closed")
+def check_stores_closed():
+    assert CountingStore.opened
+    assert all(store.closed for store in CountingStore.opened)
+
+
+@then("no stored transcript should be found")
+def check_not_found(downloaded):
+    assert downloaded["transcript"] is None
+
+
+@then(parsers.parse('the error output should mention "{text}"'))
+def check_error_output(cli_result, text):
+    assert text in cli_result["stderr"]
@@ -3,13 +3,17 @@ from unittest.mock import MagicMock, patch
 import pytest
 from pytest_bdd import given, parsers, scenarios, then, when
 
+from yt_subs.cleaning import clean_subtitle
+from yt_subs.pipeline import download_transcript
 from yt_subs.subtitles import fetch_subtitle_content, filter_preferred, list_languages
 from yt_subs.types import (
+    SubtitleContent,
     SubtitleFormat,
     SubtitleLanguage,
     SubtitleSource,
 )
 
+from .fixtures.fake_http import FakeSession
 from .fixtures.yt_dlp_info import INFO_NO_SUBS, INFO_WITH_SUBS
 
 scenarios("features/subtitle_download.feature")
@@ -31,7 +35,7 @@ def video_with_no_subs():
 
 @when("I list available languages", target_fixture="languages")
 def do_list_languages(mock_info):
-    with patch("yt_subs.subtitles.yt_dlp.YoutubeDL") as mock_ydl_cls:
+    with patch("yt_dlp.YoutubeDL") as mock_ydl_cls:
         mock_ydl = MagicMock()
         mock_ydl.extract_info.return_value = mock_info
         mock_ydl_cls.return_value.__enter__ = MagicMock(return_value=mock_ydl)
@@ -72,15 +76,28 @@ def language_with_vtt_url():
 
 @when("I fetch the subtitle content", target_fixture="fetched_content")
 def do_fetch_content(fetch_language, sample_vtt_text):
-    with patch("yt_subs.subtitles.urllib.request.urlopen") as mock_urlopen:
-        mock_resp = MagicMock()
-        mock_resp.read.return_value = sample_vtt_text.encode("utf-8")
-        mock_resp.__enter__ = MagicMock(return_value=mock_resp)
-        mock_resp.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_resp
+    session = FakeSession(lambda method, url, body: sample_vtt_text.encode("utf-8"))
+    with patch("yt_subs.subtitles.default_session", return_value=session):
         return fetch_subtitle_content(fetch_language)
 
 
+@when(
+    parsers.parse("I download and clean the subtitles in {size:d}-byte chunks"),
+    target_fixture="streamed_transcript",
+)
+def do_stream_clean(fetch_language, sample_vtt_text, size):
+    session = FakeSession(
+        lambda method, url, body: sample_vtt_text.encode("utf-8"), chunk_size=size
+    )
+    return download_transcript(fetch_language, session=session)
+
+
+@then("the transcript should match cleaning the whole file at once")
+def check_stream_matches(streamed_transcript, fetch_language, sample_vtt_text):
+    whole = clean_subtitle(SubtitleContent(language=fetch_language, raw_text=sample_vtt_text))
+    assert streamed_transcript == whole
+
+
 @then("I should get the raw VTT text")
 def check_raw_vtt(fetched_content, sample_vtt_text):
     assert fetched_content.raw_text == sample_vtt_text
@@ -95,7 +112,7 @@ def check_raw_vtt(fetched_content, sample_vtt_text):
     target_fixture="all_languages",
 )
 def all_languages_fixture():
-    with patch("yt_subs.subtitles.yt_dlp.YoutubeDL") as mock_ydl_cls:
+    with patch("yt_dlp.YoutubeDL") as mock_ydl_cls:
         mock_ydl = MagicMock()
         mock_ydl.extract_info.return_value = INFO_WITH_SUBS
         mock_ydl_cls.return_value.__enter__ = MagicMock(return_value=mock_ydl)
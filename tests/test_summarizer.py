@@ -1,5 +1,4 @@
-import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 from pytest_bdd import given, parsers, scenarios, then, when
@@ -7,6 +6,8 @@ from pytest_bdd import given, parsers, scenarios, then, when
 from yt_subs.summarizer import OllamaSummarizer
 from yt_subs.types import DEFAULT_SUMMARIZATION_PROMPT, SummarizationError
 
+from .fixtures.fake_http import FakeSession, ollama_body
+
 scenarios("features/summarization.feature")
 
 SAMPLE_TRANSCRIPT = "Nix is a powerful package manager.\nIt provides reproducible builds."
@@ -26,6 +27,17 @@ def custom_model_setup(model):
     return OllamaSummarizer(model=model), SAMPLE_TRANSCRIPT
 
 
+@given(
+    parsers.parse(
+        'a transcript and a model kept loaded for "{keep_alive}" with a {num_ctx:d}-token context'
+    ),
+    target_fixture="summarizer_setup",
+)
+def tuned_model_setup(keep_alive, num_ctx):
+    summarizer = OllamaSummarizer(options={"num_ctx": num_ctx}, keep_alive=keep_alive)
+    return summarizer, SAMPLE_TRANSCRIPT
+
+
 @given("a transcript and a failing Ollama server", target_fixture="summarizer_setup")
 def failing_server_setup():
     return OllamaSummarizer(base_url="http://localhost:99999"), SAMPLE_TRANSCRIPT
@@ -34,45 +46,83 @@ def failing_server_setup():
 @when("I summarize the transcript", target_fixture="summarize_result")
 def do_summarize(summarizer_setup):
     summarizer, transcript = summarizer_setup
-    captured = {}
-
-    def mock_urlopen(req):
-        body = json.loads(req.data.decode("utf-8"))
-        captured["model"] = body["model"]
-        captured["prompt"] = body["prompt"]
-
-        mock_resp = MagicMock()
-        mock_resp.read.return_value = json.dumps(
-            {"response": SAMPLE_SUMMARY}
-        ).encode("utf-8")
-        mock_resp.__enter__ = MagicMock(return_value=mock_resp)
-        mock_resp.__exit__ = MagicMock(return_value=False)
-        return mock_resp
-
-    with patch("yt_subs.summarizer.urllib.request.urlopen", side_effect=mock_urlopen):
+    session = FakeSession(lambda method, url, body: ollama_body(SAMPLE_SUMMARY, stream=False))
+
+    with patch("yt_subs.summarizer.default_session", return_value=session):
         result = summarizer.summarize(transcript, DEFAULT_SUMMARIZATION_PROMPT)
 
-    return {"result": result, **captured}
+    body = session.json_bodies()[0]
+    return {"result": result, "model": body["model"], "prompt": body["prompt"], "body": body}
+
+
+@when("I warm up the summarizer", target_fixture="summarize_result")
+def do_warm_up(summarizer_setup):
+    summarizer, _ = summarizer_setup
+    session = FakeSession(lambda method, url, body: ollama_body("", stream=False))
+
+    with patch("yt_subs.summarizer.default_session", return_value=session):
+        summarizer.warm_up(DEFAULT_SUMMARIZATION_PROMPT)
+
+    return {"body": session.json_bodies()[0]}
 
 
 @when("I attempt to summarize the transcript", target_fixture="summarize_error")
 def do_summarize_failing(summarizer_setup):
     summarizer, transcript = summarizer_setup
 
-    with patch(
-        "yt_subs.summarizer.urllib.request.urlopen",
-        side_effect=ConnectionError("Connection refused"),
-    ):
+    def refuse(method, url, body):
+        raise ConnectionError("Connection refused")
+
+    with patch("yt_subs.summarizer.default_session", return_value=FakeSession(refuse)):
         with pytest.raises(SummarizationError) as exc_info:
             summarizer.summarize(transcript, DEFAULT_SUMMARIZATION_PROMPT)
     return exc_info
 
 
+@when("I stream the summary of the transcript", target_fixture="summarize_result")
+def do_stream(summarizer_setup):
+    summarizer, transcript = summarizer_setup
+    body = ollama_body(SAMPLE_SUMMARY, stream=True).replace(b"\n", b"\n\n", 1)
+    session = FakeSession(lambda method, url, payload: body)
+
+    with patch("yt_subs.summarizer.default_session", return_value=session):
+        tokens = list(summarizer.stream(transcript, DEFAULT_SUMMARIZATION_PROMPT))
+
+    return {"tokens": tokens, "stream": session.json_bodies()[0]["stream"]}
+
+
+@then("the summarization request should ask for a stream")
+def check_stream_requested(summarize_result):
+    assert summarize_result["stream"] is True
+
+
+@then("the tokens should arrive in order and join to the summary text")
+def check_tokens(summarize_result):
+    assert len(summarize_result["tokens"]) > 1
+    assert "".join(summarize_result["tokens"]) == SAMPLE_SUMMARY
+
+
 @then(parsers.parse('the summarization request should use model "{model}"'))
 def check_model(summarize_result, model):
     assert summarize_result["model"] == model
 
 
+@then(parsers.parse('the summarization request should keep the model loaded for "{keep_alive}"'))
+def check_keep_alive(summarize_result, keep_alive):
+    assert summarize_result["body"]["keep_alive"] == keep_alive
+
+
+@then(parsers.parse('the summarization request should set option "{name}" to {value:d}'))
+def check_option(summarize_result, name, value):
+    assert summarize_result["body"]["options"][name] == value
+
+
+@then("the summarization request should start with the instruction prompt")
+def check_prompt_prefix(summarize_result):
+    assert summarize_result["body"]["prompt"].startswith(DEFAULT_SUMMARIZATION_PROMPT + "\n\n")
+    assert "context" not in summarize_result["body"]
+
+
 @then("the response should contain the summary text")
 def check_summary_text(summarize_result):
     assert summarize_result["result"] == SAMPLE_SUMMARY
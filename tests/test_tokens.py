@@ -0,0 +1,137 @@
+from unittest.mock import patch
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs import tokens
+from yt_subs.chunking import ChunkedSummarizer
+from yt_subs.cli import _build_summarizer, build_parser
+from yt_subs.summarizer import OllamaSummarizer
+from yt_subs.types import DEFAULT_SUMMARIZATION_PROMPT, CleanedTranscript
+
+from .fixtures.fake_http import FakeSession, ollama_body
+
+scenarios("features/token_budget.feature")
+
+
+class StubBackend:
+    def summarize(self, transcript: str, prompt: str) -> str:
+        return "summary"
+
+
+def _text_of(token_count: int) -> str:
+    """Text the default estimate counts as ``token_count`` tokens."""
+    return ("word " * token_count)[: token_count * 4]
+
+
+@pytest.fixture(autouse=True)
+def default_tokenizer():
+    yield
+    tokens.use_tokenizer(None)
+
+
+@given(
+    parsers.parse("a cleaned transcript of {chars:d} characters"),
+    target_fixture="transcript",
+)
+def cleaned_transcript(chars):
+    return CleanedTranscript(language_code="en", text=("abc " * chars)[:chars])
+
+
+@given("a tokenizer counting one token per word")
+def word_tokenizer():
+    tokens.use_tokenizer(lambda text: len(text.split()))
+
+
+@given(
+    parsers.parse("a summarizer allowed a context of at most {limit:d} tokens"),
+    target_fixture="summarizer",
+)
+def sized_summarizer(limit):
+    return OllamaSummarizer(max_context=limit)
+
+
+@given(
+    parsers.parse(
+        "a chunked summarizer with a {budget:d}-token chunk budget and {compress} compression"
+    ),
+    target_fixture="summarizer",
+)
+def planned_summarizer(budget, compress):
+    compress_tokens = None if compress == "no" else int(compress.split("-")[0])
+    return ChunkedSummarizer(
+        StubBackend(), chunk_tokens=budget, overlap_tokens=0, compress_tokens=compress_tokens
+    )
+
+
+@given("the summarizer the CLI builds for a run", target_fixture="summarizer")
+def cli_summarizer():
+    args = build_parser().parse_args(["--no-cache", "https://youtube.com/watch?v=test"])
+    return _build_summarizer(args, "llama3")
+
+
+@given(
+    parsers.parse("the summarizer the CLI builds for a single video of {count:d} tokens"),
+    target_fixture="summarizer",
+)
+def single_video_summarizer(count):
+    args = build_parser().parse_args(["--no-cache", "https://youtube.com/watch?v=test"])
+    return _build_summarizer(args, "llama3", _text_of(count))
+
+
+@when("I count its tokens", target_fixture="count")
+def do_count(transcript):
+    return tokens.count_tokens(transcript)
+
+
+@when(parsers.parse("I summarize a transcript of {count:d} tokens"), target_fixture="request_body")
+def do_summarize(summarizer, count):
+    session = FakeSession(lambda method, url, body: ollama_body("summary", stream=False))
+    with patch("yt_subs.summarizer.default_session", return_value=session):
+        summarizer.summarize(_text_of(count), DEFAULT_SUMMARIZATION_PROMPT)
+    return session.json_bodies()[0]
+
+
+@when(
+    parsers.parse("I warm it up and summarize a transcript of {count:d} tokens"),
+    target_fixture="request_bodies",
+)
+def do_warm_up_and_summarize(summarizer, count):
+    session = FakeSession(lambda method, url, body: ollama_body("summary", stream=False))
+    with patch("yt_subs.summarizer.default_session", return_value=session):
+        backend = summarizer._backends[0]
+        backend.warm_up(DEFAULT_SUMMARIZATION_PROMPT, 3000)
+        summarizer.summarize(_text_of(count), DEFAULT_SUMMARIZATION_PROMPT)
+    return session.json_bodies()
+
+
+@when(parsers.parse("I plan a transcript of {count:d} tokens"), target_fixture="plan")
+def do_plan(summarizer, count):
+    return summarizer.plan(_text_of(count))
+
+
+@then(parsers.parse("the count should be {expected:d}"))
+def check_count(count, expected):
+    assert count == expected
+
+
+@then("the count should be the number of words")
+def check_word_count(count, transcript):
+    assert count == len(transcript.text.split())
+
+
+@then(parsers.parse("the request should set num_ctx to {num_ctx:d}"))
+def check_num_ctx(request_body, num_ctx):
+    assert request_body["options"]["num_ctx"] == num_ctx
+
+
+@then(parsers.parse("every request should set num_ctx to {num_ctx:d}"))
+def check_every_num_ctx(request_bodies, num_ctx):
+    # Warm-up, map requests for the chunks, and the final request.
+    assert len(request_bodies) > 3
+    assert {body["options"]["num_ctx"] for body in request_bodies} == {num_ctx}
+
+
+@then(parsers.parse('the strategy should be "{strategy}"'))
+def check_strategy(plan, strategy):
+    assert plan is tokens.Strategy(strategy)
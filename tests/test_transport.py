@@ -0,0 +1,166 @@
+import asyncio
+import gzip
+import http.client
+
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+from yt_subs.aio import AsyncHTTPSession
+from yt_subs.transport import HTTPSession, HTTPStatusError
+
+from .fixtures.http_server import LocalServer
+
+scenarios("features/http_transport.feature")
+
+BODY = b"WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nHello\n"
+
+
+def _flaky_route():
+    calls = {"count": 0}
+
+    def route(path, body):
+        calls["count"] += 1
+        if calls["count"] == 1:
+            return 503, {}, b"busy"
+        return 200, {}, BODY
+
+    return route
+
+
+@given("a local HTTP server", target_fixture="server")
+def local_server():
+    routes = {
+        "/plain": lambda path, body: (200, {}, BODY),
+        "/gzip": lambda path, body: (200, {"Content-Encoding": "gzip"}, gzip.compress(BODY)),
+        "/flaky": _flaky_route(),
+        "/drop": lambda path, body: None,
+    }
+    with LocalServer(routes) as server:
+        yield server
+
+
+@pytest.fixture
+def session():
+    session = HTTPSession(backoff=0.01)
+    yield session
+    session.close()
+
+
+@when(parsers.parse("I make {count:d} sequential requests with one session"))
+def sequential_requests(server, session, count):
+    for _ in range(count):
+        with session.request("GET", f"{server.url}/plain") as resp:
+            assert resp.read() == BODY
+
+
+@when("I request a gzip-encoded resource", target_fixture="body")
+def request_gzip(server, session):
+    with session.request("GET", f"{server.url}/gzip") as resp:
+        return resp.read()
+
+
+@when("I request a resource that fails once with 503", target_fixture="body")
+def request_flaky(server, session):
+    with session.request("GET", f"{server.url}/flaky") as resp:
+        return resp.read()
+
+
+@when("I post to a resource that fails once with 503", target_fixture="error")
+def post_flaky(server, session):
+    with pytest.raises(HTTPStatusError) as exc_info:
+        session.request("POST", f"{server.url}/flaky", body=b"{}")
+    return exc_info.value
+
+
+@when("I post asynchronously to a resource that fails once with 503", target_fixture="error")
+def post_flaky_async(server):
+    async def run():
+        session = AsyncHTTPSession(backoff=0.01)
+        try:
+            await session.request("POST", f"{server.url}/flaky", body=b"{}")
+        finally:
+            await session.aclose()
+
+    with pytest.raises(HTTPStatusError) as exc_info:
+        asyncio.run(run())
+    return exc_info.value
+
+
+@when(
+    "I post on a kept-alive connection to a resource that drops it",
+    target_fixture="error",
+)
+def post_dropped(server, session):
+    with session.request("GET", f"{server.url}/plain") as resp:
+        resp.read()
+    with pytest.raises((OSError, http.client.HTTPException)) as exc_info:
+        session.request("POST", f"{server.url}/drop", body=b"{}")
+    assert session.connections_reused == 1
+    return exc_info.value
+
+
+@when(
+    "I post asynchronously on a kept-alive connection to a resource that drops it",
+    target_fixture="error",
+)
+def post_dropped_async(server):
+    async def run():
+        session = AsyncHTTPSession(backoff=0.01)
+        try:
+            response = await session.request("GET", f"{server.url}/plain")
+            await response.read()
+            await session.request("POST", f"{server.url}/drop", body=b"{}")
+        finally:
+            await session.aclose()
+
+    with pytest.raises(OSError) as exc_info:
+        asyncio.run(run())
+    return exc_info.value
+
+
+@when("I request a missing resource", target_fixture="error")
+def request_missing(server, session):
+    with pytest.raises(HTTPStatusError) as exc_info:
+        session.request("GET", f"{server.url}/missing")
+    return exc_info.value
+
+
+@then(parsers.parse("the session should have opened {count:d} connection"))
+def check_opened(session, count):
+    assert session.connections_opened == count
+
+
+@then(parsers.parse("the session should have reused {count:d} connections"))
+def check_reused(session, count):
+    assert session.connections_reused == count
+
+
+@then("I should get the decoded body")
+def check_decoded(body):
+    assert body == BODY
+
+
+@then(parsers.parse("I should get the body after {count:d} attempts"))
+def check_attempts(server, body, count):
+    assert body == BODY
+    assert len(server.requests) == count
+
+
+@then(parsers.parse("an HTTPStatusError with status {status:d} should be raised"))
+def check_status_error(error, status):
+    assert error.status == status
+
+
+@then("the request should fail with a connection error")
+def check_connection_error(error):
+    assert isinstance(error, (ConnectionError, http.client.HTTPException))
+
+
+@then(parsers.parse('the server should have seen {count:d} request to "{path}"'))
+def check_requests_to(server, count, path):
+    assert [target for _, target in server.requests].count(path) == count
+
+
+@then(parsers.parse("the server should have seen {count:d} request"))
+def check_request_count(server, count):
+    assert len(server.requests) == count